@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+"""
+Benchmark the aggregation engine against an ad-hoc Python loop
+
+Usage: ./benchmarks/aggregate.py [number of places]
+    Computes the average, min and max price_by_night and the number of
+    places per city_id, with the values read from a Columns store (as
+    FileStorage.aggregate does for Place) and from the objects
+"""
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.engine.aggregate import aggregate  # noqa: E402
+from models.engine.columns import Columns, numpy  # noqa: E402
+
+FUNCTIONS = ("avg(price_by_night)", "min(price_by_night)",
+             "max(price_by_night)", "count")
+
+
+def places(size, seed=0):
+    """Return {key: place} of size synthetic places in 1000 cities"""
+    rand = random.Random(seed)
+    cities = ["city-{}".format(number) for number in range(1000)]
+    return {"Place.{}".format(number): SimpleNamespace(
+        city_id=rand.choice(cities), price_by_night=rand.randint(20, 500))
+        for number in range(size)}
+
+
+def loop(objects):
+    """Return the same results with a plain loop over the objects"""
+    totals = {}
+    for obj in objects.values():
+        price = obj.price_by_night
+        total = totals.get(obj.city_id)
+        if total is None:
+            totals[obj.city_id] = [price, price, price, 1]
+        else:
+            total[0] += price
+            total[1] = min(total[1], price)
+            total[2] = max(total[2], price)
+            total[3] += 1
+    return {city: {"avg(price_by_night)": total[0] / total[3],
+                   "min(price_by_night)": total[1],
+                   "max(price_by_night)": total[2], "count": total[3]}
+            for city, total in totals.items()}
+
+
+def timed(function, *args, **kwargs):
+    """Return the result of function and its time in seconds"""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main(size):
+    """Print the time of each way of aggregating"""
+    objects = places(size)
+    store = Columns(("price_by_night",))
+    for key, obj in objects.items():
+        store.put(key, obj)
+    print(f"{size} places, {'NumPy' if numpy is not None else 'array'} "
+          "columns")
+    expected, seconds = timed(loop, objects)
+    print(f"{'python loop':>24} {seconds * 1000:>9.1f}ms")
+    for name, columns in (("aggregate on columns", store),
+                          ("aggregate on objects", None)):
+        result, seconds = timed(aggregate, objects, FUNCTIONS, "city_id",
+                                columns)
+        assert result.keys() == expected.keys()
+        print(f"{name:>24} {seconds * 1000:>9.1f}ms")
+    result, seconds = timed(aggregate, objects, FUNCTIONS, None, store)
+    print(f"{'no group, on columns':>24} {seconds * 1000:>9.1f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
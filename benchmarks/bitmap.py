@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""
+Benchmark the bitmap index of Place.amenity_ids against a full scan
+
+Usage: ./benchmarks/bitmap.py [number of places]
+    Every place holds up to 10 of 40 amenities, the index is built
+    with BitmapIndex.put as FileStorage does for each Place
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.engine.bitmap import BitmapIndex  # noqa: E402
+
+
+def timed(function, queries):
+    """Return the mean time of function over queries in ms"""
+    start = time.perf_counter()
+    for query in queries:
+        function(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main(size):
+    """Print the build time and the time of AND and OR queries"""
+    rand = random.Random(0)
+    amenities = ["amenity-{}".format(number) for number in range(40)]
+    lists = {"Place.{}".format(number):
+             rand.sample(amenities, rand.randint(0, 10))
+             for number in range(size)}
+    index = BitmapIndex()
+    start = time.perf_counter()
+    for key, values in lists.items():
+        index.put(key, values)
+    print(f"{size} places, index built in "
+          f"{time.perf_counter() - start:.2f}s")
+    queries = [rand.sample(amenities, 3) for _ in range(20)]
+
+    def scan_all(wanted):
+        return [key for key, values in lists.items()
+                if all(value in values for value in wanted)]
+
+    def scan_any(wanted):
+        return [key for key, values in lists.items()
+                if any(value in values for value in wanted)]
+
+    print(f"{'query':>18} {'index':>10} {'full scan':>12}")
+    for name, search, scan in (("3 amenities AND", index.all, scan_all),
+                               ("3 amenities OR", index.any, scan_any)):
+        print(f"{name:>18} {timed(search, queries):>8.1f}ms "
+              f"{timed(scan, queries[:3]):>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
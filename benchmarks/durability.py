@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+"""
+Benchmark the save() throughput of each durability policy
+
+Usage: ./benchmarks/durability.py [number of objects] [number of saves]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.user import User  # noqa: E402
+
+
+def main(size, saves):
+    """Print the saves per second of every policy, snapshot and journal"""
+    with tempfile.TemporaryDirectory(dir=".") as directory:
+        FileStorage._FileStorage__file_path = os.path.join(
+            directory, "storage_file.json")
+        storage = FileStorage()
+        storage.reload()
+        users = [User() for _ in range(size)]
+        storage.save()
+        print(f"{size} objects, {saves} saves of one changed object")
+        print(f"{'policy':>10} {'snapshot':>14} {'journal':>14}")
+        for policy in FileStorage.DURABILITY:
+            storage.set_durability(policy, interval=0.1)
+            rates = []
+            for journal in (False, True):
+                if journal:
+                    storage.enable_journal(limit=saves * 2)
+                start = time.perf_counter()
+                for i in range(saves):
+                    users[i % size].first_name = str(i)
+                    storage.save()
+                rates.append(saves / (time.perf_counter() - start))
+                FileStorage._FileStorage__journal = None
+                storage.save()
+            print(f"{policy:>10} {rates[0]:>10.0f}/s {rates[1]:>10.0f}/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 200)
@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+"""
+Benchmark the spatial index of the places against a full scan
+
+Usage: ./benchmarks/geo.py [number of places]
+    The places are spread around 500 random city centers, the index
+    is built with GeoIndex.put as FileStorage does for each Place
+    The queries are made near the centers, then near the poles and
+    in the empty regions far from every place
+"""
+import os
+import random
+import sys
+import time
+from heapq import nsmallest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.engine.geo import GeoIndex, distance  # noqa: E402
+
+
+def places(size, seed=0):
+    """Return {key: (latitude, longitude)} of size synthetic places"""
+    rand = random.Random(seed)
+    centers = [(rand.uniform(-60, 70), rand.uniform(-180, 180))
+               for _ in range(500)]
+    points = {}
+    for number in range(size):
+        latitude, longitude = rand.choice(centers)
+        points[f"Place.{number}"] = (
+            max(-90.0, min(90.0, rand.gauss(latitude, 0.2))),
+            (rand.gauss(longitude, 0.2) + 180) % 360 - 180)
+    return points, centers
+
+
+def timed(function, queries):
+    """Return the mean time of function over queries in ms"""
+    start = time.perf_counter()
+    for query in queries:
+        function(*query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main(size):
+    """Print the build time and the time of each query"""
+    points, centers = places(size)
+    index = GeoIndex()
+    start = time.perf_counter()
+    for key, (latitude, longitude) in points.items():
+        index.put(key, latitude, longitude)
+    print(f"{size} places, index built in "
+          f"{time.perf_counter() - start:.2f}s, {len(index.buckets)} cells")
+    rand = random.Random(1)
+    queries = [(rand.gauss(lat, 0.1), rand.gauss(lon, 0.1))
+               for lat, lon in rand.sample(centers, 50)]
+
+    def scan_radius(latitude, longitude, km):
+        pairs = ((distance(latitude, longitude, *point), key)
+                 for key, point in points.items())
+        return sorted(pair for pair in pairs if pair[0] <= km)
+
+    def scan_nearest(latitude, longitude, k):
+        return nsmallest(k, ((distance(latitude, longitude, *point), key)
+                             for key, point in points.items()))
+
+    scans = queries[:3]
+    print(f"{'query':>22} {'index':>10} {'full scan':>12}")
+    for name, search, scan, extra in (
+            ("radius 5 km", index.radius, scan_radius, 5),
+            ("radius 50 km", index.radius, scan_radius, 50),
+            ("nearest k=10", index.nearest, scan_nearest, 10)):
+        indexed = timed(search, [query + (extra,) for query in queries])
+        scanned = timed(scan, [query + (extra,) for query in scans])
+        print(f"{name:>22} {indexed:>8.2f}ms {scanned:>10.1f}ms")
+    for name, far in (
+            ("nearest k=10, polar", [(rand.uniform(80, 90),
+                                      rand.uniform(-180, 180))
+                                     for _ in range(10)]),
+            ("nearest k=10, sparse", [(rand.uniform(-90, -70),
+                                       rand.uniform(-180, 180))
+                                      for _ in range(10)])):
+        indexed = timed(index.nearest, [query + (10,) for query in far])
+        scanned = timed(scan_nearest, [query + (10,) for query in far[:3]])
+        print(f"{name:>22} {indexed:>8.2f}ms {scanned:>10.1f}ms")
+    boxes = [(lat - 0.1, lon - 0.1, lat + 0.1, lon + 0.1)
+             for lat, lon in queries]
+    print(f"{'bbox 0.2 x 0.2 deg':>22} {timed(index.bbox, boxes):>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+"""
+Benchmark building instances from records: BaseModel(**record)
+against BaseModel.from_record(record)
+
+Usage: ./benchmarks/hydration.py [number of records]
+"""
+import os
+import sys
+import time
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.review import Review  # noqa: E402
+
+
+def records(size):
+    """Return size Review records as read from the storage file"""
+    return [{
+        "__class__": "Review",
+        "id": str(uuid4()),
+        "created_at": "2023-08-18T14:11:50.288404",
+        "updated_at": "2023-08-18T14:11:50.288450",
+        "place_id": str(uuid4()),
+        "user_id": str(uuid4()),
+        "text": "Clean and quiet",
+    } for _ in range(size)]
+
+
+def main(size):
+    """Print the time of both paths"""
+    print(f"{size} records")
+    for name, build in (("Review(**record)", lambda r: Review(**r)),
+                        ("Review.from_record", Review.from_record)):
+        data = records(size)
+        start = time.perf_counter()
+        for record in data:
+            build(record)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>20} {elapsed * 1000:>8.0f}ms "
+              f"{elapsed / size * 1e6:>6.2f}us/record")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
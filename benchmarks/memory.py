@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""
+Benchmark the memory used per instance with the default layout
+and with HBNB_COMPACT_MODELS=1
+
+Usage: ./benchmarks/memory.py [number of instances]
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CODE = """
+import sys
+import tracemalloc
+from uuid import uuid4
+
+from models.place import Place
+from models.review import Review
+from models.user import User
+
+size = int(sys.argv[1])
+samples = {
+    User: {"email": "email@mail.com", "password": "pwd",
+           "first_name": "Betty", "last_name": "Holberton"},
+    Place: {"city_id": str(uuid4()), "user_id": str(uuid4()),
+            "name": "Loft", "description": "Quiet", "number_rooms": 2,
+            "number_bathrooms": 1, "max_guest": 4, "price_by_night": 90,
+            "latitude": 37.77, "longitude": -122.43, "amenity_ids": []},
+    Review: {"place_id": str(uuid4()), "user_id": str(uuid4()),
+             "text": "Clean and quiet"},
+}
+for cls, values in samples.items():
+    tracemalloc.start()
+    objects = [cls.from_record(dict(
+        values, __class__=cls.__name__, id=str(uuid4()),
+        created_at="2023-08-18T14:11:50.288404",
+        updated_at="2023-08-18T14:11:50.288450")) for _ in range(size)]
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(cls.__name__, used // size)
+    del objects
+"""
+
+
+def measure(size, compact):
+    """Return {class name: bytes per instance} in a new interpreter"""
+    env = dict(os.environ, PYTHONPATH=ROOT,
+               HBNB_COMPACT_MODELS="1" if compact else "0")
+    output = subprocess.run([sys.executable, "-c", CODE, str(size)],
+                            env=env, check=True, capture_output=True,
+                            text=True).stdout
+    return {name: int(used) for name, used in
+            (line.split() for line in output.splitlines())}
+
+
+def main(size):
+    """Print the bytes per instance of both layouts"""
+    print(f"{size} instances per class, bytes per instance "
+          "(instance, attributes, id and timestamps)")
+    default, compact = measure(size, False), measure(size, True)
+    print(f"{'class':>10} {'__dict__':>10} {'compact':>10} {'saved':>8}")
+    for name in default:
+        saved = 1 - compact[name] / default[name]
+        print(f"{name:>10} {default[name]:>10} {compact[name]:>10} "
+              f"{saved:>8.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+"""
+Benchmark the time taken by `import models` as the storage file grows
+
+Usage: ./benchmarks/startup.py [sizes...]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from uuid import uuid4
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def write_store(path, size):
+    """Write a storage file holding size users"""
+    objects = {}
+    for _ in range(size):
+        _id = str(uuid4())
+        objects[f"User.{_id}"] = {
+            "__class__": "User",
+            "id": _id,
+            "created_at": "2023-08-18T14:11:50.288404",
+            "updated_at": "2023-08-18T14:11:50.288450",
+            "email": "email@mail.com",
+        }
+    with open(path, "w") as file:
+        json.dump(objects, file)
+
+
+def time_command(code, cwd, repeat=5):
+    """Return the best wall time of running code in a new interpreter"""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env,
+                       check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(sizes):
+    """Print import and first access times for each store size"""
+    print(f"{'objects':>10} {'import models':>15} {'first all()':>15}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as cwd:
+            write_store(os.path.join(cwd, "storage_file.json"), size)
+            imported = time_command("import models", cwd)
+            loaded = time_command(
+                "import models; models.storage.all()", cwd)
+        print(f"{size:>10} {imported * 1000:>13.1f}ms "
+              f"{loaded * 1000:>13.1f}ms")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [0, 1000, 10000, 100000])
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Benchmark the JSON and binary storage formats:
+file size, save() time and reload() time
+
+Usage: ./benchmarks/storage_format.py [number of objects]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.review import Review  # noqa: E402
+from models.user import User  # noqa: E402
+
+
+def populate(storage, size):
+    """Create size objects split between users, places and reviews"""
+    users = []
+    for i in range(size // 3):
+        user = User()
+        user.email = f"user{i}@mail.com"
+        users.append(user.id)
+    for i in range(size // 3):
+        place = Place()
+        place.user_id = users[i % len(users)]
+        place.name = f"Place {i}"
+        place.price_by_night = i % 300
+        place.latitude = 37.77 + i / 1e6
+    for i in range(size - 2 * (size // 3)):
+        review = Review()
+        review.user_id = users[i % len(users)]
+        review.text = "Clean and quiet"
+
+
+def measure(storage, binary, path):
+    """Return the file size, save time and reload time of a format"""
+    FileStorage._FileStorage__binary = binary
+    storage.save()
+    start = time.perf_counter()
+    for key, obj in storage.all().items():
+        storage.mark_dirty(obj)
+    storage.save()
+    saved = time.perf_counter() - start
+    objects = FileStorage._FileStorage__objects
+    FileStorage._FileStorage__objects = {}
+    start = time.perf_counter()
+    storage.reload()
+    reloaded = time.perf_counter() - start
+    FileStorage._FileStorage__objects = objects
+    return os.path.getsize(path), saved, reloaded
+
+
+def main(size):
+    """Print the measures of both formats"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "storage_file.json")
+        FileStorage._FileStorage__file_path = path
+        storage = FileStorage()
+        storage.reload()
+        populate(storage, size)
+        print(f"{size} objects")
+        print(f"{'format':>8} {'size':>12} {'save':>10} {'reload':>10}")
+        for name, binary, file in (("json", False, path),
+                                   ("binary", True, path[:-5] + ".hbnb")):
+            size, saved, reloaded = measure(storage, binary, file)
+            print(f"{name:>8} {size:>11}B {saved * 1000:>8.0f}ms "
+                  f"{reloaded * 1000:>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
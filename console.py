@@ -8,6 +8,7 @@ import cmd
 import re
 from shlex import split
 
+# the model modules are imported to register their class
 from models.base_model import BaseModel
 from models.user import User
 from models.place import Place
@@ -16,6 +17,11 @@ from models.city import City
 from models.amenity import Amenity
 from models.review import Review
 from models import storage
+from models.engine import binary_codec
+from models.engine.aggregate import parse as parse_aggregation
+from models.engine.query import Query
+from models.registry import classes
+from models.relations import relations
 
 
 def parse_arguments(arg):
@@ -47,15 +53,7 @@ class HBNBCommand(cmd.Cmd):
 
     prompt = "(hbnb) "
 
-    object_classes = {
-        "BaseModel": BaseModel,
-        "User": User,
-        "Place": Place,
-        "State": State,
-        "City": City,
-        "Amenity": Amenity,
-        "Review": Review,
-    }
+    object_classes = classes
 
     def default(self, arg):
         """
@@ -69,6 +67,13 @@ class HBNBCommand(cmd.Cmd):
             if not cmd_args[0]:
                 print("** class name missing **")
                 return False
+            if re.match(r"\s*(where|order_by|offset|limit|fields)\s*\(",
+                        cmd_args[1]):
+                return self.do_query(arg)
+            match = re.fullmatch(r"\s*aggregate\s*\((.*)\)\s*", cmd_args[1])
+            if match is not None:
+                return self.do_aggregate(
+                    "{} {}".format(cmd_args[0], match.group(1)))
             match = re.search(r"\((.*?)\)", cmd_args[1])
             if match is not None:
                 command = [cmd_args[1][: match.span()[0]], match.group()[1:-1]]
@@ -98,24 +103,42 @@ class HBNBCommand(cmd.Cmd):
 
     def do_show(self, cls_name):
         """
-        Usage: show <class> <id>
+        Usage: show <class> <id> [--with <relationship>,...]
         Prints the string representation of an instance
-        based on the class name and id
+        based on the class name and id, --with also prints the
+        related instances (show Place <id> --with reviews,user)
         """
         cmd = parse_arguments(cls_name)
+        related = []
+        while len(cmd) > 2 and cmd[-2] == "--with":
+            related[:0] = [name for name in cmd.pop().split(",") if name]
+            cmd.pop()
         if len(cmd) == 0:
             print("** class name missing **")
         elif cmd[0] not in self.object_classes.keys():
             print("** class doesn't exist **")
         elif len(cmd) != 2:
-            print("** instance id missing **")
+            if cmd[-1] == "--with":
+                print("** relationship missing **")
+            else:
+                print("** instance id missing **")
         else:
-            instance_repr = f"{cmd[0]}.{cmd[1]}"
-            objects = storage.all()
-            if instance_repr not in objects:
+            relationships = relations(self.object_classes[cmd[0]])
+            for name in related:
+                if name not in relationships:
+                    print("** {} is not a relationship of {} **".format(
+                        name, cmd[0]))
+                    return
+            obj = storage.get(cmd[0], cmd[1])
+            if obj is None:
                 print("** no instance found **")
-            else:
-                print(objects[instance_repr])
+                return
+            print(obj)
+            for name in related:
+                value = getattr(obj, name)
+                if isinstance(value, list):
+                    value = [str(item) for item in value]
+                print("{}: {}".format(name, value))
 
     def do_destroy(self, cls_name):
         """
@@ -135,7 +158,7 @@ class HBNBCommand(cmd.Cmd):
             if instance_repr not in objects:
                 print("** no instance found **")
             else:
-                del storage.all()[instance_repr]
+                storage.delete(objects[instance_repr])
                 storage.save()
 
     def do_all(self, prompt):
@@ -153,9 +176,8 @@ class HBNBCommand(cmd.Cmd):
             print("** class doesn't exist **")
         else:
             Klass = args[0]
-            for obj in saved_objects.values():
-                if type(obj).__name__ == Klass:
-                    list_objects.append(str(obj))
+            for obj in storage.all(Klass).values():
+                list_objects.append(str(obj))
         if len(list_objects) > 0:
             print(list_objects)
 
@@ -213,21 +235,215 @@ class HBNBCommand(cmd.Cmd):
         Usage: count <class> or <class>.count()
         Retrieves the number of instances of a class
         """
-        count = 0
         args = parse_arguments(prompt)
-        objects = storage.all()
-        for key, value in objects.items():
-            if key.split(".")[0] == args[0]:
-                count += 1
-        print(count)
+        if len(args) == 0:
+            print(storage.count())
+        else:
+            print(storage.count(args[0]))
+
+    def do_select(self, prompt):
+        """
+        Usage: select <class> <attribute>=<min>:<max> ...
+        or <class>.select(<attribute>=<min>:<max>, ...)
+        Prints the instances of a class whose numeric attributes are
+        inside every range, a bound can be left out (price_by_night=:100)
+        and <attribute>=<value> matches an exact value
+        """
+        args = [arg.strip(",") for arg in parse_arguments(prompt)]
+        if len(args) == 0:
+            print("** class name missing **")
+            return
+        if args[0] not in self.object_classes.keys():
+            print("** class doesn't exist **")
+            return
+        ranges = {}
+        try:
+            for arg in args[1:]:
+                name, equal, bounds = arg.partition("=")
+                if not name or not equal:
+                    raise ValueError("invalid range {}".format(arg))
+                low, colon, high = bounds.partition(":")
+                if not colon:
+                    ranges[name] = float(low)
+                else:
+                    ranges[name] = (float(low) if low else None,
+                                    float(high) if high else None)
+            objects = storage.select(args[0], **ranges)
+        except ValueError as error:
+            print("** {} **".format(error))
+            return
+        if objects:
+            print([str(obj) for obj in objects.values()])
+
+    def do_search(self, prompt):
+        """
+        Usage: search <class> "<words>" or <class>.search("<words>")
+        Prints the instances of a class matching the words,
+        best match first
+        """
+        args = parse_arguments(prompt)
+        if len(args) == 0:
+            print("** class name missing **")
+        elif args[0] not in self.object_classes.keys():
+            print("** class doesn't exist **")
+        elif len(args) == 1:
+            print("** words missing **")
+        else:
+            try:
+                objects = storage.search(args[0], " ".join(args[1:]))
+            except ValueError as error:
+                print("** {} **".format(error))
+                return
+            if objects:
+                print([str(obj) for obj in objects.values()])
+
+    def do_having(self, prompt):
+        """
+        Usage: having <class> <attribute> <value> [and|or <value> ...]
+        or <class>.having(<attribute>, <value> [and|or <value> ...])
+        Prints the instances of a class whose list attribute holds
+        every value (and, the default) or any of them (or), e.g.
+        having Place amenity_ids <wifi id> and <pool id>
+        """
+        args = [arg.strip(",") for arg in parse_arguments(prompt)]
+        args = [arg for arg in args if arg]
+        if len(args) == 0:
+            print("** class name missing **")
+            return
+        if args[0] not in self.object_classes.keys():
+            print("** class doesn't exist **")
+            return
+        if len(args) == 1:
+            print("** attribute name missing **")
+            return
+        values = [arg for arg in args[2:] if arg.lower() not in ("and", "or")]
+        operators = {arg.lower() for arg in args[2:]} & {"and", "or"}
+        if not values:
+            print("** value missing **")
+            return
+        if len(operators) > 1:
+            print("** cannot mix and with or **")
+            return
+        try:
+            objects = storage.having(args[0], "any" if "or" in operators
+                                     else "all", **{args[1]: values})
+        except ValueError as error:
+            print("** {} **".format(error))
+            return
+        if objects:
+            print([str(obj) for obj in objects.values()])
+
+    def do_query(self, prompt):
+        """
+        Usage: query <class>.where(<attribute> <operator> <value>, ...)
+        .order_by(<attribute> [desc], ...).offset(<n>).limit(<n>)
+        .fields(<attribute>, ...) or the same without "query"
+        Prints the matching instances one per line, .count() prints
+        their number and .explain() the plan of the query
+        """
+        if not prompt.strip():
+            print("** class name missing **")
+            return
+        try:
+            query = Query.parse(prompt)
+            if query.action == "explain":
+                print("\n".join(query.plan()))
+                return
+            objects = query.run(storage)
+        except ValueError as error:
+            print("** {} **".format(error))
+            return
+        if query.action == "count":
+            print(len(objects))
+            return
+        for obj in objects:
+            if query.fields:
+                print("[{}] ({}) {}".format(
+                    query.cls, obj.id,
+                    {name: getattr(obj, name, None)
+                     for name in query.fields}))
+            else:
+                print(obj)
+
+    def do_aggregate(self, prompt):
+        """
+        Usage: aggregate <class> <function>(<attribute>), ... [by <group>]
+        or <class>.aggregate(<function>(<attribute>), ... [by <group>])
+        Prints count, sum, avg, min or max of attributes of the instances
+        of a class, one line per group, e.g.
+        Place.aggregate(avg(price_by_night), count by city_id)
+        User.aggregate(count by domain(email))
+        """
+        args = prompt.split(None, 1)
+        if len(args) == 0:
+            print("** class name missing **")
+            return
+        if args[0] not in self.object_classes.keys():
+            print("** class doesn't exist **")
+            return
+        try:
+            functions, by = parse_aggregation(
+                args[1] if len(args) > 1 else "")
+            results = storage.aggregate(args[0], *functions, by=by)
+        except ValueError as error:
+            print("** {} **".format(error))
+            return
+        for group in sorted(results, key=str):
+            row = {} if by is None else {by: group}
+            row.update(results[group])
+            print(row)
+
+    def do_convert(self, prompt):
+        """
+        Usage: convert <source> <destination>
+        Converts a JSON storage file to the binary format, or a binary
+        one to JSON when the destination name ends with .json
+        """
+        args = split(prompt)
+        if len(args) == 0:
+            print("** source file missing **")
+            return
+        if len(args) == 1:
+            print("** destination file missing **")
+            return
+        try:
+            binary_codec.convert(args[0], args[1])
+        except FileNotFoundError:
+            print("** file doesn't exist **")
+        except (OSError, ValueError) as error:
+            print("** {} **".format(error))
+
+    def do_begin(self, args):
+        """
+        Usage: begin
+        Defers the saves of the next commands until commit or rollback
+        """
+        if not storage.begin():
+            print("** batch already started **")
+
+    def do_commit(self, args):
+        """
+        Usage: commit
+        Saves at once every change made since begin
+        """
+        storage.commit()
+
+    def do_rollback(self, args):
+        """
+        Usage: rollback
+        Undoes every change made since begin
+        """
+        storage.rollback()
 
     def do_quit(self, args):
         """Quit command to exit the program"""
+        storage.flush()
         return True
 
     def do_EOF(self, args):
         """EOF command to exit the program"""
         print("")
+        storage.flush()
         return True
 
     def emptyline(self):
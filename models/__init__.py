@@ -3,7 +3,28 @@
 Create temporary file storage
 """
 
+from os import getenv
+
 from .engine.file_storage import FileStorage
 
-storage = FileStorage()
-storage.reload()
+compact_models = getenv("HBNB_COMPACT_MODELS") == "1"
+
+if getenv("HBNB_TYPE_STORAGE") == "db":
+    from .engine.db_storage import DBStorage
+
+    storage = DBStorage()
+else:
+    storage = FileStorage()
+    if getenv("HBNB_STORAGE_JOURNAL"):
+        storage.enable_journal(int(getenv("HBNB_STORAGE_JOURNAL")))
+    if getenv("HBNB_STORAGE_SHARDS"):
+        storage.enable_shards(int(getenv("HBNB_STORAGE_SHARDS")))
+    if getenv("HBNB_STORAGE_BINARY"):
+        storage.enable_binary()
+    if getenv("HBNB_STORAGE_ASYNC"):
+        storage.enable_async(float(getenv("HBNB_STORAGE_ASYNC")))
+    if getenv("HBNB_STORAGE_DURABILITY"):
+        policy, _, interval = getenv("HBNB_STORAGE_DURABILITY").partition(":")
+        storage.set_durability(policy, float(interval or 1))
+    if getenv("HBNB_STORAGE_DELTAS"):
+        storage.enable_deltas(int(getenv("HBNB_STORAGE_DELTAS")))
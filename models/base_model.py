@@ -7,22 +7,44 @@ BaseModel that defines all common attributes/methods for other classes
 from uuid import uuid4
 from datetime import datetime
 
-from models import storage
+from models import compact_models, storage
+from models.compact import Layout, settle
+from models.registry import register
 
-# from models import storage
 
-
-class BaseModel:
+class BaseModel(metaclass=Layout if compact_models else type):
     """
     BaseModel reprentation
+    Usage:
+        With HBNB_COMPACT_MODELS=1 the instances of every model use
+        the fixed layout of models.compact instead of a __dict__
+
+    Attributes:
+        indexes(tuple): names of the attributes the storage keeps
+            an index on, to look objects up with storage.find
+        __cache(str): the __str__ output computed since the last
+            attribute change, kept out of __dict__ in a slot
 
     Methods:
+        __init_subclass__(cls, **kwargs)
         __init__(self, *args, **kwargs)
+        __setattr__(self, name, value)
+        __delattr__(self, name)
+        from_record(cls, record)
         __str__(self)
         __save(self)
         to_dict(self)
     """
 
+    __slots__ = ("__dict__", "__weakref__", "__cache")
+
+    indexes = ()
+
+    def __init_subclass__(cls, **kwargs):
+        """Register every model class in models.registry"""
+        super().__init_subclass__(**kwargs)
+        register(cls)
+
     def __init__(self, *args, **kwargs):
         """
         Init the new instance or object
@@ -46,19 +68,65 @@ class BaseModel:
             self.updated_at = datetime.now()
             storage.new(self)
 
+    @classmethod
+    def from_record(cls, record):
+        """
+        Build an instance from a to_dict() record, the fast way
+        Usage:
+            Used by the storage engines to reload objects: the record
+            becomes the __dict__ of the instance in one assignment,
+            the timestamps are parsed with datetime.fromisoformat and
+            the instance is neither added to nor flagged in storage
+            The record dictionary is consumed
+        """
+        obj = cls.__new__(cls)
+        record.pop("__class__", None)
+        for key in ("created_at", "updated_at"):
+            if key in record:
+                record[key] = datetime.fromisoformat(record[key])
+        object.__setattr__(obj, "__dict__", record)
+        return obj
+
+    def __setattr__(self, name, value):
+        """
+        Set an attribute and flag the instance as changed
+        so the next storage save serializes it again
+        """
+        super().__setattr__(name, value)
+        object.__setattr__(self, "_BaseModel__cache", None)
+        storage.mark_dirty(self, name)
+
+    def __delattr__(self, name):
+        """
+        Delete an attribute and flag the instance as changed
+        """
+        super().__delattr__(name)
+        object.__setattr__(self, "_BaseModel__cache", None)
+        storage.mark_dirty(self, name)
+
     def __str__(self):
         """
         Return the string representation of the instance
         Format: [<class name>] (<instance.id>) <instance.__dict__>
+        Usage:
+            The string is cached until __setattr__ or __delattr__,
+            changing a mutable attribute in place (a list append)
+            must be followed by an assignment to be seen
         """
-        _cls = self.__class__.__name__
-        return f"[{_cls}] ({self.id}) <{self.__dict__}>"
+        settle(self)
+        cache = getattr(self, "_BaseModel__cache", None)
+        if cache is None:
+            _cls = self.__class__.__name__
+            cache = f"[{_cls}] ({self.id}) <{self.__dict__}>"
+            object.__setattr__(self, "_BaseModel__cache", cache)
+        return cache
 
     def save(self):
         """
         Updates the public instance attribute
         <<updated_at>> with the current datetime
         """
+        settle(self)
         self.updated_at = datetime.now()
         storage.save()
 
@@ -66,8 +134,15 @@ class BaseModel:
         """
         Returns a dictionary containing all keys/values
         of __dict__ of the instance
+        Usage:
+            Not cached, the storage keeps the JSON of the objects
+            it saved instead
         """
+        settle(self)
         _dict = {"__class__": self.__class__.__name__, **self.__dict__}
         _dict["created_at"] = _dict["created_at"].isoformat()
         _dict["updated_at"] = _dict["updated_at"].isoformat()
         return _dict
+
+
+register(BaseModel)
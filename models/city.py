@@ -1,4 +1,5 @@
 from models.base_model import BaseModel
+from models.relations import Reference, Related
 
 """City Class representation"""
 
@@ -10,7 +11,14 @@ class City(BaseModel):
     Attribute:
         state_id(str): empty string
         name(str): empty string
+        indexes(tuple): attributes indexed by the storage
+        state(State): the state of the city
+        places(list): the places of the city
     """
 
+    indexes = ("state_id",)
     state_id = ""
     name = ""
+
+    state = Reference("State", "state_id")
+    places = Related("Place", "city_id")
@@ -0,0 +1,235 @@
+#!/usr/bin/python3
+"""
+Compact fixed layout of the model classes
+Usage:
+    With HBNB_COMPACT_MODELS=1 the model classes are built by `Layout`:
+    the attributes declared on a class (strings, numbers, lists and
+    dictionaries) and id, created_at, updated_at are stored in
+    __slots__ instead of a per-instance __dict__, any other attribute
+    goes to a small overflow dictionary
+    __dict__ stays available as a property returning a new dictionary
+    of the attributes set on the instance, assigning it replaces them
+"""
+
+import weakref
+
+FIELD_TYPES = (str, int, float, list, dict)
+
+
+class Default:
+    """
+    Mutable default of a declared attribute
+    Usage:
+        amenity_ids = Default(list)
+        Reading the attribute of an instance that did not set it returns
+        a new value made by factory, kept aside in `pending` instead of
+        being stored on the instance, so instances never share (and
+        mutate) the same default and reading never adds an attribute
+        to save. settle stores the values that were changed since.
+        On the class it returns a new value. Works with both layouts,
+        with the compact one the value is stored in the slot of the
+        attribute
+    """
+
+    def __init__(self, factory):
+        """Make defaults with factory"""
+        self.factory = factory
+        self.name = None
+        self.pending = weakref.WeakKeyDictionary()
+
+    def __set_name__(self, owner, name):
+        """Remember the name of the attribute"""
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        """Return the default of obj, the same one until it is stored"""
+        if obj is None:
+            return self.factory()
+        value = self.pending.get(obj)
+        if value is None:
+            value = self.pending[obj] = self.factory()
+        return value
+
+
+def _defaults(cls):
+    """Return the Default attributes of cls"""
+    found = _DEFAULTS.get(cls)
+    if found is None:
+        found = []
+        for klass in cls.__mro__:
+            for value in vars(klass).values():
+                if isinstance(value, Field):
+                    value = value.default
+                if isinstance(value, Default) and value not in found:
+                    found.append(value)
+        found = _DEFAULTS[cls] = tuple(found)
+    return found
+
+
+_DEFAULTS = {}
+
+
+def settle(obj):
+    """
+    Store on obj the defaults read from it and changed since
+    Usage:
+        place.amenity_ids.append(amenity.id) changes the pending
+        default, called by BaseModel.save, to_dict and __str__ it
+        assigns the list to place.amenity_ids, which flags the place
+        as changed. Defaults that are still empty are left aside, and
+        so are the ones of attributes assigned since they were read
+    """
+    for default in _defaults(type(obj)):
+        value = default.pending.get(obj)
+        if value:
+            del default.pending[obj]
+            if default.name not in obj.__dict__:
+                setattr(obj, default.name, value)
+
+
+class Field:
+    """
+    Declared attribute of a compact class
+    Usage:
+        Reads the slot of the instance, or the default declared on
+        the class while the slot is unset. On the class itself it
+        returns the default, like the plain class attribute. A Default
+        is stored in the slot by settle once it was changed
+    """
+
+    __slots__ = ("slot", "default")
+
+    def __init__(self, slot, default):
+        """Wrap the member descriptor slot"""
+        self.slot = slot
+        self.default = default
+
+    def __get__(self, obj, owner=None):
+        """Return the value of obj, or the default"""
+        default = self.default
+        if obj is None:
+            return default.factory() if isinstance(default, Default) \
+                else default
+        try:
+            return self.slot.__get__(obj, owner)
+        except AttributeError:
+            if not isinstance(default, Default):
+                return default
+        return default.__get__(obj, owner)
+
+    def __set__(self, obj, value):
+        """Set the value of obj"""
+        self.slot.__set__(obj, value)
+
+    def __delete__(self, obj):
+        """Unset the value of obj, reading it gives the default again"""
+        self.slot.__delete__(obj)
+
+
+class Record:
+    """
+    Base of the compact model classes
+
+    Attributes:
+        id, created_at, updated_at: the slots shared by every model
+        __extra(dict): attributes without a slot, unset until needed
+        __layout(tuple): (name, member descriptor) of every slot
+                of the class, in declaration order
+    """
+
+    __slots__ = ("__extra", "id", "created_at", "updated_at")
+
+    def __getattr__(self, name):
+        """Look name up in the overflow dictionary"""
+        if name != "_Record__extra":
+            extra = getattr(self, "_Record__extra", None)
+            if extra and name in extra:
+                return extra[name]
+        raise AttributeError("'{}' object has no attribute '{}'".format(
+            self.__class__.__name__, name))
+
+    def __setattr__(self, name, value):
+        """Set a slot, or the overflow dictionary entry name"""
+        try:
+            object.__setattr__(self, name, value)
+        except AttributeError:
+            extra = getattr(self, "_Record__extra", None)
+            if extra is None:
+                extra = {}
+                object.__setattr__(self, "_Record__extra", extra)
+            extra[name] = value
+
+    def __delattr__(self, name):
+        """Unset a slot, or remove the overflow dictionary entry name"""
+        try:
+            object.__delattr__(self, name)
+        except AttributeError:
+            extra = getattr(self, "_Record__extra", None)
+            if not extra or name not in extra:
+                raise
+            del extra[name]
+
+    def __get_dict(self):
+        """Return a new dictionary of the attributes set on the instance"""
+        values = {}
+        for name, slot in self.__class__.__layout:
+            try:
+                values[name] = slot.__get__(self)
+            except AttributeError:
+                pass
+        extra = getattr(self, "_Record__extra", None)
+        if extra:
+            values.update(extra)
+        return values
+
+    def __set_dict(self, values):
+        """Replace every attribute of the instance by values"""
+        for name, slot in self.__class__.__layout:
+            try:
+                slot.__delete__(self)
+            except AttributeError:
+                pass
+        object.__setattr__(self, "_Record__extra", None)
+        for name, value in values.items():
+            Record.__setattr__(self, name, value)
+
+    __dict__ = property(__get_dict, __set_dict)
+
+
+Record._Record__layout = tuple(
+    (name, Record.__dict__[name]) for name in ("id", "created_at",
+                                               "updated_at"))
+
+
+class Layout(type):
+    """
+    Metaclass building the model classes with a fixed layout
+    Usage:
+        The "__dict__" entry of __slots__ is dropped and the class
+        gets Record as base instead, every declared attribute becomes
+        a slot read through a Field holding its default
+    """
+
+    def __new__(mcs, name, bases, namespace, **kwargs):
+        """Build the compact class name"""
+        slots = list(namespace.get("__slots__", ()))
+        if "__dict__" in slots:
+            slots.remove("__dict__")
+            bases = bases + (Record,)
+        fields = {
+            key: namespace.pop(key) for key, value in list(namespace.items())
+            if not key.startswith("_") and
+            isinstance(value, FIELD_TYPES + (Default,))
+        }
+        namespace["__slots__"] = tuple(slots) + tuple(
+            "_{}__{}".format(name.lstrip("_"), key) for key in fields)
+        cls = super().__new__(mcs, name, bases, namespace, **kwargs)
+        layout = []
+        for key, default in fields.items():
+            if isinstance(default, Default):
+                default.name = key
+            slot = cls.__dict__["_{}__{}".format(name.lstrip("_"), key)]
+            setattr(cls, key, Field(slot, default))
+            layout.append((key, slot))
+        cls._Record__layout = cls._Record__layout + tuple(layout)
+        return cls
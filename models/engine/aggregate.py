@@ -0,0 +1,234 @@
+#!/usr/bin/python3
+"""
+Module contains the aggregation engine
+
+Usage:
+    functions, by = parse("avg(price_by_night), count by city_id")
+    aggregate(objects, functions, by) -> {city id: {"avg(...)": ...}}
+    The values of each attribute are gathered in one float column and
+    every function is evaluated over the whole column at once, with
+    NumPy when it is installed
+"""
+import re
+from array import array
+from collections import Counter
+from collections.abc import Hashable
+from math import inf
+from operator import attrgetter
+
+from models.engine.columns import Columns, numpy
+
+FUNCTIONS = ("count", "sum", "avg", "min", "max")
+
+KEYS = {
+    "domain": lambda value: str(value).rpartition("@")[2].lower(),
+    "lower": lambda value: str(value).lower(),
+}
+
+_FUNCTION = re.compile(r"(\w+)\s*(?:\(\s*(\w*)\s*\))?")
+
+
+def parse_function(text):
+    """
+    Return the (function, attribute) pair of text
+    Usage:
+        "avg(price_by_night)" -> ("avg", "price_by_night"), "count"
+        and "count()" -> ("count", None). Raises ValueError
+    """
+    match = _FUNCTION.fullmatch(text.strip())
+    if match is None or match.group(1) not in FUNCTIONS:
+        raise ValueError("invalid function {}".format(text.strip()))
+    function, attribute = match.group(1), match.group(2) or None
+    if attribute is None and function != "count":
+        raise ValueError("{} needs an attribute".format(function))
+    return function, attribute
+
+
+def parse_key(text):
+    """
+    Return the attribute or the function giving the group of an
+    object from text
+    Usage:
+        "city_id" groups by the attribute, "domain(email)" by the
+        domain of the attribute, see KEYS. Raises ValueError
+    """
+    match = _FUNCTION.fullmatch(text.strip())
+    if match is None:
+        raise ValueError("invalid group {}".format(text.strip()))
+    name, attribute = match.groups()
+    if attribute is None:
+        return name
+    if name not in KEYS or not attribute:
+        raise ValueError("invalid group {}".format(text.strip()))
+    key = KEYS[name]
+    return lambda obj: key(getattr(obj, attribute, None))
+
+
+def parse(text):
+    """
+    Return the (functions, by) of an aggregation written as
+    "<function>(<attribute>), ... [by <group>]", by is None
+    when there is no group
+    """
+    by = None
+    parts = re.split(r"\s+by\s+", text.strip(), maxsplit=1)
+    functions = [parse_function(function)
+                 for function in parts[0].split(",") if function.strip()]
+    if not functions:
+        raise ValueError("function missing")
+    if len(parts) == 2:
+        by = parts[1].strip()
+    return functions, by
+
+
+def name_of(function, attribute):
+    """Return the name of the result of function on attribute"""
+    return "{}({})".format(function, attribute) if attribute else function
+
+
+def group(objects, by):
+    """
+    Return (groups, codes) where groups are the distinct groups of
+    objects in order of appearance and codes the index in groups of
+    each object
+    Usage:
+        by is a function of an object or an attribute, a missing
+        attribute being None
+    """
+    if not isinstance(by, str):
+        keys = list(map(by, objects))
+    else:
+        objects = list(objects)
+        try:
+            keys = list(map(attrgetter(by), objects))
+        except AttributeError:
+            keys = [getattr(obj, by, None) for obj in objects]
+    try:
+        found = {key: code for code, key in enumerate(dict.fromkeys(keys))}
+    except TypeError:
+        keys = [key if isinstance(key, Hashable) else str(key)
+                for key in keys]
+        found = {key: code for code, key in enumerate(dict.fromkeys(keys))}
+    return list(found), array("q", map(found.__getitem__, keys))
+
+
+def split(codes, size, values):
+    """Return the list of the values that are not NaN of each group"""
+    if size == 1:
+        return [[value for value in values if value == value]]
+    buckets = [[] for _ in range(size)]
+    appends = [bucket.append for bucket in buckets]
+    for code, value in zip(codes, values):
+        if value == value:
+            appends[code](value)
+    return buckets
+
+
+def reduce(functions, codes, size, values=None):
+    """
+    Return {function: results} of each function for each of the size
+    groups, the object i being in the group codes[i] with the value
+    values[i], values None counting the objects of each group
+    Usage:
+        NaN values are ignored, a group without values gets 0 for count
+        and sum and None for avg, min and max
+    """
+    if numpy is not None:
+        return _reduce_numpy(functions, numpy.frombuffer(codes, "q")
+                             if len(codes) else numpy.zeros(0, "q"),
+                             size, values)
+    if values is None:
+        counts = Counter(codes)
+        return {"count": [counts.get(code, 0) for code in range(size)]}
+    buckets = split(codes, size, values)
+    reducers = {"count": len, "sum": sum,
+                "avg": lambda bucket: sum(bucket) / len(bucket),
+                "min": min, "max": max}
+    return {function: [reducers[function](bucket) if bucket else
+                       (0 if function in ("count", "sum") else None)
+                       for bucket in buckets] for function in functions}
+
+
+def _reduce_numpy(functions, codes, size, values):
+    """Return the results of reduce evaluated with NumPy"""
+    if values is None:
+        return {"count": numpy.bincount(codes, minlength=size).tolist()}
+    values = numpy.asarray(values, dtype=float)
+    valid = ~numpy.isnan(values)
+    codes, values = codes[valid], values[valid]
+    counts = numpy.bincount(codes, minlength=size)
+    totals = numpy.bincount(codes, weights=values, minlength=size) \
+        if {"sum", "avg"} & set(functions) else None
+    results = {}
+    for function in functions:
+        if function == "count":
+            results[function] = counts.tolist()
+        elif function == "sum":
+            results[function] = totals.tolist()
+        elif function == "avg":
+            results[function] = [
+                total / count if count else None
+                for total, count in zip(totals.tolist(), counts.tolist())]
+        else:
+            extremes = numpy.full(size, inf if function == "min" else -inf)
+            (numpy.minimum if function == "min" else numpy.maximum).at(
+                extremes, codes, values)
+            results[function] = [
+                value if count else None
+                for value, count in zip(extremes.tolist(), counts.tolist())]
+    return results
+
+
+def _column(objects, attribute):
+    """Return the array of the values of attribute of objects"""
+    objects = list(objects)
+    try:
+        return array("d", map(attrgetter(attribute), objects))
+    except (AttributeError, TypeError):
+        return array("d", (Columns.number(getattr(obj, attribute, None))
+                           for obj in objects))
+
+
+def aggregate(objects, functions, by=None, columns=None):
+    """
+    Return {group: {result name: value}} of the functions over objects
+    Usage:
+        objects is a {key: object} dictionary, functions a list of
+        (function, attribute) pairs or of texts for parse_function and
+        by an attribute, a text for parse_key, a function of an object
+        or None for a single None group. columns is an optional
+        Columns store holding the attributes of objects, whose arrays
+        are then used instead of reading every object
+    """
+    functions = [parse_function(function) if isinstance(function, str)
+                 else tuple(function) for function in functions]
+    if columns is not None and len(columns.keys) == len(objects):
+        keys = columns.keys
+    else:
+        keys, columns = list(objects), None
+    if by is None:
+        groups, codes = [None], array("q", bytes(8 * len(keys)))
+    else:
+        if isinstance(by, str):
+            by = parse_key(by)
+        groups, codes = group(map(objects.__getitem__, keys), by)
+    values = {}
+    for _, attribute in functions:
+        if attribute is None or attribute in values:
+            continue
+        if columns is not None and attribute in columns.names:
+            values[attribute] = columns.column(attribute)
+        else:
+            values[attribute] = _column(map(objects.__getitem__, keys),
+                                        attribute)
+    results = {key: {} for key in groups}
+    reduced = {}
+    for attribute in dict.fromkeys(attribute for _, attribute in functions):
+        reduced[attribute] = reduce(
+            [function for function, name in functions if name == attribute],
+            codes, len(groups), values.get(attribute))
+    for function, attribute in functions:
+        name = name_of(function, attribute)
+        for key, value in zip(groups, reduced[attribute][function]):
+            results[key][name] = value
+    return results
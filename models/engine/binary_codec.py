@@ -0,0 +1,248 @@
+#!/usr/bin/python3
+"""
+Module contains the compact binary storage format
+
+Layout:
+    b"HBNB" + version byte, then one record per object:
+    RECORD, <number of fields>, (<name>, <value>) * number of fields
+    and a final END byte
+
+    Every value starts with a tag byte, strings are written once and
+    referenced by their index in a string table afterwards, canonical
+    UUIDs are stored as 16 raw bytes and ISO datetimes from the epoch
+    on as microseconds since the epoch (earlier ones stay strings).
+    The storage key <class name>.id is not stored, it is rebuilt from
+    the __class__ and id fields.
+
+Usage:
+    convert(source, destination), or the console command
+    echo "convert <source> <destination>" | ./console.py
+    converts a JSON storage file to the binary format or back,
+    depending on the extension of the destination (.json or not)
+"""
+import json
+import struct
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from models.engine.json_stream import iter_items
+
+MAGIC = b"HBNB\x01"
+
+END, RECORD = 0, 1
+NONE, TRUE, FALSE, INT, FLOAT, STR, REF, UUID_, TIME, LIST, DICT = range(11)
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_double = struct.Struct("<d")
+
+
+def _varint(out, number):
+    """Append the unsigned integer number to out"""
+    while number > 0x7F:
+        out.append(number & 0x7F | 0x80)
+        number >>= 7
+    out.append(number)
+
+
+class _Encoder:
+    """Serialize values to bytes, sharing one string table"""
+
+    def __init__(self):
+        """Start with an empty string table"""
+        self.strings = {}
+
+    def string(self, out, value):
+        """Append a string, as a reference when it was already written"""
+        index = self.strings.get(value)
+        if index is not None:
+            out.append(REF)
+            _varint(out, index)
+            return
+        self.strings[value] = len(self.strings)
+        data = value.encode("utf-8")
+        out.append(STR)
+        _varint(out, len(data))
+        out += data
+
+    def value(self, out, value):
+        """Append a JSON compatible value"""
+        if value is None:
+            out.append(NONE)
+        elif value is True:
+            out.append(TRUE)
+        elif value is False:
+            out.append(FALSE)
+        elif isinstance(value, int):
+            out.append(INT)
+            _varint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+        elif isinstance(value, float):
+            out.append(FLOAT)
+            out += _double.pack(value)
+        elif isinstance(value, str):
+            self.text(out, value)
+        elif isinstance(value, (list, tuple)):
+            out.append(LIST)
+            _varint(out, len(value))
+            for item in value:
+                self.value(out, item)
+        elif isinstance(value, dict):
+            out.append(DICT)
+            _varint(out, len(value))
+            for key, item in value.items():
+                self.string(out, str(key))
+                self.value(out, item)
+        else:
+            raise TypeError("Object of type {} is not serializable"
+                            .format(type(value).__name__))
+
+    def text(self, out, value):
+        """Append a string, packing UUIDs and datetimes"""
+        if len(value) == 36:
+            try:
+                uuid = UUID(value)
+            except ValueError:
+                uuid = None
+            if uuid is not None and str(uuid) == value:
+                out.append(UUID_)
+                out += uuid.bytes
+                return
+        elif 19 <= len(value) <= 26 and value[10:11] == "T":
+            try:
+                time = datetime.fromisoformat(value)
+            except ValueError:
+                time = None
+            if time is not None and time.tzinfo is None and \
+                    time >= _EPOCH and time.isoformat() == value:
+                out.append(TIME)
+                _varint(out, (time - _EPOCH) // _MICROSECOND)
+                return
+        self.string(out, value)
+
+    def record(self, value):
+        """Return the bytes of the record of the dictionary value"""
+        out = bytearray([RECORD])
+        _varint(out, len(value))
+        for key, item in value.items():
+            self.string(out, key)
+            self.value(out, item)
+        return out
+
+
+class _Decoder:
+    """Deserialize values from bytes, sharing one string table"""
+
+    def __init__(self, data):
+        """Decode data from its first record"""
+        if bytes(data[:len(MAGIC)]) != MAGIC:
+            raise ValueError("Not a binary storage file")
+        self.data = data
+        self.pos = len(MAGIC)
+        self.strings = []
+
+    def varint(self):
+        """Read an unsigned integer"""
+        data, pos = self.data, self.pos
+        number = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            number |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                self.pos = pos
+                return number
+            shift += 7
+
+    def value(self):
+        """Read a tagged value"""
+        tag = self.data[self.pos]
+        self.pos += 1
+        if tag == REF:
+            return self.strings[self.varint()]
+        if tag == STR:
+            size = self.varint()
+            end = self.pos + size
+            value = bytes(self.data[self.pos:end]).decode("utf-8")
+            self.pos = end
+            self.strings.append(value)
+            return value
+        if tag == UUID_:
+            end = self.pos + 16
+            value = str(UUID(bytes=bytes(self.data[self.pos:end])))
+            self.pos = end
+            return value
+        if tag == TIME:
+            return (_EPOCH + self.varint() * _MICROSECOND).isoformat()
+        if tag == INT:
+            number = self.varint()
+            return number >> 1 if not number & 1 else -((number + 1) >> 1)
+        if tag == NONE:
+            return None
+        if tag == TRUE:
+            return True
+        if tag == FALSE:
+            return False
+        if tag == FLOAT:
+            value = _double.unpack_from(self.data, self.pos)[0]
+            self.pos += 8
+            return value
+        if tag == LIST:
+            return [self.value() for _ in range(self.varint())]
+        if tag == DICT:
+            return {self.value(): self.value() for _ in range(self.varint())}
+        raise ValueError("Unknown tag {} at {}".format(tag, self.pos - 1))
+
+    def records(self):
+        """Yield the (key, value) pairs of the records"""
+        while True:
+            tag = self.data[self.pos]
+            self.pos += 1
+            if tag == END:
+                return
+            if tag != RECORD:
+                raise ValueError("Unknown record {}".format(tag))
+            value = {self.value(): self.value()
+                     for _ in range(self.varint())}
+            yield "{}.{}".format(value["__class__"], value["id"]), value
+
+
+def dump(items, file):
+    """
+    Write the (key, dictionary) pairs items to the binary file
+    Usage:
+        each dictionary is a to_dict() output holding __class__ and id
+    """
+    encoder = _Encoder()
+    file.write(MAGIC)
+    for _, value in items:
+        file.write(encoder.record(value))
+    file.write(bytes([END]))
+
+
+def load(file):
+    """Yield the (key, dictionary) pairs stored in the binary file"""
+    yield from _Decoder(memoryview(file.read())).records()
+
+
+def convert(source, destination):
+    """
+    Convert a storage file between the JSON and binary formats
+    Usage:
+        destination is written as JSON when its name ends with .json,
+        in the binary format otherwise
+    """
+    with open(source, "rb") as file:
+        binary = file.read(len(MAGIC)) == MAGIC
+    if binary:
+        with open(source, "rb") as file:
+            items = dict(load(file))
+    else:
+        with open(source, "r") as file:
+            items = dict(iter_items(file))
+    if destination.endswith(".json"):
+        with open(destination, "w") as file:
+            json.dump(items, file)
+    else:
+        with open(destination, "wb") as file:
+            dump(items.items(), file)
+
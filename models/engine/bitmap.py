@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+"""
+Module contains `BitmapIndex` class
+"""
+
+SEQUENCES = (list, tuple, set, frozenset)
+
+
+class BitmapIndex:
+    """
+    Bitmap Index Representation
+    Usage:
+        Gives every key a small integer ordinal and keeps, for every
+        value found in the lists of the keys, a bitmap (a bytearray)
+        with the bits of the ordinals of the keys holding it, so
+        the keys holding all or any of several values are a bitwise
+        AND or OR of a few bitmaps, evaluated on them as Python ints.
+        Ordinals of removed keys are reused to keep the bitmaps short
+
+    Methodes:
+        put: stores or replaces the values of a key
+        remove: drops a key
+        all: returns the keys holding every value
+        any: returns the keys holding at least one value
+
+    Attributes:
+        bitmaps(dict): {value: bitmap of the ordinals holding it}
+        counts(dict): {value: number of keys holding it}
+        ordinals(dict): the ordinal of each key
+        keys(list): the key of each ordinal, None when it is free
+        values(dict): the values of each key
+        __free(list): the ordinals of the removed keys
+    """
+
+    def __init__(self):
+        """Start with no key"""
+        self.bitmaps = {}
+        self.counts = {}
+        self.ordinals = {}
+        self.keys = []
+        self.values = {}
+        self.__free = []
+
+    def put(self, key, values):
+        """
+        Store values as the values of key
+        Usage:
+            values is a list, tuple or set of hashable values,
+            anything else stores no value for key
+        """
+        try:
+            values = frozenset(values) if isinstance(values, SEQUENCES) \
+                else frozenset()
+        except TypeError:
+            values = frozenset()
+        old = self.values.get(key)
+        if old == values:
+            return
+        ordinal = self.ordinals.get(key)
+        if ordinal is None:
+            ordinal = self.__free.pop() if self.__free else len(self.keys)
+            if ordinal == len(self.keys):
+                self.keys.append(key)
+            else:
+                self.keys[ordinal] = key
+            self.ordinals[key] = ordinal
+            old = frozenset()
+        for value in old - values:
+            self.__clear(value, ordinal)
+        byte, bit = ordinal >> 3, 1 << (ordinal & 7)
+        for value in values - old:
+            bitmap = self.bitmaps.get(value)
+            if bitmap is None:
+                bitmap = self.bitmaps[value] = bytearray()
+            if byte >= len(bitmap):
+                bitmap.extend(bytes(byte + 1 - len(bitmap)))
+            bitmap[byte] |= bit
+            self.counts[value] = self.counts.get(value, 0) + 1
+        self.values[key] = values
+
+    def __clear(self, value, ordinal):
+        """Clear the bit of ordinal in the bitmap of value"""
+        if self.counts[value] == 1:
+            del self.bitmaps[value]
+            del self.counts[value]
+            return
+        self.counts[value] -= 1
+        self.bitmaps[value][ordinal >> 3] &= ~(1 << (ordinal & 7)) & 0xFF
+
+    def remove(self, key):
+        """Drop key and its values"""
+        ordinal = self.ordinals.pop(key, None)
+        if ordinal is None:
+            return
+        for value in self.values.pop(key):
+            self.__clear(value, ordinal)
+        self.keys[ordinal] = None
+        self.__free.append(ordinal)
+
+    def __bitmap(self, value):
+        """Return the bitmap of value as an int"""
+        bitmap = self.bitmaps.get(value)
+        return int.from_bytes(bitmap, "little") if bitmap else 0
+
+    def __keys(self, bitmap):
+        """Return the keys of the bits set in bitmap, in ordinal order"""
+        bits = bin(bitmap)[:1:-1]
+        found = []
+        ordinal = bits.find("1")
+        while ordinal != -1:
+            found.append(self.keys[ordinal])
+            ordinal = bits.find("1", ordinal + 1)
+        return found
+
+    def all(self, values):
+        """Return the keys holding every value of values"""
+        values = sorted(set(values), key=lambda value:
+                        self.counts.get(value, 0))
+        if not values:
+            return [key for key in self.keys if key is not None]
+        bitmap = self.__bitmap(values[0])
+        for value in values[1:]:
+            if not bitmap:
+                break
+            bitmap &= self.__bitmap(value)
+        return self.__keys(bitmap)
+
+    def any(self, values):
+        """Return the keys holding at least one value of values"""
+        bitmap = 0
+        for value in set(values):
+            bitmap |= self.__bitmap(value)
+        return self.__keys(bitmap)
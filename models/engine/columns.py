@@ -0,0 +1,163 @@
+#!/usr/bin/python3
+"""
+Module contains `Columns` class
+"""
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class Columns:
+    """
+    Columnar Side-Store Representation
+    Usage:
+        Keeps the numeric attributes listed in the `columns` tuple of a
+        model class in one array per attribute, row i of every array
+        holding the values of the object keys[i], so a range filter
+        over every object is a single pass over a few arrays
+        The arrays are NumPy arrays when NumPy is installed and
+        array.array("d") otherwise. Values are stored as floats,
+        missing or non numeric values as NaN which matches no range
+
+    Methodes:
+        bounds: checks and normalizes the ranges of a query
+        column: returns the values of an attribute for every row
+        contains: tells if the values of an object are inside ranges
+        put: stores the values of an object
+        update: stores one value of an object
+        remove: drops the row of an object
+        select: returns the keys of the rows inside every range
+
+    Attributes:
+        names(tuple): the attributes stored
+        keys(list): the <class name>.id of each row
+        rows(dict): the row of each <class name>.id
+        __data(dict): the array of each attribute, numpy arrays are
+                allocated ahead so only len(keys) rows are in use
+    """
+
+    def __init__(self, names):
+        """Start with no rows for the attributes names"""
+        self.names = tuple(names)
+        self.keys = []
+        self.rows = {}
+        if numpy is not None:
+            self.__data = {name: numpy.empty(16) for name in self.names}
+        else:
+            self.__data = {name: array("d") for name in self.names}
+
+    @staticmethod
+    def number(value):
+        """Return value as a float, NaN when it is not a number"""
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return float("nan")
+
+    @staticmethod
+    def bounds(model, ranges):
+        """
+        Return ranges as {attribute: (low, high)}
+        Usage:
+            A range is a (low, high) pair, None for an open bound,
+            or a single number for an exact value. Raises ValueError
+            when an attribute is not in the columns of model
+        """
+        result = {}
+        for name, value in ranges.items():
+            if name not in getattr(model, "columns", ()):
+                raise ValueError("{} is not a column of {}".format(
+                    name, model.__name__))
+            if not isinstance(value, (tuple, list)):
+                value = (value, value)
+            low, high = value
+            result[name] = (None if low is None else float(low),
+                            None if high is None else float(high))
+        return result
+
+    @classmethod
+    def contains(cls, obj, ranges):
+        """Return True when the values of obj are inside every range"""
+        for name, (low, high) in ranges.items():
+            value = cls.number(getattr(obj, name, None))
+            if value != value or low is not None and value < low or \
+                    high is not None and value > high:
+                return False
+        return True
+
+    def put(self, key, obj):
+        """Store the attributes of obj in the row of key"""
+        row = self.rows.get(key)
+        if row is None:
+            row = self.rows[key] = len(self.keys)
+            self.keys.append(key)
+            self.__grow()
+        for name in self.names:
+            self.__data[name][row] = self.number(getattr(obj, name, None))
+
+    def update(self, key, name, value):
+        """Store the attribute name of the row of key"""
+        row = self.rows.get(key)
+        if row is not None:
+            self.__data[name][row] = self.number(value)
+
+    def remove(self, key):
+        """Drop the row of key, the last row takes its place"""
+        row = self.rows.pop(key, None)
+        if row is None:
+            return
+        last = self.keys.pop()
+        if last != key:
+            self.keys[row] = last
+            self.rows[last] = row
+            for column in self.__data.values():
+                column[row] = column[len(self.keys)]
+        if numpy is None:
+            for column in self.__data.values():
+                column.pop()
+
+    def column(self, name):
+        """Return the array of the values of name, row i for keys[i]"""
+        if numpy is not None:
+            return self.__data[name][:len(self.keys)]
+        return self.__data[name]
+
+    def __grow(self):
+        """Make room for the row len(keys) - 1"""
+        size = len(self.keys)
+        for name, column in self.__data.items():
+            if numpy is None:
+                column.append(0.0)
+            elif size > len(column):
+                grown = numpy.empty(len(column) * 2)
+                grown[:len(column)] = column
+                self.__data[name] = grown
+
+    def select(self, ranges):
+        """
+        Return the keys of the rows inside every range
+        Usage:
+            ranges maps attribute names to (low, high) bounds,
+            both included, None for an open bound
+        """
+        size = len(self.keys)
+        if numpy is not None:
+            mask = numpy.ones(size, dtype=bool)
+            for name, (low, high) in ranges.items():
+                column = self.__data[name][:size]
+                mask &= ~numpy.isnan(column)
+                if low is not None:
+                    mask &= column >= low
+                if high is not None:
+                    mask &= column <= high
+            return [self.keys[row] for row in numpy.flatnonzero(mask)]
+        rows = range(size)
+        for name, (low, high) in ranges.items():
+            column = self.__data[name]
+            low = float("-inf") if low is None else low
+            high = float("inf") if high is None else high
+            rows = [row for row in rows if low <= column[row] <= high]
+        return [self.keys[row] for row in rows]
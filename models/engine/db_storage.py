@@ -0,0 +1,516 @@
+#!/usr/bin/python3
+"""
+Module contains `DBStorage` class
+"""
+import json
+import sqlite3
+from contextlib import contextmanager
+
+from models.engine.aggregate import aggregate
+from models.engine.bitmap import SEQUENCES
+from models.engine.columns import Columns
+from models.engine.text_index import TextIndex
+from models.registry import classes, get_class
+
+
+class DBStorage:
+    """
+    SQLite Storage Class Representation
+    Usage:
+        Stores instances in a SQLite database with the same
+        all/new/save/reload contract as FileStorage
+
+    WorkFlow:
+        <class 'BaseModel'> -> to_dict() -> one row of the table of its class
+        row -> <class 'dict'> -> <class 'BaseModel'>
+
+    Tables:
+        One table per class: id (primary key), created_at, updated_at,
+        one column per attribute of the `indexes` tuple of the class
+        (with a SQL index) and data, the JSON encoded to_dict()
+
+    Methodes:
+        all: Returns the objects
+        count: Returns the number of objects
+        find: Returns the objects of a class matching attribute values
+        select: Returns the objects of a class inside numeric ranges
+        new: adds an object
+        delete: removes an object
+        mark_dirty: flags an object as changed since the last save
+        save: writes the changed objects in one transaction
+        reload: loads every object from the database
+        close: closes the database connection
+        flush: waits for the pending writes
+        batch: context manager deferring the saves to the end of the block
+        begin: starts deferring the saves
+        commit: saves once what changed since begin
+        rollback: undoes in memory what changed since begin
+
+    Attributes:
+        __file_path(str): path to the SQLite database
+        __connection(sqlite3.Connection): connection to __path
+        __path(str): the __file_path __connection was opened on
+        __objects(dict): loaded objects by <class name>.id
+        __classes(dict): loaded objects grouped by class name
+        __loaded(set): names of the classes whose rows are all loaded,
+                the other classes only hold the objects read one by
+                one or created since the connection was opened
+        __dirty(dict): objects changed since the last save by
+                <class name>.id, the value is None when deleted
+        __tables(set): names of the tables known to exist
+        __batch(tuple): state of the storage when begin was called, as
+                (objects, {<class name>.id: __dict__ copy}, dirty),
+                None when the saves are not deferred
+    """
+
+    __file_path = "storage_file.db"
+    __connection = None
+    __path = None
+    __objects = {}
+    __classes = {}
+    __loaded = set()
+    __dirty = {}
+    __tables = set()
+    __batch = None
+
+    def __connect(self):
+        """Return the connection to __file_path, opening it if needed"""
+        connection = DBStorage.__connection
+        if connection is None or DBStorage.__path != DBStorage.__file_path:
+            self.close()
+            connection = sqlite3.connect(DBStorage.__file_path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            DBStorage.__connection = connection
+            DBStorage.__path = DBStorage.__file_path
+            DBStorage.__tables = set()
+            DBStorage.__objects = {}
+            DBStorage.__classes = {}
+            DBStorage.__loaded = set()
+            DBStorage.__dirty = {}
+        return connection
+
+    def close(self):
+        """Close the database connection"""
+        if DBStorage.__connection is not None:
+            DBStorage.__connection.close()
+            DBStorage.__connection = None
+
+    def flush(self):
+        """
+        Wait for the pending writes
+        Usage:
+            save commits synchronously, so nothing is ever pending
+        """
+
+    def __model(self, cls):
+        """Return the model class named cls"""
+        return get_class(cls)
+
+    def __table(self, cls):
+        """Create the table of cls and its indexes when missing"""
+        connection = self.__connect()
+        if cls in DBStorage.__tables:
+            return
+        model = self.__model(cls)
+        if model is None:
+            raise ValueError("Unknown class {}".format(cls))
+        columns = "".join(", {} TEXT".format(name) for name in model.indexes)
+        with connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS "{}" (id TEXT PRIMARY KEY, '
+                "created_at TEXT, updated_at TEXT{}, data TEXT NOT NULL)"
+                .format(cls, columns))
+            for name in model.indexes:
+                connection.execute(
+                    'CREATE INDEX IF NOT EXISTS "{0}_{1}" ON "{0}" ({1})'
+                    .format(cls, name))
+        DBStorage.__tables.add(cls)
+
+    def __load(self, cls):
+        """Load every object of cls on first access"""
+        self.__connect()
+        if cls not in DBStorage.__loaded:
+            self.__fetch(cls)
+            DBStorage.__loaded.add(cls)
+        return DBStorage.__classes[cls]
+
+    def __fetch(self, cls, where="", params=()):
+        """
+        Return {key: object} of the rows of cls matching where
+        Usage:
+            where is an SQL condition on the table of cls with params
+            as its parameters, every row when empty. Objects already
+            in memory are returned as they are, the others are loaded
+            and kept. Changed and deleted objects are left out, their
+            rows are out of date
+        """
+        self.__table(cls)
+        model = self.__model(cls)
+        objects = DBStorage.__classes.setdefault(cls, {})
+        rows = DBStorage.__connection.execute(
+            'SELECT id, data FROM "{}"{}'.format(
+                cls, " WHERE " + where if where else ""), params)
+        found = {}
+        for _id, data in rows:
+            key = "{}.{}".format(cls, _id)
+            if key in DBStorage.__dirty:
+                continue
+            obj = objects.get(key)
+            if obj is None:
+                obj = model.from_record(json.loads(data))
+                objects[key] = obj
+                DBStorage.__objects[key] = obj
+            found[key] = obj
+        return found
+
+    def __unsaved(self, cls):
+        """Return {key: object} of the changed objects of cls"""
+        return {key: obj for key, obj in DBStorage.__dirty.items()
+                if obj is not None and key.startswith(cls + ".")}
+
+    def __names(self, cls):
+        """
+        Return the class names of cls or of every model
+        Usage:
+            every model is a registered class or has a table
+        """
+        if cls is None:
+            rows = self.__connect().execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'")
+            names = {name for name, in rows} | set(classes)
+            return sorted(name for name in names if get_class(name))
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return [cls]
+
+    def all(self, cls=None):
+        """
+        Returns the dictionary of the objects
+        Usage:
+            When cls (a class or a class name) is given only the
+            objects of this class are returned, in a new dictionary
+        """
+        for name in self.__names(cls):
+            self.__load(name)
+        if cls is None:
+            return DBStorage.__objects
+        return dict(DBStorage.__classes[self.__names(cls)[0]])
+
+    def count(self, cls=None):
+        """
+        Returns the number of objects
+        Usage:
+            Classes that are not loaded and have no unsaved change
+            are counted in the database, unknown classes count 0
+        """
+        total = 0
+        connection = self.__connect()
+        for name in self.__names(cls):
+            if self.__model(name) is None:
+                continue
+            if name in DBStorage.__loaded or any(
+                    key.startswith(name + ".") for key in DBStorage.__dirty):
+                total += len(self.__load(name))
+            else:
+                self.__table(name)
+                total += connection.execute(
+                    'SELECT COUNT(*) FROM "{}"'.format(name)).fetchone()[0]
+        return total
+
+    def get(self, cls, _id):
+        """
+        Returns the object of cls with the id _id, None if there is none
+        Usage:
+            storage.get(Place, "<place id>")
+            Only the row of the object is read when it is not loaded
+        """
+        self.__connect()
+        name = self.__names(cls)[0]
+        key = "{}.{}".format(name, _id)
+        obj = DBStorage.__classes.get(name, {}).get(key)
+        if obj is None and name not in DBStorage.__loaded and \
+                key not in DBStorage.__dirty:
+            obj = self.__fetch(name, "id = ?", [str(_id)]).get(key)
+        return obj
+
+    def find(self, cls, **attributes):
+        """
+        Returns the objects of cls matching every attribute value
+        Usage:
+            storage.find(Review, place_id="<place id>")
+            Indexed attributes are looked up with the SQL index,
+            unsaved objects are checked in memory
+        """
+        self.__connect()
+        name = self.__names(cls)[0]
+        model = self.__model(name)
+        if model is None:
+            raise ValueError("Unknown class {}".format(name))
+        indexed = {key: value for key, value in attributes.items()
+                   if key in model.indexes}
+        if indexed:
+            where = " AND ".join("{} = ?".format(key) for key in indexed)
+            candidates = self.__fetch(name, where, [
+                str(value) for value in indexed.values()])
+            candidates.update(self.__unsaved(name))
+        else:
+            candidates = self.__load(name)
+        return {
+            key: obj for key, obj in candidates.items()
+            if all(getattr(obj, attr, None) == value
+                   for attr, value in attributes.items())
+        }
+
+    def select(self, cls, **ranges):
+        """
+        Returns the objects of cls inside every numeric range
+        Usage:
+            storage.select(Place, price_by_night=(50, 100))
+            Same ranges as FileStorage.select, evaluated by SQLite on
+            the saved rows, unsaved objects are checked in memory
+        """
+        name = self.__names(cls)[0]
+        model = self.__model(name)
+        if model is None:
+            raise ValueError("Unknown class {}".format(name))
+        ranges = Columns.bounds(model, ranges)
+        where, params = [], []
+        for attr, (low, high) in ranges.items():
+            value = "CAST(COALESCE(json_extract(data, '$.{}'), ?) AS REAL)" \
+                .format(attr)
+            default = getattr(model, attr, None)
+            for bound, operator in ((low, " >= ?"), (high, " <= ?")):
+                if bound is not None:
+                    where.append(value + operator)
+                    params += [default, bound]
+        found = self.__fetch(name, " AND ".join(where), params)
+        found.update(self.__unsaved(name))
+        return {key: obj for key, obj in found.items()
+                if Columns.contains(obj, ranges)}
+
+    def search(self, cls, query, limit=None):
+        """
+        Returns the objects of cls matching the words of query
+        Usage:
+            Same arguments and BM25 ranking as FileStorage.search,
+            the text index is built on the loaded objects for each
+            search
+        """
+        name = self.__names(cls)[0]
+        model = self.__model(name)
+        if model is None:
+            raise ValueError("Unknown class {}".format(name))
+        searchable = getattr(model, "searchable", ())
+        if not searchable:
+            raise ValueError("{} is not searchable".format(name))
+        objects = self.__load(name)
+        index = TextIndex()
+        for key, obj in objects.items():
+            index.put(key, "\n".join(str(getattr(obj, attr, ""))
+                                     for attr in searchable))
+        return {key: objects[key] for _, key in index.search(query, limit)}
+
+    def having(self, cls, match="all", **values):
+        """
+        Returns the objects of cls whose list attributes hold values
+        Usage:
+            Same arguments as FileStorage.having, evaluated on the
+            loaded objects
+        """
+        name = self.__names(cls)[0]
+        model = self.__model(name)
+        if model is None:
+            raise ValueError("Unknown class {}".format(name))
+        if match not in ("all", "any"):
+            raise ValueError("match must be all or any")
+        for attr in values:
+            if attr not in getattr(model, "bitmaps", ()):
+                raise ValueError("{} has no bitmap index on {}".format(
+                    name, attr))
+        test = all if match == "all" else any
+        found = {}
+        for key, obj in self.__load(name).items():
+            for attr, wanted in values.items():
+                held = getattr(obj, attr, None)
+                if not isinstance(held, SEQUENCES) or \
+                        not test(value in held for value in wanted):
+                    break
+            else:
+                found[key] = obj
+        return found
+
+    def aggregate(self, cls, *functions, by=None):
+        """
+        Returns {group: {result: value}} of functions over the objects
+        of cls
+        Usage:
+            Same functions and groups as FileStorage.aggregate,
+            evaluated on the loaded objects
+        """
+        name = self.__names(cls)[0]
+        if self.__model(name) is None:
+            raise ValueError("Unknown class {}".format(name))
+        return aggregate(self.__load(name), functions, by)
+
+    def new(self, obj):
+        """
+        Add a new object to the storage
+        Usage:
+            Sets the obj with key <obj class name>.id, it is
+            written to the database by the next save, the other
+            objects of its class are not loaded
+        """
+        self.__connect()
+        cls = obj.__class__.__name__
+        key = "{}.{}".format(cls, obj.id)
+        DBStorage.__classes.setdefault(cls, {})[key] = obj
+        DBStorage.__objects[key] = obj
+        DBStorage.__dirty[key] = obj
+
+    def delete(self, obj=None):
+        """
+        Remove an object from the storage
+        Usage:
+            The row is deleted by the next save, does nothing
+            when obj is None
+        """
+        if obj is None:
+            return
+        self.__connect()
+        cls = obj.__class__.__name__
+        key = "{}.{}".format(cls, obj.id)
+        objects = DBStorage.__classes.setdefault(cls, {})
+        if objects.pop(key, None) is not None or \
+                cls not in DBStorage.__loaded:
+            DBStorage.__objects.pop(key, None)
+            DBStorage.__dirty[key] = None
+
+    def mark_dirty(self, obj, name=None):
+        """
+        Flag an object as changed
+        Usage:
+            The object will be written by the next save,
+            objects that are not in the storage are ignored
+        """
+        key = "{}.{}".format(obj.__class__.__name__, getattr(obj, "id", ""))
+        if DBStorage.__objects.get(key) is obj:
+            DBStorage.__dirty[key] = obj
+
+    def begin(self):
+        """
+        Start deferring the saves
+        Usage:
+            save does nothing until commit or rollback is called,
+            returns False when the saves were already deferred
+        """
+        if DBStorage.__batch is not None:
+            return False
+        objects = self.all()
+        DBStorage.__batch = (
+            dict(objects),
+            {key: dict(obj.__dict__) for key, obj in objects.items()},
+            dict(DBStorage.__dirty),
+        )
+        return True
+
+    def commit(self):
+        """Stop deferring the saves and save once"""
+        DBStorage.__batch = None
+        self.save()
+
+    def rollback(self):
+        """
+        Stop deferring the saves and undo the changes in memory
+        Usage:
+            Objects created since begin are dropped, deleted ones
+            are restored and every attribute is set back
+        """
+        if DBStorage.__batch is None:
+            return
+        objects, values, dirty = DBStorage.__batch
+        DBStorage.__batch = None
+        DBStorage.__objects.clear()
+        DBStorage.__objects.update(objects)
+        for cls in DBStorage.__classes.values():
+            cls.clear()
+        for key, obj in objects.items():
+            obj.__dict__ = dict(values[key])
+            DBStorage.__classes[key.split(".")[0]][key] = obj
+        DBStorage.__dirty.clear()
+        DBStorage.__dirty.update(dirty)
+
+    @contextmanager
+    def batch(self):
+        """
+        Defer the saves to the end of the block
+        Usage:
+            with storage.batch():
+                ...
+            The objects are saved once when the block exits, the
+            changes are rolled back if it raises. Nested blocks
+            are part of the outermost one
+        """
+        if not self.begin():
+            yield self
+            return
+        try:
+            yield self
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit()
+
+    def save(self):
+        """
+        Save the changed objects
+        Usage:
+            Upserts one row per changed object and deletes the rows
+            of the deleted ones, in a single transaction
+            Does nothing while the saves are deferred by begin
+        """
+        if DBStorage.__batch is not None:
+            return
+        connection = self.__connect()
+        puts, deletes = {}, {}
+        for key, obj in DBStorage.__dirty.items():
+            cls, _id = key.split(".", 1)
+            self.__table(cls)
+            if obj is None:
+                deletes.setdefault(cls, []).append((_id,))
+                continue
+            value = obj.to_dict()
+            row = [_id, value["created_at"], value["updated_at"]]
+            row += [getattr(obj, name, None) for name in obj.indexes]
+            row.append(json.dumps(value))
+            puts.setdefault(cls, []).append(row)
+        with connection:
+            for cls, rows in deletes.items():
+                connection.executemany(
+                    'DELETE FROM "{}" WHERE id = ?'.format(cls), rows)
+            for cls, rows in puts.items():
+                columns = ["id", "created_at", "updated_at"]
+                columns += list(self.__model(cls).indexes) + ["data"]
+                connection.executemany(
+                    'INSERT INTO "{}" ({}) VALUES ({}) ON CONFLICT(id) '
+                    "DO UPDATE SET {}".format(
+                        cls, ", ".join(columns),
+                        ", ".join("?" * len(columns)),
+                        ", ".join("{0} = excluded.{0}".format(column)
+                                  for column in columns[1:])),
+                    rows)
+        DBStorage.__dirty.clear()
+
+    def reload(self):
+        """
+        Reload objects from the database
+        Usage:
+            Loads every row of every table, the objects are loaded
+            on first access so there is no need to call it
+        """
+        self.__connect()
+        DBStorage.__objects = {}
+        DBStorage.__classes = {}
+        DBStorage.__loaded = set()
+        DBStorage.__dirty = {}
+        self.all()
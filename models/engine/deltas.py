@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""
+Module contains `DeltaLog` class
+"""
+import glob
+import os
+
+from models.engine.journal import Journal
+
+
+class DeltaLog:
+    """
+    Delta Files Representation
+    Usage:
+        Each save writes the changed and deleted objects to a new
+        small delta file, a checkpoint records the last delta already
+        folded into the snapshot so only the later ones are replayed
+
+    Files:
+        <path>.delta.<sequence>: the records of one save, in the
+            Journal format
+        <path>.checkpoint: the sequence of the last delta contained
+            in the snapshot
+
+    Methodes:
+        write: writes a new delta file
+        delta_path: returns the path of the delta file of a sequence
+        replay: yields the records of the deltas after the checkpoint
+        checkpoint: records that the snapshot contains every delta up
+            to a sequence and removes their files
+
+    Attributes:
+        path(str): path of the snapshot the deltas apply to
+        last(int): sequence of the last delta written
+        folded(int): sequence of the checkpoint
+        pending(dict): size in bytes of each delta after the checkpoint
+        written(int): number of deltas written since the log was opened
+        compactions(int): number of checkpoints since the log was opened
+    """
+
+    def __init__(self, path):
+        """Open the deltas of the snapshot path"""
+        self.path = path
+        self.folded = 0
+        if os.path.isfile(self.__checkpoint_path()):
+            with open(self.__checkpoint_path(), "r") as file:
+                self.folded = int(file.read() or 0)
+        self.pending = {}
+        for delta in glob.glob(glob.escape(path) + ".delta.*"):
+            sequence = delta.rsplit(".", 1)[1]
+            if sequence.isdigit() and int(sequence) > self.folded:
+                self.pending[int(sequence)] = os.path.getsize(delta)
+        self.last = max(self.pending, default=self.folded)
+        self.written = 0
+        self.compactions = 0
+
+    def __checkpoint_path(self):
+        """Return the path of the checkpoint file"""
+        return self.path + ".checkpoint"
+
+    def delta_path(self, sequence):
+        """Return the path of the delta file of sequence"""
+        return "{}.delta.{:010d}".format(self.path, sequence)
+
+    def write(self, records, sync=False):
+        """
+        Write records to a new delta file
+        Usage:
+            records is a list of Journal records, nothing is written
+            when it is empty. Returns the sequence of the delta
+        """
+        if not records:
+            return self.last
+        self.last += 1
+        path = self.delta_path(self.last)
+        Journal(path).append(records, sync)
+        self.pending[self.last] = os.path.getsize(path)
+        self.written += 1
+        return self.last
+
+    def replay(self):
+        """Yield the records of the deltas after the checkpoint, in order"""
+        for sequence in sorted(self.pending):
+            yield from Journal(self.delta_path(sequence)).replay()
+
+    def checkpoint(self, sequence):
+        """
+        Record that the snapshot contains the deltas up to sequence
+        Usage:
+            The checkpoint is written before the folded delta files
+            are removed, replaying a delta twice is harmless
+        """
+        temp = self.__checkpoint_path() + ".tmp"
+        with open(temp, "w") as file:
+            file.write(str(sequence))
+        os.replace(temp, self.__checkpoint_path())
+        self.folded = sequence
+        for folded in [seq for seq in self.pending if seq <= sequence]:
+            del self.pending[folded]
+            os.remove(self.delta_path(folded))
+        self.compactions += 1
@@ -2,8 +2,34 @@
 """
 Module contains `FileStorage` class
 """
+import glob
 import json
+import atexit
 import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from models.engine import binary_codec
+from models.engine.aggregate import aggregate
+from models.engine.bitmap import BitmapIndex
+from models.engine.columns import Columns
+from models.engine.deltas import DeltaLog
+from models.engine.geo import GeoIndex
+from models.engine.journal import Journal
+from models.engine.text_index import TextIndex
+from models.engine.json_stream import iter_items
+from models.registry import get_class
+
+
+def _read_shard(path):
+    """Return the (key, value) pairs stored in the shard file path"""
+    if path.endswith(FileStorage.BINARY_EXT):
+        with open(path, "rb") as file:
+            return list(binary_codec.load(file))
+    with open(path, "r") as file:
+        return list(iter_items(file))
 
 
 class FileStorage:
@@ -20,23 +46,563 @@ class FileStorage:
 
     Methodes:
         all: Returns the object
+        count: Returns the number of objects
+        get: Returns the object of a class with an id
+        find: Returns the objects of a class matching attribute values
+        select: Returns the objects of a class inside numeric ranges
+        radius: Returns the objects of a class within a distance of a point
+        bbox: Returns the objects of a class inside a bounding box
+        nearest: Returns the objects of a class nearest to a point
+        search: Returns the objects of a class matching words, ranked
+        having: Returns the objects of a class whose lists hold values
+        aggregate: Returns functions of attributes per group of objects
         new: updates the dictionary id
+        delete: removes an object from the dictionary
+        mark_dirty: flags an object as changed since the last save
         save: Serializes, or converts Python objects into JSON strings
         reload: Deserializes, or converts JSON strings into Python objects.
+        enable_journal: switches save to the append-only journal mode
+        enable_shards: switches to one storage file per class
+        enable_binary: switches the storage files to the binary format
+        batch: context manager deferring the saves to the end of the block
+        begin: starts deferring the saves
+        commit: saves once what changed since begin
+        rollback: undoes in memory what changed since begin
+        enable_async: moves the writes of save to a background thread
+        flush: writes the pending changes and waits for the write
+        set_durability: chooses when the writes are synced to the disk
+        enable_deltas: switches save to delta files compacted in the
+            background
+        compact: folds the delta files into a new snapshot
+        stats: returns the counters of the delta files
 
     Attributes:
         __file_path(str): The name of the file to save objects to.
                 string - path to the JSON file (ex: file.json)
         __objects(dict): A dictionary of instantiated objects.
                 empty but will store all objects by <class name>.id
+        __dirty(dict): objects changed since the last save by <class name>.id
+                the value is None when the object was deleted
+        __encoded(dict): last JSON encoding of each object by <class name>.id
+                as (object, fragment), reused while the object is clean
+        __classes(dict): the objects of __objects grouped by class name
+                as {<class name>: {<class name>.id: object}}
+        __attributes(dict): secondary indexes on the attributes listed in
+                the `indexes` tuple of the model classes, as
+                {(<class name>, <attribute>): {value: {<class name>.id: obj}}}
+        __values(dict): the value each object is indexed under, as
+                {(<class name>, <attribute>): {<class name>.id: value}}
+        __columns(dict): the Columns side-store of the attributes listed
+                in the `columns` tuple of the model classes, by class name
+        __geo(dict): the GeoIndex of the (latitude, longitude) attributes
+                named by the `location` tuple of the model classes,
+                by class name
+        __bitmaps(dict): the BitmapIndex of each list attribute named by
+                the `bitmaps` tuple of the model classes, as
+                {<class name>: {<attribute>: BitmapIndex}}
+        __text(dict): the TextIndex of the attributes listed in the
+                `searchable` tuple of the model classes, by class name
+        __text_path(str): the <__file_path>.search file __text was
+                loaded from and is saved to
+        __indexed(dict): the __objects dictionary the indexes were built from
+        __loaded(bool): True once the file was loaded in __objects,
+                nothing is read from the file before the first access
+        __loaded_classes(set): names of the classes already loaded
+                while __loaded is still False
+        __journal(Journal): append-only log of the changes, None when
+                every save rewrites the whole file
+        __journal_limit(int): number of journal records before the
+                journal is folded back into __file_path
+        __shards(int): number of processes loading the per class files,
+                0 when every class is stored in __file_path
+        __binary(bool): True when the objects are stored in the compact
+                binary format of binary_codec instead of JSON
+        __migrate(bool): True when the objects were read from __file_path
+                and every storage file must be written by the next save,
+                which then removes __file_path with per class files
+        __batch(tuple): state of the storage when begin was called, as
+                (objects, {<class name>.id: __dict__ copy}, dirty),
+                None when the saves are not deferred
+        __window(float): seconds the background thread waits to group
+                the saves into one write, 0 when save writes right away
+        __pending(bool): True when a save is waiting for the thread
+        __wakeup(threading.Event): set by save to wake the thread up
+        __flusher(threading.Thread): the background thread or None
+        __error(Exception): error of the last background write
+        __lock(threading.RLock): held while objects are added, changed,
+                removed or serialized
+        __writing(threading.Lock): held by flush and compact while they
+                write the files without __lock, so their writes are not
+                interleaved
+        __durability(str): one of DURABILITY, see set_durability
+        __interval(float): seconds between two fsync in "interval" policy
+        __synced(float): time.monotonic() of the last fsync,
+                -inf before the first one
+        __unsynced(set): paths written without fsync in "interval"
+                policy, synced by __sync_timer
+        __sync_timer(threading.Timer): syncs __unsynced once the
+                interval expires, None when nothing waits
+        __deltas(DeltaLog): delta files written by save, None when save
+                writes the snapshot or the journal
+        __compaction(tuple): (deltas, bytes, ratio) thresholds starting a
+                compaction: number of delta files, their size in bytes
+                and their size relative to the snapshot
+        __snapshot_bytes(int): size of the snapshot files
+        __compactor(threading.Thread): the compaction thread or None
+        __compact_wakeup(threading.Event): set by save to start a
+                compaction
+        __compacting(threading.Lock): held during a compaction
+        __compaction_time(float): seconds taken by the last compaction
+        DURABILITY(tuple): the durability policies
+        BINARY_EXT(str): extension replacing the one of __file_path
+                for the files in the binary format
+        BUFFER_SIZE(int): size of the write buffer of the storage files
     """
 
+    BINARY_EXT = ".hbnb"
+    BUFFER_SIZE = 1 << 16
+    DURABILITY = ("none", "file", "dir", "interval")
+
     __file_path = "storage_file.json"
     __objects = {}
+    __dirty = {}
+    __encoded = {}
+    __classes = {}
+    __attributes = {}
+    __values = {}
+    __columns = {}
+    __geo = {}
+    __bitmaps = {}
+    __text = {}
+    __text_path = None
+    __indexed = None
+    __loaded = False
+    __loaded_classes = set()
+    __journal = None
+    __journal_limit = 1000
+    __shards = 0
+    __binary = False
+    __migrate = False
+    __batch = None
+    __window = 0
+    __pending = False
+    __wakeup = threading.Event()
+    __flusher = None
+    __error = None
+    __lock = threading.RLock()
+    __writing = threading.Lock()
+    __durability = "none"
+    __interval = 1.0
+    __synced = float("-inf")
+    __unsynced = set()
+    __sync_timer = None
+    __deltas = None
+    __compaction = (100, 1 << 20, 0.5)
+    __snapshot_bytes = 0
+    __compactor = None
+    __compact_wakeup = threading.Event()
+    __compacting = threading.Lock()
+    __compaction_time = 0.0
+
+    def all(self, cls=None):
+        """
+        Returns the dictionary __objects
+        Usage:
+            When cls (a class or a class name) is given only the
+            objects of this class are returned, in a new dictionary
+        """
+        if cls is None:
+            self.__load()
+            return FileStorage.__objects
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.__load(cls)
+        return dict(self.__get_classes().get(cls, {}))
+
+    def count(self, cls=None):
+        """
+        Returns the number of objects
+        Usage:
+            When cls (a class or a class name) is given only the
+            objects of this class are counted
+        """
+        if cls is None:
+            self.__load()
+            return len(FileStorage.__objects)
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.__load(cls)
+        return len(self.__get_classes().get(cls, {}))
+
+    def get(self, cls, _id):
+        """
+        Returns the object of cls with the id _id, None if there is none
+        Usage:
+            storage.get(Place, "<place id>")
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.__load(cls)
+        return FileStorage.__objects.get("{}.{}".format(cls, _id))
+
+    def find(self, cls, **attributes):
+        """
+        Returns the objects of cls matching every attribute value
+        Usage:
+            storage.find(Review, place_id="<place id>")
+            Indexed attributes are looked up in their index, the
+            other ones are checked on the remaining candidates
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.__load(cls)
+        candidates = self.__get_classes().get(cls, {})
+        for name, value in attributes.items():
+            index = FileStorage.__attributes.get((cls, name))
+            if index is None:
+                continue
+            try:
+                bucket = index.get(value, {})
+            except TypeError:
+                continue
+            if len(bucket) < len(candidates):
+                candidates = bucket
+        return {
+            _id: obj for _id, obj in candidates.items()
+            if all(getattr(obj, name, None) == value
+                   for name, value in attributes.items())
+        }
+
+    def select(self, cls, **ranges):
+        """
+        Returns the objects of cls inside every numeric range
+        Usage:
+            storage.select(Place, price_by_night=(50, 100),
+                           max_guest=(4, None))
+            Ranges are (low, high) pairs, both included, None for an
+            open bound, or a number for an exact value, on attributes
+            of the `columns` tuple of cls. The ranges are evaluated on
+            the columnar side-store in one pass over its arrays
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        model = get_class(cls)
+        if model is None:
+            raise ValueError("Unknown class {}".format(cls))
+        ranges = Columns.bounds(model, ranges)
+        self.__load(cls)
+        objects = self.__get_classes().get(cls, {})
+        store = FileStorage.__columns.get(cls)
+        if store is None:
+            return {}
+        return {key: objects[key] for key in store.select(ranges)}
 
-    def all(self):
-        """Returns the dictionary __objects"""
-        return FileStorage.__objects
+    def __get_geo(self, cls):
+        """
+        Return the GeoIndex of the class name cls
+        Usage:
+            Raises ValueError when the class has no `location`
+        """
+        model = get_class(cls)
+        if model is None:
+            raise ValueError("Unknown class {}".format(cls))
+        if not getattr(model, "location", ()):
+            raise ValueError("{} has no location".format(cls))
+        self.__load(cls)
+        self.__get_classes()
+        return FileStorage.__geo.get(cls) or GeoIndex()
+
+    def radius(self, cls, latitude, longitude, km):
+        """
+        Returns the objects of cls within km of a point
+        Usage:
+            storage.radius(Place, 37.77, -122.42, 5)
+            The objects are ordered by distance, nearest first
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        found = self.__get_geo(cls).radius(latitude, longitude, km)
+        objects = FileStorage.__classes.get(cls, {})
+        return {key: objects[key] for _, key in found}
+
+    def bbox(self, cls, south, west, north, east):
+        """
+        Returns the objects of cls inside a bounding box
+        Usage:
+            storage.bbox(Place, 37.7, -122.5, 37.8, -122.3)
+            Bounds are in degrees and included, west > east is a box
+            crossing the antimeridian
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        keys = self.__get_geo(cls).bbox(south, west, north, east)
+        objects = FileStorage.__classes.get(cls, {})
+        return {key: objects[key] for key in keys}
+
+    def nearest(self, cls, latitude, longitude, k=1):
+        """
+        Returns the k objects of cls nearest to a point
+        Usage:
+            storage.nearest(Place, 37.77, -122.42, k=10)
+            The objects are ordered by distance, nearest first
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        found = self.__get_geo(cls).nearest(latitude, longitude, k)
+        objects = FileStorage.__classes.get(cls, {})
+        return {key: objects[key] for _, key in found}
+
+    def search(self, cls, query, limit=None):
+        """
+        Returns the objects of cls matching the words of query
+        Usage:
+            storage.search(Review, "clean quiet", limit=10)
+            The objects are ranked best match first (BM25) on the
+            attributes of the `searchable` tuple of cls
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        model = get_class(cls)
+        if model is None:
+            raise ValueError("Unknown class {}".format(cls))
+        if not getattr(model, "searchable", ()):
+            raise ValueError("{} is not searchable".format(cls))
+        self.__load(cls)
+        objects = self.__get_classes().get(cls, {})
+        index = self.__get_text().get(cls)
+        if index is None:
+            return {}
+        return {key: objects[key] for _, key in index.search(query, limit)
+                if key in objects}
+
+    def having(self, cls, match="all", **values):
+        """
+        Returns the objects of cls whose list attributes hold values
+        Usage:
+            storage.having(Place, amenity_ids=[wifi.id, pool.id])
+            storage.having(Place, "any", amenity_ids=[wifi.id, pool.id])
+            With match "all" the lists must hold every value, with
+            "any" at least one, the attributes must be in the `bitmaps`
+            tuple of cls and are matched with their bitmap indexes,
+            several attributes must all match
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        model = get_class(cls)
+        if model is None:
+            raise ValueError("Unknown class {}".format(cls))
+        if match not in ("all", "any"):
+            raise ValueError("match must be all or any")
+        for name in values:
+            if name not in getattr(model, "bitmaps", ()):
+                raise ValueError("{} has no bitmap index on {}".format(
+                    cls, name))
+        self.__load(cls)
+        objects = self.__get_classes().get(cls, {})
+        indexes = FileStorage.__bitmaps.get(cls, {})
+        keys = None
+        for name, wanted in values.items():
+            index = indexes.get(name)
+            if index is None:
+                return {}
+            found = getattr(index, match)(wanted)
+            if keys is not None:
+                found = set(found)
+                found = [key for key in keys if key in found]
+            keys = found
+        if keys is None:
+            keys = objects
+        return {key: objects[key] for key in keys}
+
+    def aggregate(self, cls, *functions, by=None):
+        """
+        Returns {group: {result: value}} of functions over the objects
+        of cls
+        Usage:
+            storage.aggregate(Place, "avg(price_by_night)", "count",
+                              by="city_id")
+            Functions are count, sum, avg, min and max of an attribute,
+            by is an attribute, "domain(<attribute>)" or a function of
+            an object, None for a single None group. Attributes of the
+            `columns` tuple of cls are read from the columnar side-store
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        if get_class(cls) is None:
+            raise ValueError("Unknown class {}".format(cls))
+        self.__load(cls)
+        objects = self.__get_classes().get(cls, {})
+        return aggregate(objects, functions, by,
+                         FileStorage.__columns.get(cls))
+
+    def __get_text(self):
+        """
+        Return the full-text indexes
+        Usage:
+            The indexes saved in <__file_path>.search are loaded on
+            first use, documents whose text did not change since are
+            then not tokenized again
+        """
+        path = FileStorage.__file_path + ".search"
+        if FileStorage.__text_path != path:
+            FileStorage.__text_path = path
+            FileStorage.__text = {}
+            try:
+                with open(path, "r") as file:
+                    data = json.load(file)
+                FileStorage.__text = {cls: TextIndex.load(value)
+                                      for cls, value in data.items()}
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+        return FileStorage.__text
+
+    def __dump_text(self):
+        """
+        Return the JSON of the full-text indexes
+        Usage:
+            None when none of them changed since the last dump
+        """
+        text = self.__get_text()
+        if not any(index.changed for index in text.values()):
+            return None
+        dump = json.dumps({cls: index.dump() for cls, index in text.items()})
+        for index in text.values():
+            index.changed = False
+        return dump
+
+    def __write_text(self, dump):
+        """
+        Write the dump of __dump_text to <__file_path>.search
+        Usage:
+            The file is a cache that is checked against the objects
+            when loaded, so it is not synced
+        """
+        if dump is None:
+            return
+        temp = FileStorage.__text_path + ".tmp"
+        with open(temp, "w", buffering=FileStorage.BUFFER_SIZE) as file:
+            file.write(dump)
+        os.replace(temp, FileStorage.__text_path)
+
+    def __get_classes(self):
+        """
+        Return the per class index
+        Usage:
+            The indexes are rebuilt when __objects was replaced
+            by another dictionary. The full-text indexes are kept,
+            only the documents of the objects that are gone are
+            dropped from them
+        """
+        if FileStorage.__indexed is not FileStorage.__objects:
+            replaced = FileStorage.__indexed is not None
+            FileStorage.__classes = {}
+            FileStorage.__attributes = {}
+            FileStorage.__values = {}
+            FileStorage.__columns = {}
+            FileStorage.__geo = {}
+            FileStorage.__bitmaps = {}
+            FileStorage.__indexed = FileStorage.__objects
+            for _id, obj in FileStorage.__objects.items():
+                self.__index(_id, obj)
+            if replaced:
+                self.__prune_text()
+        return FileStorage.__classes
+
+    def __prune_text(self, classes=None):
+        """
+        Drop from the full-text indexes of classes (the loaded ones
+        when None) the documents of objects not in storage anymore
+        """
+        if classes is None:
+            classes = FileStorage.__loaded_classes
+            if FileStorage.__loaded:
+                classes = set(self.__get_text())
+        for cls, index in self.__get_text().items():
+            if cls in classes:
+                objects = self.__get_classes().get(cls, {})
+                for key in [key for key in index.documents
+                            if key not in objects]:
+                    index.remove(key)
+
+    def __index(self, _id, obj):
+        """Add obj to the per class and attribute indexes"""
+        cls = obj.__class__.__name__
+        FileStorage.__classes.setdefault(cls, {})[_id] = obj
+        for name in getattr(obj, "indexes", ()):
+            self.__index_attribute(_id, obj, name)
+        columns = getattr(obj, "columns", ())
+        if columns:
+            store = FileStorage.__columns.get(cls)
+            if store is None:
+                store = FileStorage.__columns[cls] = Columns(columns)
+            store.put(_id, obj)
+        searchable = getattr(obj, "searchable", ())
+        if searchable:
+            text = self.__get_text()
+            index = text.get(cls)
+            if index is None:
+                index = text[cls] = TextIndex()
+            index.put(_id, self.__text_of(obj, searchable))
+        location = getattr(obj, "location", ())
+        if location:
+            geo = FileStorage.__geo.get(cls)
+            if geo is None:
+                geo = FileStorage.__geo[cls] = GeoIndex()
+            geo.put(_id, *(getattr(obj, name, None) for name in location))
+        bitmaps = getattr(obj, "bitmaps", ())
+        if bitmaps:
+            indexes = FileStorage.__bitmaps.setdefault(cls, {})
+            for name in bitmaps:
+                index = indexes.get(name)
+                if index is None:
+                    index = indexes[name] = BitmapIndex()
+                index.put(_id, getattr(obj, name, None))
+
+    def __unindex(self, _id, obj):
+        """Remove obj from the per class and attribute indexes"""
+        objects = FileStorage.__classes.get(obj.__class__.__name__, {})
+        objects.pop(_id, None)
+        for name in getattr(obj, "indexes", ()):
+            self.__unindex_attribute(_id, obj, name)
+        store = FileStorage.__columns.get(obj.__class__.__name__)
+        if store is not None:
+            store.remove(_id)
+        geo = FileStorage.__geo.get(obj.__class__.__name__)
+        if geo is not None:
+            geo.remove(_id)
+        for index in FileStorage.__bitmaps.get(
+                obj.__class__.__name__, {}).values():
+            index.remove(_id)
+        index = self.__get_text().get(obj.__class__.__name__)
+        if index is not None:
+            index.remove(_id)
+
+    def __text_of(self, obj, searchable):
+        """Return the text of the searchable attributes of obj"""
+        return "\n".join(str(getattr(obj, name, "")) for name in searchable)
+
+    def __index_attribute(self, _id, obj, name):
+        """Add obj to the index of its attribute name"""
+        field = (obj.__class__.__name__, name)
+        index = FileStorage.__attributes.setdefault(field, {})
+        value = getattr(obj, name, None)
+        try:
+            index.setdefault(value, {})[_id] = obj
+        except TypeError:
+            return
+        FileStorage.__values.setdefault(field, {})[_id] = value
+
+    def __unindex_attribute(self, _id, obj, name):
+        """Remove obj from the index of its attribute name"""
+        field = (obj.__class__.__name__, name)
+        values = FileStorage.__values.get(field, {})
+        if _id not in values:
+            return
+        value = values.pop(_id)
+        bucket = FileStorage.__attributes[field][value]
+        bucket.pop(_id, None)
+        if not bucket:
+            del FileStorage.__attributes[field][value]
 
     def new(self, obj):
         """
@@ -44,20 +610,660 @@ class FileStorage:
         Usage:
             Sets in __objects the obj with key <obj class name>.id
         """
-        _id = "{}.{}".format(obj.__class__.__name__, obj.id)
-        FileStorage.__objects[_id] = obj
+        with FileStorage.__lock:
+            _id = "{}.{}".format(obj.__class__.__name__, obj.id)
+            self.__load(obj.__class__.__name__)
+            self.__get_classes()
+            old = FileStorage.__objects.get(_id)
+            if old is not None:
+                self.__unindex(_id, old)
+            FileStorage.__objects[_id] = obj
+            FileStorage.__dirty[_id] = obj
+            self.__index(_id, obj)
+
+    def delete(self, obj=None):
+        """
+        Remove an object from file storage
+        Usage:
+            Deletes obj from __objects if it's inside, does nothing
+            when obj is None
+        """
+        if obj is None:
+            return
+        with FileStorage.__lock:
+            _id = "{}.{}".format(obj.__class__.__name__, obj.id)
+            self.__load(obj.__class__.__name__)
+            self.__get_classes()
+            old = FileStorage.__objects.pop(_id, None)
+            if old is not None:
+                FileStorage.__dirty[_id] = None
+                self.__unindex(_id, old)
+
+    def mark_dirty(self, obj, name=None):
+        """
+        Flag an object as changed
+        Usage:
+            The object will be serialized again by the next save,
+            objects that are not in __objects are ignored
+            When the changed attribute name is indexed, the object
+            is moved to the index entry of its new value, when it is
+            a column its value is updated in the side-store and when
+            it is part of the location the object is moved in the
+            spatial index, when it is searchable its text is indexed
+            again
+            The attributes having a bitmap index are indexed again
+            whatever the changed attribute, so a list changed in place
+            and then saved (the save sets updated_at) is indexed too
+        """
+        _id = "{}.{}".format(obj.__class__.__name__, getattr(obj, "id", ""))
+        with FileStorage.__lock:
+            if FileStorage.__objects.get(_id) is not obj:
+                return
+            FileStorage.__dirty[_id] = obj
+            if name in getattr(obj, "indexes", ()) and \
+                    FileStorage.__indexed is FileStorage.__objects:
+                self.__unindex_attribute(_id, obj, name)
+                self.__index_attribute(_id, obj, name)
+            if name in getattr(obj, "columns", ()) and \
+                    FileStorage.__indexed is FileStorage.__objects:
+                store = FileStorage.__columns[obj.__class__.__name__]
+                store.update(_id, name, getattr(obj, name, None))
+            location = getattr(obj, "location", ())
+            if name in location and \
+                    FileStorage.__indexed is FileStorage.__objects:
+                FileStorage.__geo[obj.__class__.__name__].put(
+                    _id, *(getattr(obj, attr, None) for attr in location))
+            searchable = getattr(obj, "searchable", ())
+            if name in searchable and \
+                    FileStorage.__indexed is FileStorage.__objects:
+                self.__get_text()[obj.__class__.__name__].put(
+                    _id, self.__text_of(obj, searchable))
+            bitmaps = getattr(obj, "bitmaps", ())
+            if bitmaps and FileStorage.__indexed is FileStorage.__objects:
+                indexes = FileStorage.__bitmaps[obj.__class__.__name__]
+                for attribute in bitmaps:
+                    indexes[attribute].put(
+                        _id, getattr(obj, attribute, None))
+
+    def begin(self):
+        """
+        Start deferring the saves
+        Usage:
+            save does nothing until commit or rollback is called,
+            returns False when the saves were already deferred
+            In async mode the saves made before are written first,
+            the background thread writes nothing until commit
+        """
+        if FileStorage.__batch is not None:
+            return False
+        self.__load()
+        self.flush()
+        with FileStorage.__lock:
+            objects = FileStorage.__objects
+            FileStorage.__batch = (
+                dict(objects),
+                {key: dict(obj.__dict__) for key, obj in objects.items()},
+                dict(FileStorage.__dirty),
+            )
+        return True
+
+    def commit(self):
+        """Stop deferring the saves and save once"""
+        FileStorage.__batch = None
+        self.save()
+
+    def rollback(self):
+        """
+        Stop deferring the saves and undo the changes in memory
+        Usage:
+            Objects created since begin are dropped, deleted ones
+            are restored and every attribute is set back
+        """
+        if FileStorage.__batch is None:
+            return
+        objects, values, dirty = FileStorage.__batch
+        FileStorage.__batch = None
+        FileStorage.__objects.clear()
+        FileStorage.__objects.update(objects)
+        for key, obj in objects.items():
+            obj.__dict__ = dict(values[key])
+        FileStorage.__dirty.clear()
+        FileStorage.__dirty.update(dirty)
+        FileStorage.__indexed = None
+        self.__get_classes()
+        self.__prune_text()
+
+    @contextmanager
+    def batch(self):
+        """
+        Defer the saves to the end of the block
+        Usage:
+            with storage.batch():
+                ...
+            The objects are saved once when the block exits, the
+            changes are rolled back if it raises. Nested blocks
+            are part of the outermost one
+        """
+        if not self.begin():
+            yield self
+            return
+        try:
+            yield self
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit()
+
+    def enable_journal(self, limit=1000):
+        """
+        Switch to the append-only journal mode
+        Usage:
+            Each save appends the changed objects to <__file_path>.journal
+            instead of rewriting __file_path, the journal is folded into
+            __file_path once it holds more than `limit` records
+        """
+        FileStorage.__journal_limit = limit
+        FileStorage.__journal = Journal(FileStorage.__file_path + ".journal")
+
+    def enable_shards(self, workers=None):
+        """
+        Switch to one storage file per class
+        Usage:
+            The objects of each class are stored in <root>.<class><ext>
+            next to __file_path, a save only rewrites the files of the
+            changed classes and the files are decoded by `workers`
+            processes (one per CPU by default)
+            An existing __file_path is read instead of the class files,
+            the next save writes it to the class files then removes it
+        """
+        FileStorage.__shards = workers or os.cpu_count() or 1
+
+    def enable_binary(self):
+        """
+        Switch the storage files to the binary format
+        Usage:
+            The objects are stored in <root>.hbnb (or the per class
+            <root>.<class>.hbnb) next to __file_path, see binary_codec
+            An existing JSON __file_path is read when no binary file
+            exists, the next save writes it in the binary format
+        """
+        FileStorage.__binary = True
+
+    def __split_path(self):
+        """Return the root and extension of the storage files"""
+        root, ext = os.path.splitext(FileStorage.__file_path)
+        if FileStorage.__binary:
+            ext = FileStorage.BINARY_EXT
+        return root, ext
+
+    def __snapshot_path(self):
+        """Return the path of the file storing every object"""
+        return "{}{}".format(*self.__split_path())
+
+    def __shard_path(self, cls):
+        """Return the path of the file storing the objects of cls"""
+        root, ext = self.__split_path()
+        return "{}.{}{}".format(root, cls, ext)
+
+    def __shard_classes(self):
+        """Return the names of the classes having a file on disk"""
+        root, ext = self.__split_path()
+        pattern = glob.escape(root) + ".*" + glob.escape(ext)
+        start, end = len(root) + 1, len(root) + 1 + len(ext)
+        return {path[start:len(path) - len(ext)]
+                for path in glob.glob(pattern) if len(path) > end}
+
+    def __get_journal(self):
+        """Return the journal of the current __file_path or None"""
+        journal = FileStorage.__journal
+        if journal is None:
+            return None
+        path = FileStorage.__file_path + ".journal"
+        if journal.path != path:
+            journal = Journal(path)
+            FileStorage.__journal = journal
+        return journal
+
+    def __encode(self, key, obj):
+        """
+        Return the JSON encoding of obj
+        Usage:
+            Only dirty objects are serialized, clean ones reuse
+            the fragment cached by the previous save
+        """
+        cached = FileStorage.__encoded.get(key)
+        if cached is None or cached[0] is not obj or \
+                key in FileStorage.__dirty:
+            cached = (obj, json.dumps(obj.to_dict()))
+            FileStorage.__encoded[key] = cached
+        return cached[1]
+
+    def enable_async(self, window=0.05):
+        """
+        Move the writes of save to a background thread
+        Usage:
+            save returns right away and the thread writes the
+            changes of every save made during `window` seconds at
+            once, flush waits for the changes to be written
+        """
+        FileStorage.__window = window
+        if FileStorage.__flusher is None:
+            FileStorage.__flusher = threading.Thread(
+                target=self.__flush_loop, name="FileStorage flusher",
+                daemon=True)
+            FileStorage.__flusher.start()
+            atexit.register(self.flush)
+
+    def __flush_loop(self):
+        """Write the pending changes once per window, forever"""
+        while True:
+            FileStorage.__wakeup.wait()
+            time.sleep(FileStorage.__window)
+            FileStorage.__wakeup.clear()
+            try:
+                self.flush()
+            except Exception as error:
+                FileStorage.__error = error
+
+    def flush(self):
+        """
+        Write the pending changes now
+        Usage:
+            Durability barrier of the async mode: once flush returns
+            every previous save is on disk. Raises the error of a
+            failed background write
+            Nothing is written while the saves are deferred by begin,
+            the pending changes are written after commit or rollback
+            The changed objects are serialized while holding the
+            storage lock, the files are then written without blocking
+            the writers. When the write fails the objects are marked
+            dirty again
+        """
+        write = None
+        with FileStorage.__writing:
+            with FileStorage.__lock:
+                error, FileStorage.__error = FileStorage.__error, None
+                if FileStorage.__pending and FileStorage.__batch is None:
+                    FileStorage.__pending = False
+                    dirty = dict(FileStorage.__dirty)
+                    write = self.__save(defer=True)
+            if write is not None:
+                try:
+                    write()
+                except Exception:
+                    with FileStorage.__lock:
+                        for key, obj in dirty.items():
+                            FileStorage.__dirty.setdefault(key, obj)
+                        FileStorage.__pending = True
+                    raise
+        if error is not None:
+            raise error
 
     def save(self):
         """
         Save objects to file
         Usage:
             Serializes __objects to the JSON file (path: __file_path)
+            In journal mode only the changed objects are appended
+            to the journal
+            Does nothing while the saves are deferred by begin
+            In async mode the write is left to the background thread
         """
-        path = FileStorage.__file_path
-        obj = FileStorage.__objects.items()
-        with open(path, "w") as file:
-            dict_objects = {key: value.to_dict() for key, value in obj}
-            json.dump(dict_objects, file)
+        if FileStorage.__batch is not None:
+            return
+        if FileStorage.__window:
+            FileStorage.__pending = True
+            FileStorage.__wakeup.set()
+            return
+        with FileStorage.__lock:
+            self.__save()
+
+    def __save(self, defer=False):
+        """
+        Write the changes to the storage files
+        Usage:
+            With defer nothing is written: the changed objects are
+            serialized now and the function writing them is returned,
+            to be called once the storage lock is released
+        """
+        self.__load()
+        journal = self.__get_journal()
+        deltas = self.__get_deltas()
+        dirty = FileStorage.__dirty
+        collect = list if defer else iter
+        for key, obj in dirty.items():
+            if obj is None:
+                FileStorage.__encoded.pop(key, None)
+        if deltas is not None:
+            records = [
+                ("put", key, self.__encode(key, obj)) if obj is not None
+                else ("del", key, None)
+                for key, obj in dirty.items()
+            ]
+
+            def write():
+                deltas.write(records, self.__must_sync(
+                    deltas.delta_path(deltas.last + 1)))
+                if not FileStorage.__compacting.locked() and \
+                        self.__compaction_due(deltas):
+                    FileStorage.__compact_wakeup.set()
+        elif journal is not None and \
+                journal.records + len(dirty) <= FileStorage.__journal_limit:
+            records = collect(
+                ("put", key, self.__encode(key, obj)) if obj is not None
+                else ("del", key, None)
+                for key, obj in dirty.items()
+            )
+
+            def write():
+                journal.append(records, self.__must_sync(journal.path))
+        else:
+            retire = None
+            if FileStorage.__shards:
+                classes = {key.split(".")[0] for key in dirty}
+                if FileStorage.__migrate:
+                    retire = FileStorage.__file_path
+                if journal is not None or FileStorage.__migrate:
+                    classes |= self.__shard_classes()
+                    classes |= set(self.__get_classes())
+                files = [
+                    (self.__shard_path(cls), collect(self.__serialize(
+                        self.__get_classes().get(cls, {}).items())))
+                    for cls in classes
+                ]
+            else:
+                files = [(self.__snapshot_path(), collect(self.__serialize(
+                    FileStorage.__objects.items())))]
+            text = self.__dump_text()
+
+            def write():
+                for path, payloads in files:
+                    self.__write(path, payloads)
+                if retire is not None:
+                    try:
+                        os.remove(retire)
+                    except FileNotFoundError:
+                        pass
+                FileStorage.__migrate = False
+                self.__write_text(text)
+                if journal is not None:
+                    journal.truncate()
+        if defer:
+            dirty.clear()
+            return write
+        write()
+        dirty.clear()
+
+    def __serialize(self, items):
+        """
+        Yield the (key, payload) pairs of the (key, object) pairs items
+        Usage:
+            the payload is the JSON fragment of the object, or its
+            to_dict() in the binary format
+            The pairs are produced one at a time while __write
+            streams them to the file
+        """
+        if FileStorage.__binary:
+            for key, value in items:
+                yield key, value.to_dict()
+            return
+        for key, value in items:
+            yield key, self.__encode(key, value)
+
+    def __write(self, path, payloads):
+        """
+        Write the (key, payload) pairs of __serialize to the file path
+        Usage:
+            The objects are written to <path>.tmp which then replaces
+            path, so a crash never leaves a truncated file behind
+            Each "key": {...} entry goes straight to the buffered file,
+            the output is the same as json.dump of the whole dictionary
+        """
+        temp = path + ".tmp"
+        with open(temp, "wb" if FileStorage.__binary else "w",
+                  buffering=FileStorage.BUFFER_SIZE) as file:
+            if FileStorage.__binary:
+                binary_codec.dump(payloads, file)
+            else:
+                write = file.write
+                separator = "{"
+                for key, value in payloads:
+                    write(separator)
+                    write(json.dumps(key))
+                    write(": ")
+                    write(value)
+                    separator = ", "
+                write("{}" if separator == "{" else "}")
+            file.flush()
+            sync = self.__must_sync(path)
+            if sync:
+                os.fsync(file.fileno())
+        os.replace(temp, path)
+        if sync and FileStorage.__durability != "file":
+            directory = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+
+    def enable_deltas(self, deltas=100, size=1 << 20, ratio=0.5):
+        """
+        Switch save to delta files compacted in the background
+        Usage:
+            Each save writes the changed objects to a new delta file
+            next to __file_path. A background thread folds them into a
+            new snapshot once there are more than `deltas` files, they
+            weigh more than `size` bytes or more than `ratio` times the
+            snapshot, see compact and stats
+        """
+        FileStorage.__journal = None
+        FileStorage.__compaction = (deltas, size, ratio)
+        FileStorage.__deltas = DeltaLog(FileStorage.__file_path)
+        FileStorage.__snapshot_bytes = self.__snapshot_size()
+        if FileStorage.__compactor is None:
+            FileStorage.__compactor = threading.Thread(
+                target=self.__compact_loop, name="FileStorage compactor",
+                daemon=True)
+            FileStorage.__compactor.start()
+
+    def __get_deltas(self):
+        """Return the delta files of the current __file_path or None"""
+        deltas = FileStorage.__deltas
+        if deltas is not None and deltas.path != FileStorage.__file_path:
+            deltas = FileStorage.__deltas = DeltaLog(FileStorage.__file_path)
+            FileStorage.__snapshot_bytes = self.__snapshot_size()
+        return deltas
+
+    def __snapshot_size(self):
+        """Return the size in bytes of the snapshot files"""
+        if FileStorage.__shards:
+            paths = [self.__shard_path(cls) for cls in self.__shard_classes()]
+        else:
+            paths = [self.__snapshot_path()]
+        return sum(os.path.getsize(path) for path in paths
+                   if os.path.isfile(path))
+
+    def __compaction_due(self, deltas):
+        """Return True when the delta files reached a threshold"""
+        count, size, ratio = FileStorage.__compaction
+        pending = sum(deltas.pending.values())
+        return len(deltas.pending) > count or pending > size or \
+            pending > ratio * FileStorage.__snapshot_bytes > 0
+
+    def __compact_loop(self):
+        """
+        Compact the delta files every time a threshold is reached
+        Usage:
+            saves made during a compaction do not wake the thread up,
+            the thresholds are checked again once it is done
+        """
+        while True:
+            FileStorage.__compact_wakeup.wait()
+            FileStorage.__compact_wakeup.clear()
+            try:
+                self.compact()
+            except Exception as error:
+                FileStorage.__error = error
+                continue
+            with FileStorage.__lock:
+                deltas = self.__get_deltas()
+                if deltas is not None and self.__compaction_due(deltas):
+                    FileStorage.__compact_wakeup.set()
+
+    def compact(self):
+        """
+        Fold the delta files into a new snapshot
+        Usage:
+            The objects are serialized while holding the storage lock,
+            the snapshot is then written without blocking the writers
+            and the folded delta files are removed. Returns False when
+            there is nothing to compact
+        """
+        with FileStorage.__compacting, FileStorage.__writing:
+            with FileStorage.__lock:
+                deltas = self.__get_deltas()
+                if deltas is None or FileStorage.__batch is not None:
+                    return False
+                self.__save()
+                if not deltas.pending:
+                    return False
+                sequence = deltas.last
+                start = time.perf_counter()
+                if FileStorage.__shards:
+                    classes = self.__shard_classes()
+                    classes |= set(self.__get_classes())
+                    files = {
+                        self.__shard_path(cls): list(self.__serialize(
+                            self.__get_classes().get(cls, {}).items()))
+                        for cls in classes
+                    }
+                else:
+                    files = {self.__snapshot_path(): list(self.__serialize(
+                        FileStorage.__objects.items()))}
+            for path, payloads in files.items():
+                self.__write(path, payloads)
+            with FileStorage.__lock:
+                text = self.__dump_text()
+            self.__write_text(text)
+            deltas.checkpoint(sequence)
+            FileStorage.__snapshot_bytes = self.__snapshot_size()
+            FileStorage.__compaction_time = time.perf_counter() - start
+            return True
+
+    def stats(self):
+        """
+        Return the counters of the delta files
+        Usage:
+            deltas: number of delta files waiting for a compaction
+            delta_bytes: their size in bytes
+            snapshot_bytes: size of the snapshot files
+            deltas_written: delta files written since enable_deltas
+            compactions: compactions done since enable_deltas
+            last_compaction: seconds taken by the last compaction
+        """
+        deltas = self.__get_deltas()
+        if deltas is None:
+            return {}
+        return {
+            "deltas": len(deltas.pending),
+            "delta_bytes": sum(deltas.pending.values()),
+            "snapshot_bytes": FileStorage.__snapshot_bytes,
+            "deltas_written": deltas.written,
+            "compactions": deltas.compactions,
+            "last_compaction": FileStorage.__compaction_time,
+        }
+
+    def set_durability(self, policy="none", interval=1.0):
+        """
+        Choose when the writes are forced to the disk with fsync
+        Usage:
+            "none": never, the OS writes the data when it wants
+            "file": every written file is synced before it replaces
+                the previous one
+            "dir": like "file", the directory is synced as well so
+                the replacement itself survives a power loss
+            "interval": like "dir", every `interval` seconds: a write
+                is synced right away when the last fsync is older,
+                otherwise it is synced by a timer when the interval
+                expires
+        """
+        if policy not in FileStorage.DURABILITY:
+            raise ValueError("Unknown durability policy {}".format(policy))
+        self.__sync_unsynced()
+        FileStorage.__durability = policy
+        FileStorage.__interval = interval
+
+    def __must_sync(self, path):
+        """
+        Return True when the durability policy asks for a fsync of the
+        file path now
+        Usage:
+            In "interval" policy a file that is not synced now is
+            synced by __sync_timer once the interval expires
+        """
+        policy = FileStorage.__durability
+        if policy == "interval":
+            now = time.monotonic()
+            wait = FileStorage.__synced + FileStorage.__interval - now
+            if wait <= 0:
+                FileStorage.__synced = now
+                return True
+            with FileStorage.__lock:
+                FileStorage.__unsynced.add(path)
+                if FileStorage.__sync_timer is None:
+                    timer = threading.Timer(wait, self.__sync_unsynced)
+                    timer.daemon = True
+                    FileStorage.__sync_timer = timer
+                    timer.start()
+            return False
+        return policy != "none"
+
+    def __sync_unsynced(self):
+        """
+        Force the files written without fsync to the disk
+        Usage:
+            Their directories are synced as well, called by
+            __sync_timer and when the policy changes
+        """
+        with FileStorage.__lock:
+            if FileStorage.__sync_timer is not None:
+                FileStorage.__sync_timer.cancel()
+                FileStorage.__sync_timer = None
+            paths, FileStorage.__unsynced = FileStorage.__unsynced, set()
+            if not paths:
+                return
+            FileStorage.__synced = time.monotonic()
+            for path in paths | {os.path.dirname(path) or "."
+                                 for path in paths}:
+                try:
+                    descriptor = os.open(path, os.O_RDONLY)
+                except FileNotFoundError:
+                    continue
+                try:
+                    os.fsync(descriptor)
+                finally:
+                    os.close(descriptor)
+
+    def __load(self, cls=None):
+        """
+        Load the file on first access
+        Usage:
+            Does nothing once the file is loaded, when cls is given
+            and there are per class files only the objects of this
+            class are loaded, a single file is loaded whole since it
+            has to be parsed to the end anyway
+        """
+        if FileStorage.__loaded or cls in FileStorage.__loaded_classes:
+            return
+        if cls is None or not (FileStorage.__shards and
+                               self.__shard_classes()):
+            skip = FileStorage.__loaded_classes
+            FileStorage.__loaded = True
+            FileStorage.__loaded_classes = set()
+            self.__read(None, skip)
+        else:
+            FileStorage.__loaded_classes.add(cls)
+            self.__read({cls})
 
     def reload(self):
         """
@@ -66,19 +1272,97 @@ class FileStorage:
             deserializes the JSON file to __objects
             (only if the JSON file (__file_path) exists
              If the file doesn’t exist, no exception should be raised)
+            The file is parsed one object at a time, so the whole
+            document is never held in memory next to the objects
+            In journal mode the journal is replayed on top of the file,
+            in delta mode the deltas written after the checkpoint are
+            replayed
+            reload is called on the first access to the storage,
+            there is no need to call it at import time
         """
-        from models.base_model import BaseModel
-        from models.user import User
-        from models.place import Place
-        from models.state import State
-        from models.city import City
-        from models.amenity import Amenity
-        from models.review import Review
+        FileStorage.__loaded = True
+        FileStorage.__loaded_classes = set()
+        self.__read(None)
 
+    def __read(self, classes, skip=()):
+        """
+        Deserialize the objects of classes from the file
+        Usage:
+            classes is a set of class names or None for every class,
+            the classes in skip are not read
+            Objects of classes missing from models.registry are skipped
+        """
+        for key, value in self.__read_items(classes):
+            name = key.split(".")[0]
+            if name in skip or classes is not None and name not in classes:
+                continue
+            Klass = get_class(name)
+            if Klass is None:
+                continue
+            self.new(Klass.from_record(value))
+            FileStorage.__dirty.pop(key, None)
+        for log in (self.__get_journal(), self.__get_deltas()):
+            if log is None:
+                continue
+            for op, key, value in log.replay():
+                name = key.split(".")[0]
+                if name in skip or \
+                        classes is not None and name not in classes:
+                    continue
+                Klass = get_class(name)
+                if Klass is None:
+                    continue
+                if op == "put":
+                    self.new(Klass.from_record(value))
+                elif key in FileStorage.__objects:
+                    self.delete(FileStorage.__objects[key])
+                FileStorage.__dirty.pop(key, None)
+        self.__prune_text(classes)
+
+    def __read_items(self, classes):
+        """
+        Yield the (key, value) pairs stored on disk
+        Usage:
+            With per class files only the files of classes (every
+            file when None) are read, by a pool of processes when
+            there is more than one
+            The JSON __file_path is read when the binary file does not
+            exist yet, and with per class files as long as it exists:
+            it is only removed once the save migrating it wrote every
+            class file, so class files left by a crash mid-migration
+            are ignored
+        """
         path = FileStorage.__file_path
+        if FileStorage.__shards:
+            if not self.__is_json(path):
+                existing = self.__shard_classes()
+                if classes is not None:
+                    existing &= set(classes)
+                paths = [self.__shard_path(cls) for cls in sorted(existing)]
+                if len(paths) > 1 and FileStorage.__shards > 1:
+                    workers = min(FileStorage.__shards, len(paths))
+                    with ProcessPoolExecutor(workers) as executor:
+                        for items in executor.map(_read_shard, paths):
+                            yield from items
+                else:
+                    for shard in paths:
+                        yield from _read_shard(shard)
+                return
+            FileStorage.__migrate = True
+        elif FileStorage.__binary:
+            snapshot = self.__snapshot_path()
+            if os.path.isfile(snapshot) or not self.__is_json(path):
+                if os.path.isfile(snapshot):
+                    yield from _read_shard(snapshot)
+                return
+            FileStorage.__migrate = True
         if os.path.isfile(path):
             with open(path, "r") as file:
-                data = json.load(file)
-                for key, value in data.items():
-                    Klass = key.split(".")[0]
-                    self.new(eval(Klass)(**value))
+                yield from iter_items(file)
+
+    def __is_json(self, path):
+        """Return True when path is an existing JSON storage file"""
+        if not os.path.isfile(path) or path.endswith(FileStorage.BINARY_EXT):
+            return False
+        with open(path, "rb") as file:
+            return file.read(len(binary_codec.MAGIC)) != binary_codec.MAGIC
@@ -0,0 +1,213 @@
+#!/usr/bin/python3
+"""
+Module contains `GeoIndex` class
+"""
+from heapq import nsmallest
+from math import (asin, ceil, cos, degrees, floor, isfinite, radians, sin,
+                  sqrt)
+
+EARTH_RADIUS = 6371.0088
+KM_PER_DEGREE = radians(1) * EARTH_RADIUS
+
+
+def distance(latitude, longitude, other_latitude, other_longitude):
+    """Return the great-circle distance in km between two points"""
+    lat1, lat2 = radians(latitude), radians(other_latitude)
+    half_lat = (lat2 - lat1) / 2
+    half_lon = radians(other_longitude - longitude) / 2
+    value = sin(half_lat) ** 2 + cos(lat1) * cos(lat2) * sin(half_lon) ** 2
+    return 2 * EARTH_RADIUS * asin(min(1.0, sqrt(value)))
+
+
+class GeoIndex:
+    """
+    Spatial Grid Index Representation
+    Usage:
+        Buckets points by grid cells of `cell` degrees of latitude and
+        longitude, so radius, bounding box and nearest neighbor queries
+        only compute distances for the points of the cells around the
+        query. Longitudes wrap around the antimeridian
+
+    Methodes:
+        put: stores or moves the point of a key
+        remove: drops the point of a key
+        bbox: returns the keys inside a bounding box
+        radius: returns the (distance, key) pairs within a distance
+        nearest: returns the (distance, key) pairs of the k nearest points
+
+    Attributes:
+        cell(float): size of a cell in degrees
+        points(dict): (latitude, longitude) of each key
+        buckets(dict): {(row, column): {key: (latitude, longitude)}}
+        __rows(int): number of rows of the grid
+        __columns(int): number of columns of the grid
+    """
+
+    def __init__(self, cell=0.1):
+        """Start with an empty grid of cell degrees cells"""
+        self.cell = cell
+        self.points = {}
+        self.buckets = {}
+        self.__rows = ceil(180 / cell)
+        self.__columns = ceil(360 / cell)
+
+    def __row(self, latitude):
+        """Return the row of latitude"""
+        return min(max(floor((latitude + 90) / self.cell), 0),
+                   self.__rows - 1)
+
+    def __column(self, longitude):
+        """Return the column of longitude"""
+        return floor((longitude + 180) / self.cell) % self.__columns
+
+    def put(self, key, latitude, longitude):
+        """
+        Store the point of key
+        Usage:
+            The previous point of key is replaced, a latitude or
+            longitude that is not a number removes key from the index
+        """
+        self.remove(key)
+        try:
+            point = (float(latitude), float(longitude))
+        except (TypeError, ValueError):
+            return
+        if not -90 <= point[0] <= 90 or not isfinite(point[1]):
+            return
+        self.points[key] = point
+        cell = (self.__row(point[0]), self.__column(point[1]))
+        self.buckets.setdefault(cell, {})[key] = point
+
+    def remove(self, key):
+        """Drop the point of key"""
+        point = self.points.pop(key, None)
+        if point is None:
+            return
+        cell = (self.__row(point[0]), self.__column(point[1]))
+        bucket = self.buckets[cell]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[cell]
+
+    def __cells(self, south, west, north, east):
+        """
+        Yield the buckets of the cells overlapping a bounding box
+        Usage:
+            Every bucket is yielded once, west > east is a box
+            crossing the antimeridian
+        """
+        rows = range(self.__row(south), self.__row(north) + 1)
+        first, last = self.__column(west), self.__column(east)
+        if east - west >= 360:
+            first, last = 0, self.__columns - 1
+        count = (last - first) % self.__columns + 1
+        if len(rows) * count > len(self.buckets):
+            for (row, column), bucket in self.buckets.items():
+                if row in rows and (column - first) % self.__columns < count:
+                    yield bucket
+            return
+        for row in rows:
+            for offset in range(count):
+                bucket = self.buckets.get(
+                    (row, (first + offset) % self.__columns))
+                if bucket:
+                    yield bucket
+
+    def bbox(self, south, west, north, east):
+        """
+        Return the keys of the points inside a bounding box
+        Usage:
+            Bounds are in degrees and included, west > east is a box
+            crossing the antimeridian
+        """
+        if east < west:
+            width = east + 360 - west
+        else:
+            width = east - west
+        keys = []
+        for bucket in self.__cells(south, west, north, east):
+            for key, (latitude, longitude) in bucket.items():
+                if south <= latitude <= north and \
+                        (longitude - west) % 360 <= width:
+                    keys.append(key)
+        return keys
+
+    def radius(self, latitude, longitude, km):
+        """
+        Return the (distance, key) pairs of the points within km
+        of a point, nearest first
+        """
+        spread = km / KM_PER_DEGREE
+        south, north = latitude - spread, latitude + spread
+        ratio = sin(km / EARTH_RADIUS) / cos(radians(latitude)) \
+            if abs(latitude) < 90 else 2
+        if south <= -90 or north >= 90 or km >= EARTH_RADIUS or ratio >= 1:
+            west, east = longitude - 180, longitude + 180
+        else:
+            width = degrees(asin(ratio))
+            west, east = longitude - width, longitude + width
+        found = []
+        for bucket in self.__cells(max(south, -90), west, min(north, 90),
+                                   east):
+            for key, point in bucket.items():
+                space = distance(latitude, longitude, *point)
+                if space <= km:
+                    found.append((space, key))
+        found.sort()
+        return found
+
+    def nearest(self, latitude, longitude, k=1):
+        """
+        Return the (distance, key) pairs of the k points nearest
+        to a point, nearest first
+        Usage:
+            The rings of cells around the point are searched until the
+            k nearest points found are closer than any unsearched cell.
+            Far from every point (sparse regions, high latitudes) the
+            rings would visit more cells than there are points, so once
+            the cells visited and the distances computed outnumber the
+            points every point is scanned instead
+        """
+        if k <= 0 or not self.points:
+            return []
+        row, column = self.__row(latitude), self.__column(longitude)
+        found, ring, work = [], 0, 0
+        while True:
+            work += 8 * ring or 1
+            if work > len(self.points) or 2 * ring + 1 >= self.__columns:
+                return nsmallest(k, (
+                    (distance(latitude, longitude, *point), key)
+                    for key, point in self.points.items()))
+            searched = len(found)
+            for cell in self.__ring(row, column, ring):
+                for key, point in self.buckets.get(cell, {}).items():
+                    found.append((distance(latitude, longitude, *point), key))
+            work += len(found) - searched
+            if len(found) >= k:
+                found = nsmallest(k, found)
+                if found[-1][0] <= self.__covered(latitude, ring):
+                    return found
+            ring += 1
+
+    def __ring(self, row, column, ring):
+        """Yield the cells at ring cells from a cell"""
+        for line in range(row - ring, row + ring + 1):
+            if not 0 <= line < self.__rows:
+                continue
+            if abs(line - row) == ring:
+                offsets = range(-ring, ring + 1)
+            else:
+                offsets = (-ring, ring) if ring else (0,)
+            for offset in offsets:
+                yield line, (column + offset) % self.__columns
+
+    def __covered(self, latitude, ring):
+        """
+        Return a distance in km within which every point is in the
+        cells at most ring cells away from the cell of latitude
+        """
+        span = ring * self.cell
+        along = span * KM_PER_DEGREE
+        across = EARTH_RADIUS * asin(
+            cos(radians(latitude)) * sin(radians(min(span, 90))))
+        return min(along, across)
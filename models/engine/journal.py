@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+"""
+Module contains `Journal` class
+"""
+import json
+import os
+
+
+class Journal:
+    """
+    Append-only Journal Representation
+    Usage:
+        Records every mutation of the storage as one JSON line
+        so a save only writes what actually changed
+
+    Record format:
+        {"op": "put", "key": "<class name>.<id>", "value": {...}}
+        {"op": "del", "key": "<class name>.<id>"}
+
+    Methodes:
+        append: writes a batch of records at the end of the journal
+        replay: yields every complete record of the journal
+        truncate: empties the journal once its records are in a snapshot
+
+    Attributes:
+        path(str): path of the journal file
+        records(int): number of records currently stored in the journal
+    """
+
+    def __init__(self, path):
+        """Init the journal on `path` and count its existing records"""
+        self.path = path
+        self.records = sum(1 for _ in self.replay())
+
+    def append(self, records, sync=False):
+        """
+        Append records to the journal
+        Usage:
+            records is an iterable of (op, key, value) tuples,
+            value is the JSON encoded to_dict() of the object
+            or None on delete
+            When sync is True the records are forced to the disk
+        """
+        lines = []
+        for op, key, value in records:
+            line = '{"op": ' + json.dumps(op) + ', "key": ' + json.dumps(key)
+            if value is not None:
+                line += ', "value": ' + value
+            lines.append(line + "}\n")
+        if not lines:
+            return
+        if self.__torn():
+            lines.insert(0, "\n")
+        with open(self.path, "a") as file:
+            file.write("".join(lines))
+            file.flush()
+            if sync:
+                os.fsync(file.fileno())
+        self.records += len(lines)
+
+    def __torn(self):
+        """Return True when the journal ends with an incomplete line"""
+        try:
+            with open(self.path, "rb") as file:
+                if not file.seek(0, os.SEEK_END):
+                    return False
+                file.seek(-1, os.SEEK_END)
+                return file.read(1) != b"\n"
+        except FileNotFoundError:
+            return False
+
+    def replay(self):
+        """
+        Yield the records of the journal in write order
+        Usage:
+            A torn line (crash in the middle of an append) is
+            ignored, append starts a new line after it so the
+            records written later are kept
+        """
+        if not os.path.isfile(self.path):
+            return
+        with open(self.path, "r") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                yield record["op"], record["key"], record.get("value")
+
+    def truncate(self):
+        """Remove every record from the journal"""
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+        self.records = 0
@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""
+Module contains `iter_items` function
+"""
+import json
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+def iter_items(file, chunk_size=65536):
+    """
+    Yield the (key, value) pairs of the top-level JSON object of file
+    Usage:
+        The file is read chunk_size characters at a time and each
+        value is decoded as soon as it is complete, so only one entry
+        is held in memory instead of the whole parsed document
+        While a value is incomplete each read doubles the buffered
+        text, so a large value is decoded a logarithmic number of
+        times instead of once per chunk
+    """
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill(size=chunk_size):
+        """Read the next size characters, dropping what was parsed"""
+        nonlocal buffer, pos, eof
+        chunk = file.read(size)
+        if not chunk:
+            eof = True
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+    def skip():
+        """Move pos to the next non whitespace character"""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer) or eof:
+                return
+            fill()
+
+    def expect(chars):
+        """Consume one of chars and return it"""
+        nonlocal pos
+        skip()
+        if pos >= len(buffer) or buffer[pos] not in chars:
+            raise ValueError("Expecting one of {!r} at {}".format(chars, pos))
+        pos += 1
+        return buffer[pos - 1]
+
+    def decode():
+        """Decode the next complete JSON value"""
+        nonlocal pos
+        skip()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(buffer, pos)
+            except ValueError:
+                if eof:
+                    raise
+                fill(max(chunk_size, len(buffer) - pos))
+                continue
+            if end == len(buffer) and not eof:
+                fill(max(chunk_size, len(buffer) - pos))
+                continue
+            pos = end
+            return value
+
+    fill()
+    skip()
+    if pos >= len(buffer):
+        return
+    expect("{")
+    skip()
+    if buffer[pos:pos + 1] == "}":
+        return
+    while True:
+        key = decode()
+        expect(":")
+        yield key, decode()
+        if expect(",}") == "}":
+            return
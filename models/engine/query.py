@@ -0,0 +1,314 @@
+#!/usr/bin/python3
+"""
+Module contains the console query language
+
+Syntax:
+    <class>.where(<attribute> <operator> <value>, ...)
+           .order_by(<attribute> [desc], ...)
+           .offset(<n>).limit(<n>)
+           .fields(<attribute>, ...)
+    followed by .count() to print the number of results or .explain()
+    to print the plan. Every call is optional, operators are
+    ==, =, !=, <, <=, > and >=, values are numbers or quoted strings
+
+Usage:
+    query = Query.parse('Place.where(price_by_night<100).limit(20)')
+    query.run(storage) -> the matching objects
+"""
+import heapq
+import re
+from itertools import islice
+from operator import eq, ge, gt, le, lt, ne
+
+from models.registry import get_class
+
+_TOKEN = re.compile(r"""\s*(?:
+    (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+    |(?P<number>-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)
+    |(?P<name>[A-Za-z_]\w*)
+    |(?P<operator><=|>=|==|!=|<|>|=)
+    |(?P<punctuation>[.,()\-])
+)""", re.VERBOSE)
+
+OPERATORS = {"==": eq, "=": eq, "!=": ne, "<": lt, "<=": le, ">": gt,
+             ">=": ge}
+
+
+def _tokenize(text):
+    """Return the (kind, value) tokens of text"""
+    tokens, position = [], 0
+    text = text.strip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError("invalid query at {!r}".format(
+                text[position:].strip()))
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "string":
+            value = re.sub(r"\\(.)", r"\1", value[1:-1])
+        elif kind == "number":
+            value = float(value) if re.search(r"[.eE]", value) \
+                else int(value)
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+def _number(value):
+    """Return value as a float or None when it is not a number"""
+    if isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _sort_key(value):
+    """Order numbers (and numeric strings) before other values"""
+    number = _number(value)
+    if number is not None and number == number:
+        return (0, number, "")
+    return (1, 0, str(value))
+
+
+class Query:
+    """
+    Query Representation
+    Usage:
+        Parsed once by Query.parse, then run against a storage: equality
+        conditions on indexed attributes are looked up with
+        storage.find, ranges on columns with storage.select, and every
+        other condition is checked during a single streaming scan of
+        the candidates
+
+    Methodes:
+        parse: builds a query from its text
+        plan: returns the steps the query will run, as text
+        run: returns the objects matching the query
+
+    Attributes:
+        cls(str): name of the class queried
+        conditions(list): (attribute, operator, value) tuples
+        order(list): (attribute, descending) tuples
+        offset(int): number of results skipped
+        limit(int): maximum number of results, None for every result
+        fields(list): attributes printed, empty for the whole object
+        action(str): None, "count" or "explain"
+    """
+
+    def __init__(self, cls):
+        """Start with a query returning every object of cls"""
+        self.cls = cls
+        self.conditions = []
+        self.order = []
+        self.offset = 0
+        self.limit = None
+        self.fields = []
+        self.action = None
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Return the query of text
+        Usage:
+            Raises ValueError when the text is not a valid query
+        """
+        tokens = _tokenize(text)
+        if not tokens or tokens[0][0] != "name":
+            raise ValueError("class name missing")
+        query = cls(tokens[0][1])
+        position = 1
+        while position < len(tokens):
+            if tokens[position] != ("punctuation", ".") or \
+                    position + 2 >= len(tokens) or \
+                    tokens[position + 1][0] != "name" or \
+                    tokens[position + 2] != ("punctuation", "("):
+                raise ValueError("invalid query at {!r}".format(
+                    tokens[position][1]))
+            method = tokens[position + 1][1]
+            end = position + 3
+            while end < len(tokens) and tokens[end] != ("punctuation", ")"):
+                end += 1
+            if end == len(tokens):
+                raise ValueError("missing ) after {}".format(method))
+            args = cls.__split(tokens[position + 3:end])
+            query.__call(method, args)
+            position = end + 1
+        return query
+
+    @staticmethod
+    def __split(tokens):
+        """Return the comma separated arguments of tokens"""
+        args, current = [], []
+        for token in tokens:
+            if token == ("punctuation", ","):
+                args.append(current)
+                current = []
+            else:
+                current.append(token)
+        if current or args:
+            args.append(current)
+        if any(not arg for arg in args):
+            raise ValueError("empty argument")
+        return args
+
+    def __call(self, method, args):
+        """Apply the method call of the query to the query"""
+        if method == "where":
+            for arg in args:
+                if len(arg) != 3 or arg[0][0] != "name" or \
+                        arg[1][0] != "operator" or \
+                        arg[2][0] not in ("string", "number"):
+                    raise ValueError("invalid condition {}".format(
+                        " ".join(str(value) for _, value in arg)))
+                self.conditions.append((arg[0][1], arg[1][1], arg[2][1]))
+        elif method == "order_by":
+            for arg in args:
+                descending = arg[0] == ("punctuation", "-")
+                if descending:
+                    arg = arg[1:]
+                if len(arg) == 2 and arg[1][0] == "name" and \
+                        arg[1][1].lower() in ("asc", "desc"):
+                    descending = arg[1][1].lower() == "desc"
+                    arg = arg[:1]
+                if len(arg) != 1 or arg[0][0] != "name":
+                    raise ValueError("invalid order_by")
+                self.order.append((arg[0][1], descending))
+        elif method in ("limit", "offset"):
+            if len(args) != 1 or len(args[0]) != 1 or \
+                    not isinstance(args[0][0][1], int) or \
+                    args[0][0][0] != "number" or args[0][0][1] < 0:
+                raise ValueError("{} takes a number".format(method))
+            setattr(self, method, args[0][0][1])
+        elif method == "fields":
+            if any(len(arg) != 1 or arg[0][0] != "name" for arg in args):
+                raise ValueError("invalid fields")
+            self.fields += [arg[0][1] for arg in args]
+        elif method in ("count", "explain"):
+            if args:
+                raise ValueError("{} takes no argument".format(method))
+            self.action = method
+        else:
+            raise ValueError("unknown method {}".format(method))
+
+    def __steps(self):
+        """
+        Split the conditions by the index answering them
+        Usage:
+            Returns (equalities, ranges, rest) where equalities are
+            for storage.find and ranges for storage.select, raises
+            ValueError when the class does not exist
+        """
+        model = get_class(self.cls)
+        if model is None:
+            raise ValueError("class doesn't exist")
+        indexes = getattr(model, "indexes", ())
+        columns = getattr(model, "columns", ())
+        equalities, ranges, rest = {}, {}, []
+        for name, operator, value in self.conditions:
+            number = _number(value)
+            if OPERATORS[operator] is eq and name in indexes and \
+                    name not in equalities:
+                equalities[name] = value
+            elif name in columns and number is not None and \
+                    operator != "!=":
+                low, high = ranges.get(name, (None, None))
+                if operator in (">", ">=", "==", "="):
+                    low = number if low is None else max(low, number)
+                if operator in ("<", "<=", "==", "="):
+                    high = number if high is None else min(high, number)
+                ranges[name] = (low, high)
+                if operator in ("<", ">"):
+                    rest.append((name, operator, value))
+            else:
+                rest.append((name, operator, value))
+        return equalities, ranges, rest
+
+    def plan(self):
+        """Return the steps of the query, as text"""
+        equalities, ranges, rest = self.__steps()
+        steps = []
+        if equalities:
+            steps.append("index lookup {}".format(", ".join(
+                "{} == {!r}".format(*item) for item in equalities.items())))
+        if ranges:
+            steps.append("column ranges {}".format(", ".join(
+                "{} in [{}, {}]".format(name, *bounds)
+                for name, bounds in ranges.items())))
+        if not equalities and not ranges:
+            steps.append("scan {}".format(self.cls))
+        if rest:
+            steps.append("filter {}".format(", ".join(
+                "{} {} {!r}".format(*condition) for condition in rest)))
+        if self.order:
+            steps.append("{} {}".format(
+                "top {}".format(self.offset + self.limit)
+                if self.limit is not None and len(self.order) == 1
+                else "sort",
+                ", ".join(name + (" desc" if descending else "")
+                          for name, descending in self.order)))
+        if self.offset or self.limit is not None:
+            steps.append("offset {} limit {}".format(self.offset,
+                                                     self.limit))
+        return steps
+
+    def run(self, storage):
+        """
+        Return the list of the objects matching the query, in order,
+        from the storage engine storage
+        Usage:
+            Without order_by the scan stops once limit objects matched,
+            with order_by and limit only the top objects are kept
+        """
+        equalities, ranges, rest = self.__steps()
+        if equalities:
+            candidates = storage.find(self.cls, **equalities)
+            if ranges:
+                keys = storage.select(self.cls, **ranges)
+                candidates = {key: obj for key, obj in candidates.items()
+                              if key in keys}
+        elif ranges:
+            candidates = storage.select(self.cls, **ranges)
+        else:
+            candidates = storage.all(self.cls)
+        conditions = [(name, OPERATORS[operator], value, _number(value))
+                      for name, operator, value in rest]
+        results = (obj for obj in candidates.values()
+                   if all(self.__match(obj, *condition)
+                          for condition in conditions))
+        if self.order:
+            for name, descending in reversed(self.order[1:]):
+                results = sorted(results, reverse=descending,
+                                 key=lambda obj: _sort_key(
+                                     getattr(obj, name, None)))
+            name, descending = self.order[0]
+
+            def key(obj):
+                """Return the sort key of obj on the first attribute"""
+                return _sort_key(getattr(obj, name, None))
+
+            if self.limit is not None and len(self.order) == 1:
+                top = heapq.nlargest if descending else heapq.nsmallest
+                results = top(self.offset + self.limit, results, key=key)
+            else:
+                results = sorted(results, key=key, reverse=descending)
+        stop = None if self.limit is None else self.offset + self.limit
+        return list(islice(results, self.offset, stop))
+
+    @staticmethod
+    def __match(obj, name, operator, value, number):
+        """Return True when the attribute name of obj matches"""
+        attribute = getattr(obj, name, None)
+        if number is not None:
+            attribute = _number(attribute)
+            if attribute is None:
+                return operator is ne
+            return operator(attribute, number)
+        if operator in (eq, ne):
+            return operator(attribute, value)
+        try:
+            return operator(str(attribute), value)
+        except TypeError:
+            return False
@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+"""
+Module contains `TextIndex` class
+"""
+import re
+from collections import Counter
+from math import log
+from zlib import crc32
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Return the lowercase words of text"""
+    return _WORD.findall(text.casefold())
+
+
+class TextIndex:
+    """
+    Inverted Full-Text Index Representation
+    Usage:
+        Maps every word to the documents containing it with its
+        number of occurrences, and ranks the documents matching a
+        query with BM25. A document is re-tokenized only when the
+        checksum of its text changed, so putting the same text again
+        (after loading a saved index) costs one crc32
+
+    Methodes:
+        put: indexes the text of a document
+        remove: drops a document
+        search: returns the (score, key) pairs matching a query
+        dump: returns the index as a JSON compatible dictionary
+        load: builds an index from the output of dump
+
+    Attributes:
+        postings(dict): {word: {key: occurrences}}
+        documents(dict): {key: (number of words, crc32 of the text)}
+        terms(dict): the distinct words of each document by key
+        words(int): number of words of every document
+        changed(bool): True when a document was put or removed since
+            the index was built, loaded or last marked as saved
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        """Start with no document"""
+        self.postings = {}
+        self.documents = {}
+        self.terms = {}
+        self.words = 0
+        self.changed = False
+
+    def put(self, key, text):
+        """Index text as the document key, replacing its previous text"""
+        checksum = crc32(text.encode("utf-8"))
+        document = self.documents.get(key)
+        if document is not None and document[1] == checksum:
+            return
+        self.remove(key)
+        counts = Counter(tokenize(text))
+        for term, count in counts.items():
+            self.postings.setdefault(term, {})[key] = count
+        length = sum(counts.values())
+        self.documents[key] = (length, checksum)
+        self.terms[key] = tuple(counts)
+        self.words += length
+        self.changed = True
+
+    def remove(self, key):
+        """Drop the document key"""
+        document = self.documents.pop(key, None)
+        if document is None:
+            return
+        self.words -= document[0]
+        self.changed = True
+        for term in self.terms.pop(key):
+            posting = self.postings[term]
+            del posting[key]
+            if not posting:
+                del self.postings[term]
+
+    def search(self, query, limit=None):
+        """
+        Return the (score, key) pairs of the documents containing
+        a word of query, best first
+        Usage:
+            Documents containing more of the words, rarer words and
+            shorter documents rank higher (BM25)
+        """
+        if not self.documents:
+            return []
+        average = self.words / len(self.documents) or 1
+        scores = {}
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = log(1 + (len(self.documents) - len(posting) + 0.5) /
+                      (len(posting) + 0.5))
+            for key, count in posting.items():
+                norm = 1 - self.B + self.B * self.documents[key][0] / average
+                scores[key] = scores.get(key, 0.0) + idf * count * \
+                    (self.K1 + 1) / (count + self.K1 * norm)
+        ranked = sorted(((score, key) for key, score in scores.items()),
+                        key=lambda pair: (-pair[0], pair[1]))
+        return ranked if limit is None else ranked[:limit]
+
+    def dump(self):
+        """Return the index as a JSON compatible dictionary"""
+        return {"documents": self.documents, "postings": self.postings}
+
+    @classmethod
+    def load(cls, data):
+        """Return the index saved by dump"""
+        index = cls()
+        index.postings = data["postings"]
+        index.documents = {key: tuple(document) for key, document
+                           in data["documents"].items()}
+        terms = {key: [] for key in index.documents}
+        for term, posting in index.postings.items():
+            for key in posting:
+                terms[key].append(term)
+        index.terms = {key: tuple(words) for key, words in terms.items()}
+        index.words = sum(length for length, _ in index.documents.values())
+        return index
@@ -1,4 +1,6 @@
 from models.base_model import BaseModel
+from models.compact import Default
+from models.relations import Reference, Related
 
 """Place Class representation"""
 
@@ -18,9 +20,29 @@ class Place(BaseModel):
         price_by_night(int): 0 as default value
         latitude(float): 0.0 as default value
         longitude(float): 0.0 as default value
-        amenity_ids(list): empty list
+        amenity_ids(list): empty list, a new one for each instance
+        indexes(tuple): attributes indexed by the storage
+        columns(tuple): numeric attributes kept in the columnar
+            side-store of the storage, for storage.select
+        location(tuple): latitude and longitude attributes kept in the
+            spatial index of the storage, for storage.radius, bbox
+            and nearest
+        searchable(tuple): attributes in the full-text index of the
+            storage, for storage.search
+        bitmaps(tuple): list attributes in the bitmap indexes of the
+            storage, for storage.having
+        city(City): the city of the place
+        user(User): the owner of the place
+        reviews(list): the reviews of the place
+        amenities(list): the amenities of amenity_ids
     """
 
+    indexes = ("city_id", "user_id")
+    columns = ("number_rooms", "number_bathrooms", "max_guest",
+               "price_by_night", "latitude", "longitude")
+    location = ("latitude", "longitude")
+    searchable = ("name", "description")
+    bitmaps = ("amenity_ids",)
     city_id = ""
     user_id = ""
     name = ""
@@ -31,4 +53,9 @@ class Place(BaseModel):
     price_by_night = 0
     latitude = float(0.0)
     longitude = float(0.0)
-    amenity_ids = []
+    amenity_ids = Default(list)
+
+    city = Reference("City", "city_id")
+    user = Reference("User", "user_id")
+    reviews = Related("Review", "place_id")
+    amenities = Reference("Amenity", "amenity_ids")
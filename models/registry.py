@@ -0,0 +1,35 @@
+#!/usr/bin/python3
+"""
+Registry of the model classes
+Usage:
+    Every subclass of BaseModel is registered when it is defined,
+    the storage engines and the console look classes up by name here
+"""
+import re
+from importlib import import_module
+
+classes = {}
+
+
+def register(cls):
+    """Register the model class cls under its name"""
+    classes[cls.__name__] = cls
+    return cls
+
+
+def get_class(name):
+    """
+    Return the model class called name or None
+    Usage:
+        A class that is not registered yet is imported from
+        models.<snake_case name>, e.g. Review from models.review
+    """
+    cls = classes.get(name)
+    if cls is None and name.isidentifier():
+        module = re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+        try:
+            import_module("models." + module)
+        except ImportError:
+            return None
+        cls = classes.get(name)
+    return cls
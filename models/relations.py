@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+"""
+Relationship attributes of the model classes
+Usage:
+    class State(BaseModel):
+        cities = Related("City", "state_id")
+
+    class City(BaseModel):
+        state = Reference("State", "state_id")
+
+    state.cities -> the cities whose state_id is state.id, looked up in
+    the index the storage keeps on the foreign key (the attribute must
+    be in the `indexes` tuple of the related class)
+    city.state -> the state whose id is city.state_id, or None
+"""
+
+
+class Related:
+    """
+    One-to-many relationship
+    Usage:
+        Reading the attribute on an instance returns the list of the
+        objects of cls whose attribute key is the id of the instance,
+        with storage.find
+    """
+
+    def __init__(self, cls, key):
+        """Relate to the objects of the class named cls by key"""
+        self.cls = cls
+        self.key = key
+
+    def __get__(self, obj, owner=None):
+        """Return the related objects of obj"""
+        if obj is None:
+            return self
+        from models import storage
+
+        return list(storage.find(self.cls, **{self.key: obj.id}).values())
+
+
+class Reference:
+    """
+    Many-to-one relationship
+    Usage:
+        Reading the attribute on an instance returns the object of cls
+        whose id is the attribute key of the instance, None when there
+        is none. A list attribute, like amenity_ids, returns the list of
+        the objects found
+    """
+
+    def __init__(self, cls, key):
+        """Refer to an object of the class named cls by key"""
+        self.cls = cls
+        self.key = key
+
+    def __get__(self, obj, owner=None):
+        """Return the object, or the objects, referred by obj"""
+        if obj is None:
+            return self
+        from models import storage
+
+        value = getattr(obj, self.key, None)
+        if isinstance(value, list):
+            found = (storage.get(self.cls, _id) for _id in value)
+            return [related for related in found if related is not None]
+        return storage.get(self.cls, value)
+
+
+def relations(cls):
+    """Return {name: relationship} of the relationships of cls"""
+    return {name: value for klass in reversed(cls.__mro__)
+            for name, value in vars(klass).items()
+            if isinstance(value, (Related, Reference))}
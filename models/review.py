@@ -1,4 +1,5 @@
 from models.base_model import BaseModel
+from models.relations import Reference
 
 """Review Class representation"""
 
@@ -11,8 +12,18 @@ class Review(BaseModel):
         place_id(str): empty string
         user_id(str): empty string
         text(str): empty string
+        indexes(tuple): attributes indexed by the storage
+        searchable(tuple): attributes in the full-text index of the
+            storage, for storage.search
+        place(Place): the place reviewed
+        user(User): the author of the review
     """
 
+    indexes = ("place_id", "user_id")
+    searchable = ("text",)
     place_id = ""
     user_id = ""
     text = ""
+
+    place = Reference("Place", "place_id")
+    user = Reference("User", "user_id")
@@ -1,4 +1,5 @@
 from models.base_model import BaseModel
+from models.relations import Related
 
 """State Class representation"""
 
@@ -9,6 +10,9 @@ class State(BaseModel):
 
     Attribute:
         name(str): empty string
+        cities(list): the cities of the state
     """
 
     name = ""
+
+    cities = Related("City", "state_id")
@@ -3,6 +3,7 @@
 Define User class that inherits from BaseModel
 """
 from models.base_model import BaseModel
+from models.relations import Related
 
 
 class User(BaseModel):
@@ -14,9 +15,14 @@ class User(BaseModel):
         password(str): empty string
         first_name(str): empty string
         last_name(str): empty string
+        places(list): the places of the user
+        reviews(list): the reviews written by the user
     """
 
     email = ""
     password = ""
     first_name = ""
     last_name = ""
+
+    places = Related("Place", "user_id")
+    reviews = Related("Review", "user_id")
@@ -5,6 +5,12 @@ Unittest classes:
     TestHBNBCommand_prompting
     TestHBNBCommand_help
     TestHBNBCommand_exit
+    TestHBNBCommand_batch
+    TestHBNBCommand_select
+    TestHBNBCommand_search
+    TestHBNBCommand_query
+    TestHBNBCommand_aggregate
+    TestHBNBCommand_having
     TestHBNBCommand_create
     TestHBNBCommand_show
     TestHBNBCommand_all
@@ -33,6 +39,7 @@ def tearDownModule():
     file = FileStorage._FileStorage__file_path
     if not DEBUG and file:
         remove_file(file)
+        remove_file(file + ".search")
     FileStorage._FileStorage__file_path = "storage_file.json"
 
 
@@ -127,6 +134,308 @@ class TestHBNBCommand_exit(unittest.TestCase):
             self.assertTrue(HBNBCommand().onecmd("quit"))
 
 
+class TestHBNBCommand_batch(unittest.TestCase):
+    """Tests for begin, commit and rollback commands."""
+
+    def tearDown(self):
+        storage.rollback()
+
+    def test_commit(self):
+        with patch("sys.stdout", new=StringIO()) as console:
+            HBNBCommand().onecmd("begin")
+            HBNBCommand().onecmd("create User")
+            user_id = console.getvalue().strip()
+            HBNBCommand().onecmd("commit")
+        file = FileStorage._FileStorage__file_path
+        with open(file, "r") as f:
+            self.assertIn(user_id, f.read())
+
+    def test_rollback(self):
+        with patch("sys.stdout", new=StringIO()) as console:
+            HBNBCommand().onecmd("begin")
+            HBNBCommand().onecmd("create User")
+            user_id = console.getvalue().strip()
+            HBNBCommand().onecmd("rollback")
+        self.assertNotIn(f"User.{user_id}", storage.all())
+
+    def test_begin_twice(self):
+        with patch("sys.stdout", new=StringIO()) as console:
+            HBNBCommand().onecmd("begin")
+            HBNBCommand().onecmd("begin")
+            self.assertEqual("** batch already started **",
+                             console.getvalue().strip())
+
+
+class TestHBNBCommand_convert(unittest.TestCase):
+    """Tests for convert command of the HBNB console."""
+
+    def test_convert(self):
+        import json
+
+        paths = ["test_convert.json", "test_convert.hbnb",
+                 "test_convert_2.json"]
+        user = {"User.1": {"__class__": "User", "id": "1",
+                           "email": "a@b.c"}}
+        with open(paths[0], "w") as file:
+            json.dump(user, file)
+        with patch("sys.stdout", new=StringIO()) as console:
+            HBNBCommand().onecmd(f"convert {paths[0]} {paths[1]}")
+            HBNBCommand().onecmd(f"convert {paths[1]} {paths[2]}")
+            self.assertEqual("", console.getvalue())
+        with open(paths[2], "r") as file:
+            self.assertEqual(json.load(file), user)
+        if not DEBUG:
+            for path in paths:
+                remove_file(path)
+
+    def test_convert_errors(self):
+        prompts = {
+            "convert": "** source file missing **",
+            "convert a.json": "** destination file missing **",
+            "convert missing.json out.hbnb": "** file doesn't exist **",
+        }
+        for prompt, expected in prompts.items():
+            with patch("sys.stdout", new=StringIO()) as console:
+                HBNBCommand().onecmd(prompt)
+                self.assertEqual(expected, console.getvalue().strip())
+
+
+class TestHBNBCommand_select(unittest.TestCase):
+    """Tests for select command of the HBNB console."""
+
+    def setUp(self):
+        from models.place import Place
+
+        self.cheap, self.large = Place(), Place()
+        self.cheap.price_by_night = 40
+        self.large.price_by_night = 90
+        self.large.max_guest = 6
+
+    def tearDown(self):
+        storage.delete(self.cheap)
+        storage.delete(self.large)
+
+    def test_select(self):
+        with patch("sys.stdout", new=StringIO()) as console:
+            HBNBCommand().onecmd("select Place price_by_night=:50")
+            self.assertIn(self.cheap.id, console.getvalue())
+            self.assertNotIn(self.large.id, console.getvalue())
+
+    def test_select_dot_notation(self):
+        with patch("sys.stdout", new=StringIO()) as console:
+            HBNBCommand().onecmd(
+                "Place.select(price_by_night=50:100, max_guest=6)")
+            self.assertIn(self.large.id, console.getvalue())
+            self.assertNotIn(self.cheap.id, console.getvalue())
+
+    def test_select_errors(self):
+        prompts = {
+            "select": "** class name missing **",
+            "select MyModel": "** class doesn't exist **",
+            "select Place name=1": "** name is not a column of Place **",
+            "select Place max_guest": "** invalid range max_guest **",
+            "select Place max_guest=a:": "** could not convert string "
+                                         "to float: 'a' **",
+        }
+        for prompt, expected in prompts.items():
+            with patch("sys.stdout", new=StringIO()) as console:
+                HBNBCommand().onecmd(prompt)
+                self.assertEqual(expected, console.getvalue().strip())
+
+
+class TestHBNBCommand_search(unittest.TestCase):
+    """Tests for search command of the HBNB console."""
+
+    def setUp(self):
+        from models.review import Review
+
+        self.quiet, self.clean = Review(), Review()
+        self.quiet.text = "Quiet street"
+        self.clean.text = "Clean and quiet flat"
+
+    def tearDown(self):
+        storage.delete(self.quiet)
+        storage.delete(self.clean)
+
+    def test_search(self):
+        with patch("sys.stdout", new=StringIO()) as console:
+            HBNBCommand().onecmd('Review.search("clean quiet")')
+            output = console.getvalue()
+        self.assertLess(output.index(self.clean.id),
+                        output.index(self.quiet.id))
+        with patch("sys.stdout", new=StringIO()) as console:
+            HBNBCommand().onecmd('search Review "street"')
+            self.assertIn(self.quiet.id, console.getvalue())
+            self.assertNotIn(self.clean.id, console.getvalue())
+
+    def test_search_errors(self):
+        prompts = {
+            "search": "** class name missing **",
+            "search MyModel": "** class doesn't exist **",
+            "search Review": "** words missing **",
+            'search User "bob"': "** User is not searchable **",
+            'Review.search("pool")': "",
+        }
+        for prompt, expected in prompts.items():
+            with patch("sys.stdout", new=StringIO()) as console:
+                HBNBCommand().onecmd(prompt)
+                self.assertEqual(expected, console.getvalue().strip())
+
+
+class TestHBNBCommand_query(unittest.TestCase):
+    """Tests for query command of the HBNB console."""
+
+    def setUp(self):
+        from models.place import Place
+
+        self.cheap, self.large = Place(), Place()
+        self.cheap.name, self.large.name = "Cheap", "Large"
+        self.cheap.price_by_night = 40
+        self.large.price_by_night = 90
+        self.large.max_guest = 6
+
+    def tearDown(self):
+        storage.delete(self.cheap)
+        storage.delete(self.large)
+
+    def test_query(self):
+        with patch("sys.stdout", new=StringIO()) as console:
+            HBNBCommand().onecmd(
+                "Place.where(price_by_night<100, max_guest>=2)"
+                ".order_by(price_by_night).limit(20)")
+            self.assertIn(self.large.id, console.getvalue())
+            self.assertNotIn(self.cheap.id, console.getvalue())
+
+    def test_query_order_and_fields(self):
+        with patch("sys.stdout", new=StringIO()) as console:
+            HBNBCommand().onecmd(
+                "query Place.where(price_by_night >= 40, "
+                "price_by_night <= 90).order_by(price_by_night desc)"
+                ".fields(name)")
+            lines = [line for line in console.getvalue().splitlines()
+                     if self.cheap.id in line or self.large.id in line]
+            self.assertEqual([
+                "[Place] ({}) {{'name': 'Large'}}".format(self.large.id),
+                "[Place] ({}) {{'name': 'Cheap'}}".format(self.cheap.id)],
+                lines)
+
+    def test_query_count_and_explain(self):
+        with patch("sys.stdout", new=StringIO()) as console:
+            HBNBCommand().onecmd('Place.where(name == "Cheap").count()')
+            self.assertLessEqual(1, int(console.getvalue()))
+        with patch("sys.stdout", new=StringIO()) as console:
+            HBNBCommand().onecmd("Place.where(max_guest=6).explain()")
+            self.assertEqual("column ranges max_guest in [6.0, 6.0]",
+                             console.getvalue().strip())
+
+    def test_query_errors(self):
+        prompts = {
+            "query": "** class name missing **",
+            "MyModel.where(a<1)": "** class doesn't exist **",
+            "Place.where(max_guest)": "** invalid condition max_guest **",
+            "Place.where(price_by_night<abc)":
+                "** invalid condition price_by_night < abc **",
+            "Place.limit(a)": "** limit takes a number **",
+        }
+        for prompt, expected in prompts.items():
+            with patch("sys.stdout", new=StringIO()) as console:
+                HBNBCommand().onecmd(prompt)
+                self.assertEqual(expected, console.getvalue().strip())
+
+
+class TestHBNBCommand_aggregate(unittest.TestCase):
+    """Tests for aggregate command of the HBNB console."""
+
+    def setUp(self):
+        from models.place import Place
+        from models.user import User
+
+        self.places = [Place(), Place(), Place()]
+        self.city = str(id(self))
+        for place, price in zip(self.places, (40, 90, 50)):
+            place.city_id = self.city
+            place.price_by_night = price
+        self.user = User()
+        self.user.email = "betty@{}.example".format(self.city)
+
+    def tearDown(self):
+        for obj in self.places + [self.user]:
+            storage.delete(obj)
+
+    def test_aggregate(self):
+        with patch("sys.stdout", new=StringIO()) as console:
+            HBNBCommand().onecmd("Place.aggregate(avg(price_by_night), "
+                                 "max(price_by_night), count by city_id)")
+            self.assertIn(str({"city_id": self.city,
+                               "avg(price_by_night)": 60.0,
+                               "max(price_by_night)": 90.0, "count": 3}),
+                          console.getvalue().splitlines())
+
+    def test_aggregate_domain(self):
+        with patch("sys.stdout", new=StringIO()) as console:
+            HBNBCommand().onecmd("aggregate User count by domain(email)")
+            self.assertIn(str({"domain(email)": self.city + ".example",
+                               "count": 1}),
+                          console.getvalue().splitlines())
+
+    def test_aggregate_errors(self):
+        prompts = {
+            "aggregate": "** class name missing **",
+            "aggregate MyModel count": "** class doesn't exist **",
+            "Place.aggregate()": "** function missing **",
+            "Place.aggregate(avg)": "** avg needs an attribute **",
+            "Place.aggregate(count by a b)": "** invalid group a b **",
+        }
+        for prompt, expected in prompts.items():
+            with patch("sys.stdout", new=StringIO()) as console:
+                HBNBCommand().onecmd(prompt)
+                self.assertEqual(expected, console.getvalue().strip())
+
+
+class TestHBNBCommand_having(unittest.TestCase):
+    """Tests for having command of the HBNB console."""
+
+    def setUp(self):
+        from models.place import Place
+
+        self.both, self.wifi = Place(), Place()
+        self.both.amenity_ids = ["wifi-id", "pool-id"]
+        self.wifi.amenity_ids = ["wifi-id"]
+
+    def tearDown(self):
+        storage.delete(self.both)
+        storage.delete(self.wifi)
+
+    def test_having_and(self):
+        with patch("sys.stdout", new=StringIO()) as console:
+            HBNBCommand().onecmd("having Place amenity_ids wifi-id and "
+                                 "pool-id")
+            self.assertIn(self.both.id, console.getvalue())
+            self.assertNotIn(self.wifi.id, console.getvalue())
+
+    def test_having_or_dot_notation(self):
+        with patch("sys.stdout", new=StringIO()) as console:
+            HBNBCommand().onecmd('Place.having(amenity_ids, "pool-id", or, '
+                                 '"wifi-id")')
+            self.assertIn(self.both.id, console.getvalue())
+            self.assertIn(self.wifi.id, console.getvalue())
+
+    def test_having_errors(self):
+        prompts = {
+            "having": "** class name missing **",
+            "having MyModel": "** class doesn't exist **",
+            "having Place": "** attribute name missing **",
+            "having Place amenity_ids": "** value missing **",
+            "having Place amenity_ids a and b or c": "** cannot mix and "
+                                                     "with or **",
+            "having Place name a": "** Place has no bitmap index on name **",
+        }
+        for prompt, expected in prompts.items():
+            with patch("sys.stdout", new=StringIO()) as console:
+                HBNBCommand().onecmd(prompt)
+                self.assertEqual(expected, console.getvalue().strip())
+
+
 class TestHBNBCommand_create(unittest.TestCase):
     """Tests for create command of the HBNB console."""
 
@@ -319,6 +628,40 @@ class TestHBNBCommand_show(unittest.TestCase):
                     self.assertFalse(HBNBCommand().onecmd(command))
                     self.assertEqual(obj.__str__(), console.getvalue().strip())
 
+    def test_show_with_relationships(self):
+        """Test show --with prints the related instances"""
+        from models.place import Place
+        from models.review import Review
+        from models.user import User
+
+        place, review, user = Place(), Review(), User()
+        review.place_id = place.id
+        place.user_id = user.id
+        try:
+            with patch("sys.stdout", new=StringIO()) as console:
+                self.assertFalse(HBNBCommand().onecmd(
+                    "show Place {} --with reviews,user".format(place.id)))
+                self.assertEqual([str(place),
+                                  "reviews: {}".format([str(review)]),
+                                  "user: {}".format(user)],
+                                 console.getvalue().splitlines())
+        finally:
+            for obj in (place, review, user):
+                storage.delete(obj)
+
+    def test_show_with_errors(self):
+        """Test show --with errors"""
+        prompts = {
+            "show Place 1 --with": "** relationship missing **",
+            "show Place 1 --with rooms": "** rooms is not a relationship "
+                                         "of Place **",
+            "show Place 1 --with reviews": "** no instance found **",
+        }
+        for prompt, expected in prompts.items():
+            with patch("sys.stdout", new=StringIO()) as console:
+                HBNBCommand().onecmd(prompt)
+                self.assertEqual(expected, console.getvalue().strip())
+
 
 class TestHBNBCommand_destroy(unittest.TestCase):
     """Tests for destroy command of the HBNB console."""
@@ -23,6 +23,7 @@ def tearDownModule():
     file = FileStorage._FileStorage__file_path
     if not DEBUG:
         remove_file(file)
+        remove_file(file + ".search")
     FileStorage._FileStorage__file_path = "storage_file.json"
 
 
@@ -326,6 +327,69 @@ class TestBaseClass(unittest.TestCase):
         self.assertEqual(base.updated_at, base_2.updated_at)
         self.assertEqual(base.__dict__, base_2.__dict__)
 
+    def test_from_record(self):
+        """Tests from_record builds the same instance as kwargs"""
+        self.clearStorageSystem()
+        base = BaseModel()
+        base.name = "record"
+        loaded = BaseModel.from_record(base.to_dict())
+        self.assertIsInstance(loaded, BaseModel)
+        self.assertEqual(loaded.__dict__, base.__dict__)
+        self.assertEqual(loaded.__dict__,
+                         BaseModel(**base.to_dict()).__dict__)
+
+    def test_from_record_not_in_storage(self):
+        """Tests from_record does not add the instance to storage"""
+        self.clearStorageSystem()
+        data = {
+            "id": "56d43177-cc5f-4d6c-a0c1-e167f8c27337",
+            "created_at": "2017-09-28T21:03:54",
+            "__class__": "BaseModel",
+            "updated_at": "2017-09-28T21:03:54.052302",
+        }
+        base = BaseModel.from_record(data)
+        self.assertEqual(base.created_at, datetime(2017, 9, 28, 21, 3, 54))
+        self.assertNotIn("BaseModel." + base.id,
+                         FileStorage._FileStorage__objects)
+
+    def test_to_dict_not_cached(self):
+        """Tests to_dict returns new dictionaries and only __str__ is kept"""
+        base = BaseModel()
+        first = base.to_dict()
+        first["name"] = "changed"
+        second = base.to_dict()
+        self.assertNotIn("name", second)
+        self.assertIsNot(first, second)
+        self.assertIsNone(getattr(base, "_BaseModel__cache", None))
+        text = str(base)
+        self.assertEqual(base._BaseModel__cache, text)
+        self.assertNotIn("_BaseModel__cache", base.__dict__)
+
+    def test_cache_invalidated_on_change(self):
+        """Tests to_dict and __str__ follow attribute changes"""
+        base = BaseModel()
+        self.assertNotIn("Holberton", str(base))
+        self.assertNotIn("name", base.to_dict())
+        base.name = "Holberton"
+        self.assertIn("Holberton", str(base))
+        self.assertEqual(base.to_dict()["name"], "Holberton")
+        del base.name
+        self.assertNotIn("Holberton", str(base))
+        self.assertNotIn("name", base.to_dict())
+
+    def test_cache_from_record(self):
+        """Tests the serialized forms of a from_record instance"""
+        data = {
+            "id": "56d43177-cc5f-4d6c-a0c1-e167f8c27337",
+            "created_at": "2017-09-28T21:03:54.052298",
+            "__class__": "BaseModel",
+            "updated_at": "2017-09-28T21:03:54.052302",
+        }
+        base = BaseModel.from_record(dict(data))
+        self.assertEqual(base.to_dict(), data)
+        self.assertEqual(str(base), "[BaseModel] ({}) <{}>".format(
+            base.id, base.__dict__))
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
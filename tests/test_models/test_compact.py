@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+"""
+Unittest for the compact layout module
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from models.compact import Default, Field, Layout, Record, settle
+
+
+class Root(metaclass=Layout):
+    """Root of the test classes, declared like BaseModel"""
+
+    __slots__ = ("__dict__", "__weakref__")
+
+
+class Sample(Root):
+    """Test class with declared attributes"""
+
+    indexes = ("name",)
+    name = ""
+    number = 0
+    tags = Default(list)
+
+
+class TestLayout(unittest.TestCase):
+    """Test the classes built by Layout"""
+
+    def test_fixed_layout(self):
+        """Test instances have no per-instance dictionary"""
+        self.assertTrue(issubclass(Sample, Record))
+        self.assertNotIn("__dict__", Sample.__slots__)
+        self.assertIsInstance(Sample.__dict__["name"], Field)
+        self.assertEqual(Sample.indexes, ("name",))
+
+    def test_defaults(self):
+        """Test unset attributes read the declared defaults"""
+        sample = Sample()
+        self.assertEqual(Sample.name, "")
+        self.assertEqual(sample.number, 0)
+        self.assertEqual(sample.__dict__, {})
+        with self.assertRaises(AttributeError):
+            sample.id
+
+    def test_mutable_default(self):
+        """Test each instance gets its own list, stored in the slot"""
+        sample, other = Sample(), Sample()
+        sample.tags.append("a")
+        settle(sample)
+        self.assertEqual(sample.tags, ["a"])
+        self.assertEqual(other.tags, [])
+        self.assertEqual(Sample.tags, [])
+        self.assertEqual(sample.__dict__, {"tags": ["a"]})
+
+    def test_default_not_stored(self):
+        """Test reading a Default stores nothing until settle"""
+        sample = Sample()
+        self.assertEqual(sample.tags, [])
+        self.assertIs(type(sample.tags), list)
+        settle(sample)
+        self.assertEqual(sample.__dict__, {})
+        sample.tags.append("a")
+        self.assertEqual(sample.__dict__, {})
+        settle(sample)
+        self.assertEqual(sample.__dict__, {"tags": ["a"]})
+        other = Sample()
+        other.tags.append("b")
+        other.tags = ["c"]
+        settle(other)
+        self.assertEqual(other.tags, ["c"])
+
+    def test_set_and_delete(self):
+        """Test attributes are set in the slots and unset"""
+        sample = Sample()
+        sample.id = "1234"
+        sample.number = 3
+        self.assertEqual(sample.__dict__, {"id": "1234", "number": 3})
+        del sample.number
+        self.assertEqual(sample.number, 0)
+        self.assertEqual(sample.__dict__, {"id": "1234"})
+
+    def test_overflow(self):
+        """Test attributes without a slot go to the overflow dictionary"""
+        sample = Sample()
+        sample.color = "blue"
+        self.assertEqual(sample.color, "blue")
+        self.assertEqual(sample.__dict__, {"color": "blue"})
+        del sample.color
+        with self.assertRaises(AttributeError):
+            sample.color
+        with self.assertRaises(AttributeError):
+            del sample.color
+
+    def test_assign_dict(self):
+        """Test assigning __dict__ replaces every attribute"""
+        sample = Sample()
+        sample.number = 3
+        sample.color = "blue"
+        object.__setattr__(sample, "__dict__", {"name": "a", "size": 2})
+        self.assertEqual(sample.__dict__, {"name": "a", "size": 2})
+        self.assertEqual(sample.number, 0)
+
+
+class TestCompactModels(unittest.TestCase):
+    """Test the models with HBNB_COMPACT_MODELS=1"""
+
+    def test_console(self):
+        """Test the console works on compact instances"""
+        root = os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__))))
+        env = dict(os.environ, HBNB_COMPACT_MODELS="1", PYTHONPATH=root)
+        code = (
+            "from models.place import Place\n"
+            "from models.base_model import BaseModel\n"
+            "from console import HBNBCommand\n"
+            "place = Place()\n"
+            "assert Place.__dictoffset__ == 0\n"
+            "HBNBCommand().onecmd('update Place ' + place.id + "
+            "' max_guest 4')\n"
+            "HBNBCommand().onecmd('update Place ' + place.id + "
+            "' color \"red\"')\n"
+            "HBNBCommand().onecmd('show Place ' + place.id)\n"
+            "print(place.to_dict()['max_guest'], place.color)\n"
+        )
+        with tempfile.TemporaryDirectory() as cwd:
+            output = subprocess.run(
+                [sys.executable, "-c", code], cwd=cwd, env=env,
+                capture_output=True, text=True, check=True).stdout
+        self.assertIn("'max_guest': '4'", output)
+        self.assertIn("'color': 'red'", output)
+        self.assertTrue(output.endswith("4 red\n"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+"""
+Test the aggregation engine
+"""
+
+import unittest
+from types import SimpleNamespace
+
+from models.engine import aggregate as engine
+from models.engine.aggregate import aggregate, parse
+from models.engine.columns import Columns
+
+
+class TestAggregate(unittest.TestCase):
+    """Test aggregate function"""
+
+    def setUp(self):
+        """Provide places of two cities, one price is not a number"""
+        self.objects = {}
+        for number, (city, price) in enumerate((
+                ("a", 50), ("b", 120), ("a", "80"), ("b", None),
+                ("a", 20), ("c", "free"))):
+            self.objects[str(number)] = SimpleNamespace(
+                city_id=city, price=price,
+                email="user{}@Mail{}.com".format(number, number % 2))
+        self.functions = ("count", "count(price)", "sum(price)",
+                          "avg(price)", "min(price)", "max(price)")
+
+    def test_docstrings(self):
+        """Test docstrings"""
+        for method in (aggregate, parse, engine.parse_function,
+                       engine.parse_key, engine.group, engine.reduce):
+            with self.subTest(method=method):
+                self.assertTrue(len(method.__doc__) > 10)
+
+    def test_parse(self):
+        """Test functions and groups are parsed"""
+        self.assertEqual(parse("avg(price_by_night), count by city_id"),
+                         ([("avg", "price_by_night"), ("count", None)],
+                          "city_id"))
+        self.assertEqual(parse(" count() "), ([("count", None)], None))
+        for text in ("", "avg", "median(price)", "count by",
+                     "count(a b)"):
+            with self.subTest(text=text):
+                self.assertRaises(ValueError, parse, text)
+
+    def test_group_by(self):
+        """Test every function per group, ignoring non numbers"""
+        result = aggregate(self.objects, self.functions, "city_id")
+        self.assertEqual(list(result), ["a", "b", "c"])
+        self.assertEqual(result["a"], {
+            "count": 3, "count(price)": 3, "sum(price)": 150.0,
+            "avg(price)": 50.0, "min(price)": 20.0, "max(price)": 80.0})
+        self.assertEqual(result["b"]["avg(price)"], 120.0)
+        self.assertEqual(result["c"], {
+            "count": 1, "count(price)": 0, "sum(price)": 0,
+            "avg(price)": None, "min(price)": None, "max(price)": None})
+
+    def test_without_group(self):
+        """Test a single None group, even without objects"""
+        result = aggregate(self.objects, ["count", "max(price)"])
+        self.assertEqual(result, {None: {"count": 6, "max(price)": 120.0}})
+        self.assertEqual(aggregate({}, ["count", "avg(price)"]),
+                         {None: {"count": 0, "avg(price)": None}})
+        self.assertEqual(aggregate({}, ["count"], "city_id"), {})
+
+    def test_group_functions(self):
+        """Test groups computed from an attribute or a function"""
+        result = aggregate(self.objects, ["count"], "domain(email)")
+        self.assertEqual(result, {"mail0.com": {"count": 3},
+                                  "mail1.com": {"count": 3}})
+        result = aggregate(self.objects, [("count", None)],
+                           lambda obj: obj.price is None)
+        self.assertEqual(result, {False: {"count": 5}, True: {"count": 1}})
+        result = aggregate(self.objects, ["count"], "missing")
+        self.assertEqual(result, {None: {"count": 6}})
+        self.assertRaises(ValueError, aggregate, self.objects, ["count"],
+                          "median(price)")
+
+    def test_columns(self):
+        """Test the values are read from a matching Columns store"""
+        store = Columns(("price",))
+        for key, obj in self.objects.items():
+            store.put(key, obj)
+        self.assertEqual(
+            aggregate(self.objects, self.functions, "city_id", store),
+            aggregate(self.objects, self.functions, "city_id"))
+
+    @unittest.skipIf(engine.numpy is None, "NumPy is not installed")
+    def test_numpy_matches_lists(self):
+        """Test the NumPy and the pure Python paths agree"""
+        expected = aggregate(self.objects, self.functions, "city_id")
+        numpy, engine.numpy = engine.numpy, None
+        try:
+            result = aggregate(self.objects, self.functions, "city_id")
+        finally:
+            engine.numpy = numpy
+        self.assertEqual(result, expected)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
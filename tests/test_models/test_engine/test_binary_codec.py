@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+"""
+Test binary_codec
+"""
+
+import io
+import json
+import unittest
+
+from models.engine import binary_codec
+from tests.helper import remove_file, DEBUG
+
+
+class TestBinaryCodec(unittest.TestCase):
+    """Test the binary storage format"""
+
+    items = {
+        "User.1": {"__class__": "User", "id": "1", "email": "a@b.c"},
+        "Place.c79d0e10-a1b9-4cdd-b896-bc342e8fa1ea": {
+            "__class__": "Place",
+            "id": "c79d0e10-a1b9-4cdd-b896-bc342e8fa1ea",
+            "created_at": "2023-08-18T14:11:50.288404",
+            "updated_at": "2023-08-18T14:11:50",
+            "city_id": "C79D0E10-A1B9-4CDD-B896-BC342E8FA1EA",
+            "number_rooms": 3,
+            "balance": -12345678901234567890,
+            "latitude": 37.77,
+            "amenity_ids": ["1", None, True, False, [], {"k": 0.5}],
+            "description": "café 2023-08-18T14:11:50.288404Z",
+        },
+    }
+
+    def round_trip(self, items):
+        """Return items after a dump and load"""
+        file = io.BytesIO()
+        binary_codec.dump(items.items(), file)
+        file.seek(0)
+        return dict(binary_codec.load(file))
+
+    def test_docstrings(self):
+        """Test docstrings"""
+        for function in (binary_codec, binary_codec.dump,
+                         binary_codec.load, binary_codec.convert):
+            with self.subTest(function=function):
+                self.assertTrue(len(function.__doc__) > 10)
+
+    def test_round_trip(self):
+        """Test values are loaded as they were dumped"""
+        self.assertEqual(self.round_trip(self.items), self.items)
+        self.assertEqual(self.round_trip({}), {})
+
+    def test_datetimes_before_epoch(self):
+        """Test datetimes before 1970 round trip"""
+        items = {"User.1": {"__class__": "User", "id": "1",
+                            "birth": "1969-07-20T20:17:40",
+                            "epoch": "1970-01-01T00:00:00",
+                            "old": "0001-01-01T00:00:00.000001"}}
+        self.assertEqual(self.round_trip(items), items)
+
+    def test_smaller_than_json(self):
+        """Test repeated strings and UUIDs are packed"""
+        items = {}
+        for i in range(100):
+            value = dict(self.items["Place.c79d0e10-a1b9-4cdd-b896-"
+                                    "bc342e8fa1ea"])
+            value["id"] = "c79d0e10-a1b9-4cdd-b896-{:012d}".format(i)
+            items[f"Place.{value['id']}"] = value
+        file = io.BytesIO()
+        binary_codec.dump(items.items(), file)
+        self.assertLess(len(file.getvalue()), len(json.dumps(items)) / 2)
+
+    def test_not_binary(self):
+        """Test loading a JSON file raises ValueError"""
+        with self.assertRaises(ValueError):
+            list(binary_codec.load(io.BytesIO(b'{"a": 1}')))
+
+    def test_convert(self):
+        """Test JSON to binary and back"""
+        paths = ["test_codec.json", "test_codec.hbnb", "test_codec_2.json"]
+        with open(paths[0], "w") as file:
+            json.dump(self.items, file)
+        binary_codec.convert(paths[0], paths[1])
+        binary_codec.convert(paths[1], paths[2])
+        with open(paths[2], "r") as file:
+            self.assertEqual(json.load(file), self.items)
+        if not DEBUG:
+            for path in paths:
+                remove_file(path)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
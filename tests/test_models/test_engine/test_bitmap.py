@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""
+Test BitmapIndex
+"""
+
+import random
+import unittest
+
+from models.engine.bitmap import BitmapIndex
+
+
+class TestBitmapIndex(unittest.TestCase):
+    """Test BitmapIndex Class"""
+
+    def setUp(self):
+        """Provide an index of four keys"""
+        self.index = BitmapIndex()
+        self.index.put("a", ["wifi", "pool"])
+        self.index.put("b", ["wifi"])
+        self.index.put("c", ("pool", "parking", "wifi"))
+        self.index.put("d", [])
+
+    def test_docstrings(self):
+        """Test docstrings"""
+        for method in (BitmapIndex, BitmapIndex.put, BitmapIndex.remove,
+                       BitmapIndex.all, BitmapIndex.any):
+            with self.subTest(method=method):
+                self.assertTrue(len(method.__doc__) > 10)
+
+    def test_all(self):
+        """Test keys holding every value"""
+        self.assertEqual(self.index.all(["wifi", "pool"]), ["a", "c"])
+        self.assertEqual(self.index.all(["wifi", "pool", "parking"]), ["c"])
+        self.assertEqual(self.index.all(["wifi", "sauna"]), [])
+        self.assertEqual(self.index.all([]), ["a", "b", "c", "d"])
+
+    def test_any(self):
+        """Test keys holding at least one value"""
+        self.assertEqual(self.index.any(["parking", "wifi"]),
+                         ["a", "b", "c"])
+        self.assertEqual(self.index.any(["sauna"]), [])
+        self.assertEqual(self.index.any([]), [])
+
+    def test_put_replaces_and_remove(self):
+        """Test changed values, removed keys and reused ordinals"""
+        self.index.put("b", ["pool"])
+        self.index.remove("a")
+        self.index.remove("missing")
+        self.assertEqual(self.index.all(["pool"]), ["b", "c"])
+        self.assertEqual(self.index.all(["wifi"]), ["c"])
+        self.index.put("e", ["wifi"])
+        self.assertEqual(self.index.ordinals["e"], 0)
+        self.assertEqual(self.index.all(["wifi"]), ["e", "c"])
+        self.index.remove("c")
+        self.assertNotIn("parking", self.index.bitmaps)
+
+    def test_invalid_values(self):
+        """Test values that are not lists hold nothing"""
+        for values in (None, "wifi", 3, [["wifi"]]):
+            with self.subTest(values=values):
+                self.index.put("x", values)
+                self.assertEqual(self.index.values["x"], frozenset())
+                self.assertNotIn("x", self.index.any(["wifi"]))
+
+    def test_matches_scan(self):
+        """Test random lists against a scan of every list"""
+        rand = random.Random(1)
+        index, lists = BitmapIndex(), {}
+        for key in range(2000):
+            lists[key] = rand.sample(range(30), rand.randint(0, 8))
+            index.put(key, lists[key])
+        for key in range(0, 2000, 7):
+            index.remove(key)
+            del lists[key]
+        for _ in range(20):
+            wanted = rand.sample(range(30), 2)
+            self.assertEqual(
+                sorted(index.all(wanted)),
+                sorted(key for key, values in lists.items()
+                       if all(value in values for value in wanted)))
+            self.assertEqual(
+                sorted(index.any(wanted)),
+                sorted(key for key, values in lists.items()
+                       if any(value in values for value in wanted)))
+
+
+if __name__ == "__main__":
+    unittest.main()
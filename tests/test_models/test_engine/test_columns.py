@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+"""
+Test Columns
+"""
+
+import unittest
+from types import SimpleNamespace
+
+from models.engine import columns
+from models.engine.columns import Columns
+from models.place import Place
+
+
+class TestColumns(unittest.TestCase):
+    """Test Columns Class"""
+
+    def setUp(self):
+        """Provide a store of three rows"""
+        self.store = Columns(("price", "guests"))
+        self.store.put("a", SimpleNamespace(price=50, guests=2))
+        self.store.put("b", SimpleNamespace(price=120, guests=4))
+        self.store.put("c", SimpleNamespace(price="80", guests=6))
+
+    def test_docstrings(self):
+        """Test docstrings"""
+        for method in (Columns, Columns.put, Columns.update,
+                       Columns.remove, Columns.select, Columns.bounds,
+                       Columns.column):
+            with self.subTest(method=method):
+                self.assertTrue(len(method.__doc__) > 10)
+
+    def test_select(self):
+        """Test ranges with closed, open and exact bounds"""
+        select = self.store.select
+        self.assertEqual(sorted(select({"price": (50, 100)})), ["a", "c"])
+        self.assertEqual(sorted(select({"price": (None, 100),
+                                        "guests": (4, None)})), ["c"])
+        self.assertEqual(select({"guests": (4, 4)}), ["b"])
+        self.assertEqual(sorted(select({})), ["a", "b", "c"])
+
+    def test_update_and_remove(self):
+        """Test rows follow changes and deletions"""
+        self.store.update("a", "price", 90)
+        self.store.remove("b")
+        self.store.remove("missing")
+        self.assertEqual(self.store.keys, ["a", "c"])
+        self.assertEqual(sorted(self.store.select({"price": (85, None)})),
+                         ["a"])
+        self.store.remove("a")
+        self.assertEqual(self.store.select({"price": (0, None)}), ["c"])
+
+    def test_not_a_number(self):
+        """Test values that are not numbers match no range"""
+        self.store.update("a", "price", "free")
+        self.assertEqual(sorted(self.store.select({"price": (None, None)})),
+                         ["b", "c"])
+
+    def test_grow(self):
+        """Test the arrays grow past their first allocation"""
+        for number in range(100):
+            self.store.put(str(number), SimpleNamespace(price=number,
+                                                        guests=0))
+        self.assertEqual(len(self.store.select({"price": (10, 19)})), 10)
+
+    def test_bounds(self):
+        """Test the ranges are checked against the model columns"""
+        self.assertEqual(Columns.bounds(Place, {"max_guest": 4,
+                                                "latitude": (None, "2")}),
+                         {"max_guest": (4.0, 4.0), "latitude": (None, 2.0)})
+        with self.assertRaises(ValueError):
+            Columns.bounds(Place, {"name": (1, 2)})
+
+    @unittest.skipIf(columns.numpy is None, "NumPy is not installed")
+    def test_numpy_matches_arrays(self):
+        """Test the NumPy and array.array paths select the same rows"""
+        ranges = ({"price": (60, None)}, {"price": (None, None)},
+                  {"price": (None, 100)}, {})
+
+        def selected():
+            """Return the rows of each range with the current backend"""
+            store = Columns(("price", "guests"))
+            for key, price in (("a", 50), ("b", 120), ("c", "80"),
+                               ("d", "free"), ("e", None)):
+                store.put(key, SimpleNamespace(price=price, guests=0))
+            return [sorted(store.select(bounds)) for bounds in ranges]
+
+        expected = selected()
+        numpy, columns.numpy = columns.numpy, None
+        try:
+            self.assertEqual(selected(), expected)
+        finally:
+            columns.numpy = numpy
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
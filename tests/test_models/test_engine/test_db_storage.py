@@ -0,0 +1,249 @@
+#!/usr/bin/python3
+"""
+Test DB Storage
+"""
+
+import unittest
+from datetime import datetime
+
+from models.engine.db_storage import DBStorage
+from models.base_model import BaseModel
+from models.review import Review
+from tests.helper import remove_file, DEBUG
+
+
+def setUpModule():
+    """Use a database for testing to avoid side effect"""
+    DBStorage._DBStorage__file_path = "test_db_storage.db"
+
+
+def tearDownModule():
+    """Close and remove the test database"""
+    DBStorage().close()
+    if not DEBUG:
+        for suffix in ("", "-wal", "-shm"):
+            remove_file("test_db_storage.db" + suffix)
+    DBStorage._DBStorage__file_path = "storage_file.db"
+
+
+def review(place_id):
+    """Return a review of place_id that is not in the global storage"""
+    now = datetime.now().isoformat()
+    return Review(id=str(id(object())) + place_id, created_at=now,
+                  updated_at=now, place_id=place_id, text="ok")
+
+
+class TestDBStorage(unittest.TestCase):
+    """Test DBStorage Class"""
+
+    def setUp(self):
+        """Start from an empty database"""
+        self.storage = DBStorage()
+        self.storage.close()
+        for suffix in ("", "-wal", "-shm"):
+            remove_file("test_db_storage.db" + suffix)
+
+    def reopen(self):
+        """Close the connection so objects are read from the database"""
+        self.storage.close()
+        return DBStorage()
+
+    def test_docstrings(self):
+        """Test docstrings"""
+        for method in (DBStorage, DBStorage.all, DBStorage.new,
+                       DBStorage.save, DBStorage.reload, DBStorage.find):
+            with self.subTest(method=method):
+                self.assertTrue(len(method.__doc__) > 10)
+
+    def test_save_and_reload(self):
+        """Test objects round trip through the database"""
+        obj = review("p1")
+        self.storage.new(obj)
+        self.storage.save()
+        storage = self.reopen()
+        self.assertEqual(storage.count(Review), 1)
+        loaded = storage.all()[f"Review.{obj.id}"]
+        self.assertEqual(loaded.to_dict(), obj.to_dict())
+
+    def test_update_is_upsert(self):
+        """Test saving a changed object updates its row"""
+        obj = review("p1")
+        self.storage.new(obj)
+        self.storage.save()
+        obj.text = "changed"
+        self.storage.mark_dirty(obj)
+        self.storage.save()
+        storage = self.reopen()
+        self.assertEqual(storage.count("Review"), 1)
+        self.assertEqual(storage.all(Review)[f"Review.{obj.id}"].text,
+                         "changed")
+
+    def test_count_unknown_class(self):
+        """Test an unknown class counts 0 like in the file storage"""
+        self.assertEqual(self.storage.count("Foo"), 0)
+
+    def test_delete(self):
+        """Test deleted objects are removed from the database"""
+        obj = review("p1")
+        self.storage.new(obj)
+        self.storage.save()
+        self.storage.delete(obj)
+        self.storage.save()
+        self.assertEqual(self.reopen().all(Review), {})
+
+    def test_find(self):
+        """Test find uses saved and unsaved objects"""
+        saved, other = review("p1"), review("p2")
+        for obj in (saved, other):
+            self.storage.new(obj)
+        self.storage.save()
+        unsaved = review("p1")
+        self.storage.new(unsaved)
+        found = self.storage.find(Review, place_id="p1")
+        self.assertEqual(set(found), {f"Review.{saved.id}",
+                                      f"Review.{unsaved.id}"})
+        found = self.storage.find(Review, place_id="p1", text="nope")
+        self.assertEqual(found, {})
+
+    def test_get(self):
+        """Test get on saved objects"""
+        now = datetime.now().isoformat()
+        base = BaseModel(id="b", created_at=now, updated_at=now)
+        self.storage.new(base)
+        self.storage.save()
+        storage = self.reopen()
+        self.assertEqual(storage.get(BaseModel, "b").to_dict(),
+                         base.to_dict())
+        self.assertIsNone(storage.get("BaseModel", "missing"))
+
+    def test_get_and_new_read_one_row(self):
+        """Test get and new do not load the whole table"""
+        for number in range(3):
+            self.storage.new(review(str(number)))
+        self.storage.save()
+        storage = self.reopen()
+        saved = list(storage.find(Review, place_id="1").values())[0]
+        classes = DBStorage._DBStorage__classes
+        self.assertEqual(list(classes["Review"]), [f"Review.{saved.id}"])
+        self.assertIs(storage.get(Review, saved.id), saved)
+        storage.new(review("3"))
+        self.assertEqual(len(classes["Review"]), 2)
+        self.assertEqual(storage.count(Review), 4)
+        self.assertEqual(len(storage.all(Review)), 4)
+
+    def test_select(self):
+        """Test select on saved, default and unsaved values"""
+        from models.place import Place
+
+        now = datetime.now().isoformat()
+        places = [Place(id=str(id(object())) + str(price), created_at=now,
+                        updated_at=now, price_by_night=price)
+                  for price in (50, "120")]
+        places.append(Place(id="default", created_at=now, updated_at=now))
+        for place in places:
+            self.storage.new(place)
+        self.storage.save()
+        storage = self.reopen()
+        found = storage.select(Place, price_by_night=(100, None))
+        self.assertEqual(set(found), {f"Place.{places[1].id}"})
+        found = storage.select(Place, price_by_night=(None, 60))
+        self.assertEqual(set(found), {f"Place.{places[0].id}",
+                                      "Place.default"})
+        changed = storage.all(Place)["Place.default"]
+        changed.price_by_night = 300
+        storage.mark_dirty(changed)
+        found = storage.select(Place, price_by_night=(100, None))
+        self.assertEqual(len(found), 2)
+        with self.assertRaises(ValueError):
+            storage.select(Place, name=1)
+
+    def test_search(self):
+        """Test search ranks saved and unsaved objects"""
+        quiet, clean = review("p1"), review("p2")
+        quiet.text, clean.text = "Quiet street", "Clean and quiet flat"
+        self.storage.new(quiet)
+        self.storage.save()
+        self.storage.new(clean)
+        self.assertEqual(list(self.storage.search(Review, "clean quiet")),
+                         [f"Review.{clean.id}", f"Review.{quiet.id}"])
+        self.assertEqual(list(self.reopen().search("Review", "street")),
+                         [f"Review.{quiet.id}"])
+        with self.assertRaises(ValueError):
+            self.storage.search("User", "bob")
+
+    def test_having(self):
+        """Test all and any of the values of a list attribute"""
+        from models.place import Place
+
+        now = datetime.now().isoformat()
+        for number, amenities in enumerate((["wifi", "pool"], ["wifi"])):
+            self.storage.new(Place(id=str(number), created_at=now,
+                                   updated_at=now, amenity_ids=amenities))
+        self.storage.save()
+        storage = self.reopen()
+        self.assertEqual(set(storage.having(Place, amenity_ids=["wifi",
+                                                                "pool"])),
+                         {"Place.0"})
+        self.assertEqual(len(storage.having(Place, "any",
+                                            amenity_ids=["pool", "wifi"])),
+                         2)
+        with self.assertRaises(ValueError):
+            storage.having(Place, name=["a"])
+
+    def test_aggregate(self):
+        """Test aggregations on saved and unsaved objects"""
+        from models.place import Place
+
+        now = datetime.now().isoformat()
+        for number, price in enumerate((50, "120", 70)):
+            self.storage.new(Place(id=str(number), created_at=now,
+                                   updated_at=now, price_by_night=price,
+                                   city_id="c{}".format(number % 2)))
+        self.storage.save()
+        storage = self.reopen()
+        result = storage.aggregate(Place, "avg(price_by_night)", "count",
+                                   by="city_id")
+        self.assertEqual(result, {
+            "c0": {"avg(price_by_night)": 60.0, "count": 2},
+            "c1": {"avg(price_by_night)": 120.0, "count": 1}})
+        with self.assertRaises(ValueError):
+            storage.aggregate(Place, "median(price_by_night)")
+
+    def test_all_classes(self):
+        """Test all without class returns every object"""
+        now = datetime.now().isoformat()
+        base = BaseModel(id="b", created_at=now, updated_at=now)
+        self.storage.new(base)
+        self.storage.new(review("p1"))
+        self.storage.save()
+        self.assertEqual(len(self.reopen().all()), 2)
+
+    def test_batch(self):
+        """Test a batch saves once and rolls back on error"""
+        import sqlite3
+
+        def rows():
+            """Count the saved reviews"""
+            connection = sqlite3.connect("test_db_storage.db")
+            count = connection.execute(
+                'SELECT COUNT(*) FROM "Review"').fetchone()[0]
+            connection.close()
+            return count
+
+        with self.storage.batch():
+            self.storage.new(review("p1"))
+            self.storage.save()
+            self.assertEqual(rows(), 0)
+        self.assertEqual(rows(), 1)
+        storage = DBStorage()
+        with self.assertRaises(KeyError):
+            with storage.batch():
+                storage.new(review("p2"))
+                raise KeyError
+        self.assertEqual(storage.count(Review), 1)
+        storage.save()
+        self.assertEqual(self.reopen().count(Review), 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
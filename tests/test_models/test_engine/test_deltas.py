@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""
+Test DeltaLog
+"""
+
+import glob
+import unittest
+
+from models.engine.deltas import DeltaLog
+from tests.helper import remove_file
+
+
+class TestDeltaLog(unittest.TestCase):
+    """Test DeltaLog Class"""
+
+    path = "test_deltas.json"
+
+    def setUp(self):
+        """Start without delta files"""
+        self.tearDown()
+        self.deltas = DeltaLog(self.path)
+
+    def tearDown(self):
+        """Remove the delta files"""
+        for path in glob.glob(self.path + ".*"):
+            remove_file(path)
+
+    def test_docstrings(self):
+        """Test docstrings"""
+        for method in (DeltaLog, DeltaLog.write, DeltaLog.replay,
+                       DeltaLog.checkpoint):
+            with self.subTest(method=method):
+                self.assertTrue(len(method.__doc__) > 10)
+
+    def test_write_and_replay(self):
+        """Test deltas are replayed in write order"""
+        self.assertEqual(self.deltas.write([("put", "A.1", "{}")]), 1)
+        self.assertEqual(self.deltas.write([]), 1)
+        self.deltas.write([("del", "A.1", None)])
+        expected = [("put", "A.1", {}), ("del", "A.1", None)]
+        self.assertEqual(list(self.deltas.replay()), expected)
+        self.assertEqual(list(DeltaLog(self.path).replay()), expected)
+        self.assertEqual(self.deltas.written, 2)
+
+    def test_checkpoint(self):
+        """Test folded deltas are removed and not replayed"""
+        self.deltas.write([("put", "A.1", "{}")])
+        self.deltas.write([("put", "A.2", "{}")])
+        self.deltas.checkpoint(1)
+        self.assertEqual(list(self.deltas.replay()), [("put", "A.2", {})])
+        reopened = DeltaLog(self.path)
+        self.assertEqual(reopened.folded, 1)
+        self.assertEqual(list(reopened.pending), [2])
+        self.assertEqual(reopened.write([("del", "A.2", None)]), 3)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -3,7 +3,9 @@
 Test File Storage
 """
 
+import os
 import unittest
+import unittest.mock
 
 from models.engine.file_storage import FileStorage
 from models.base_model import BaseModel
@@ -22,6 +24,7 @@ def tearDownModule():
     file = FileStorage._FileStorage__file_path
     if not DEBUG:
         remove_file(file)
+        remove_file(file + ".search")
     FileStorage._FileStorage__file_path = "storage_file.json"
 
 
@@ -84,9 +87,12 @@ class TestFileStorage(unittest.TestCase):
         self.assertIsInstance(obj._FileStorage__objects, dict)
 
     def test_empty_objects_when_init(self):
-        """Check if objects dict is empty when inti FileStorage"""
-        obj = FileStorage()
-        self.assertTrue(obj._FileStorage__objects, {})
+        """Check the file is not read when init FileStorage"""
+        with unittest.mock.patch.object(FileStorage,
+                                        "_FileStorage__read") as read:
+            obj = FileStorage()
+            read.assert_not_called()
+        self.assertIsInstance(obj._FileStorage__objects, dict)
 
     def test_all(self):
         """Test all"""
@@ -122,5 +128,1036 @@ class TestFileStorage(unittest.TestCase):
         self.assertIn(key, obj.all().keys())
 
 
+class TestFileStorageLazyLoad(unittest.TestCase):
+    """Test FileStorage loads the file on first access"""
+
+    def setUp(self):
+        """Save a user and a base model then forget them"""
+        from models.user import User
+
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.user, self.base = User(), BaseModel()
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__loaded = False
+        FileStorage._FileStorage__loaded_classes = set()
+
+    def tearDown(self):
+        """Leave the storage loaded"""
+        FileStorage._FileStorage__loaded = True
+        FileStorage._FileStorage__loaded_classes = set()
+
+    def test_nothing_loaded_before_access(self):
+        """Test the file is not read before the first access"""
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+        self.assertEqual(len(self.storage.all()), 2)
+        self.assertTrue(FileStorage._FileStorage__loaded)
+
+    def test_single_file_parsed_once(self):
+        """Test all(cls) then all() parse the single file once"""
+        from models.engine import file_storage
+
+        with unittest.mock.patch.object(
+                file_storage, "iter_items",
+                wraps=file_storage.iter_items) as items:
+            self.assertEqual(list(self.storage.all("User")),
+                             [f"User.{self.user.id}"])
+            self.assertEqual(len(self.storage.all()), 2)
+        self.assertEqual(items.call_count, 1)
+        self.assertTrue(FileStorage._FileStorage__loaded)
+
+    def test_full_load_keeps_loaded_classes(self):
+        """Test the full load does not reload loaded classes"""
+        user = self.storage.all("User")[f"User.{self.user.id}"]
+        user.first_name = "unsaved"
+        self.assertEqual(self.storage.count(), 2)
+        self.assertIs(self.storage.all()[f"User.{self.user.id}"], user)
+        self.assertEqual(user.first_name, "unsaved")
+
+
+class TestFileStorageClassIndex(unittest.TestCase):
+    """Test FileStorage per class index"""
+
+    def setUp(self):
+        """Start from an empty storage"""
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+
+    def test_all_with_class(self):
+        """Test all(cls) only returns the objects of cls"""
+        from models.user import User
+
+        user, base = User(), BaseModel()
+        self.assertEqual(self.storage.all(User), {f"User.{user.id}": user})
+        self.assertEqual(self.storage.all("BaseModel"),
+                         {f"BaseModel.{base.id}": base})
+        self.assertEqual(self.storage.all("Review"), {})
+
+    def test_count(self):
+        """Test count with and without class"""
+        from models.user import User
+
+        users = [User() for _ in range(3)]
+        BaseModel()
+        self.assertEqual(self.storage.count(), 4)
+        self.assertEqual(self.storage.count(User), 3)
+        self.storage.delete(users[0])
+        self.assertEqual(self.storage.count("User"), 2)
+
+    def test_index_follows_replaced_objects(self):
+        """Test the index is rebuilt when __objects is replaced"""
+        BaseModel()
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual(self.storage.count(BaseModel), 0)
+
+
+class TestFileStorageFind(unittest.TestCase):
+    """Test FileStorage secondary indexes"""
+
+    def setUp(self):
+        """Start from an empty storage"""
+        from models.review import Review
+
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.reviews = [Review(), Review(), Review()]
+        self.reviews[0].place_id = "p1"
+        self.reviews[1].place_id = "p1"
+        self.reviews[2].place_id = "p2"
+        self.reviews[1].user_id = "u1"
+
+    def keys(self, *reviews):
+        """Return the storage keys of reviews"""
+        return {f"Review.{review.id}" for review in reviews}
+
+    def test_get(self):
+        """Test get by class and id"""
+        from models.review import Review
+
+        review = self.reviews[0]
+        self.assertIs(self.storage.get(Review, review.id), review)
+        self.assertIs(self.storage.get("Review", review.id), review)
+        self.assertIsNone(self.storage.get("Review", "missing"))
+        self.assertIsNone(self.storage.get("Place", review.id))
+
+    def test_find_indexed_attribute(self):
+        """Test find on an indexed attribute"""
+        from models.review import Review
+
+        found = self.storage.find(Review, place_id="p1")
+        self.assertEqual(set(found), self.keys(*self.reviews[:2]))
+        self.assertEqual(self.storage.find("Review", place_id="p3"), {})
+
+    def test_find_many_attributes(self):
+        """Test find with indexed and plain attributes"""
+        self.reviews[0].text = "great"
+        found = self.storage.find("Review", place_id="p1", user_id="u1")
+        self.assertEqual(set(found), self.keys(self.reviews[1]))
+        found = self.storage.find("Review", place_id="p1", text="great")
+        self.assertEqual(set(found), self.keys(self.reviews[0]))
+
+    def test_index_follows_updates(self):
+        """Test the index is updated on change and delete"""
+        self.reviews[0].place_id = "p2"
+        self.storage.delete(self.reviews[2])
+        self.assertEqual(set(self.storage.find("Review", place_id="p2")),
+                         self.keys(self.reviews[0]))
+        self.assertEqual(set(self.storage.find("Review", place_id="p1")),
+                         self.keys(self.reviews[1]))
+
+    def test_index_rebuilt_on_reload(self):
+        """Test the index after a reload"""
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(len(self.storage.find("Review", place_id="p1")), 2)
+
+
+class TestFileStorageSelect(unittest.TestCase):
+    """Test FileStorage columnar side-store"""
+
+    def setUp(self):
+        """Start from an empty storage"""
+        from models.place import Place
+
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.places = [Place(), Place(), Place()]
+        for place, price, guests in zip(self.places, (50, 120, 80),
+                                        (2, 4, 6)):
+            place.price_by_night = price
+            place.max_guest = guests
+
+    def keys(self, *places):
+        """Return the storage keys of places"""
+        return {f"Place.{place.id}" for place in places}
+
+    def test_select(self):
+        """Test select on numeric ranges"""
+        from models.place import Place
+
+        found = self.storage.select(Place, price_by_night=(50, 100),
+                                    max_guest=(4, None))
+        self.assertEqual(set(found), self.keys(self.places[2]))
+        found = self.storage.select("Place", max_guest=4)
+        self.assertEqual(set(found), self.keys(self.places[1]))
+        self.assertEqual(self.storage.select("Review"), {})
+        with self.assertRaises(ValueError):
+            self.storage.select("Place", name=(1, 2))
+
+    def test_select_follows_updates(self):
+        """Test the side-store is updated on change and delete"""
+        self.places[0].price_by_night = 200
+        self.storage.delete(self.places[1])
+        found = self.storage.select("Place", price_by_night=(100, None))
+        self.assertEqual(set(found), self.keys(self.places[0]))
+
+    def test_select_after_rollback_and_reload(self):
+        """Test the side-store is rebuilt with the other indexes"""
+        self.storage.save()
+        self.storage.begin()
+        self.places[0].price_by_night = 500
+        self.storage.rollback()
+        found = self.storage.select("Place", price_by_night=(None, 60))
+        self.assertEqual(set(found), self.keys(self.places[0]))
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        found = self.storage.select("Place", max_guest=(3, None))
+        self.assertEqual(set(found), self.keys(*self.places[1:]))
+
+
+class TestFileStorageGeo(unittest.TestCase):
+    """Test FileStorage spatial index"""
+
+    def setUp(self):
+        """Start from an empty storage with three places"""
+        from models.place import Place
+
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.places = [Place(), Place(), Place()]
+        for place, (latitude, longitude) in zip(
+                self.places, ((48.8566, 2.3522), (48.8606, 2.3376),
+                              (51.5074, -0.1278))):
+            place.latitude = latitude
+            place.longitude = longitude
+
+    def keys(self, *places):
+        """Return the storage keys of places, in order"""
+        return [f"Place.{place.id}" for place in places]
+
+    def test_radius(self):
+        """Test radius returns the places nearest first"""
+        from models.place import Place
+
+        found = self.storage.radius(Place, 48.8584, 2.2945, 5)
+        self.assertEqual(list(found), self.keys(self.places[1],
+                                                self.places[0]))
+        self.assertEqual(len(self.storage.radius("Place", 50, 1, 500)), 3)
+
+    def test_bbox_and_nearest(self):
+        """Test bounding box and nearest queries"""
+        found = self.storage.bbox("Place", 48, 2, 49, 3)
+        self.assertEqual(set(found), set(self.keys(*self.places[:2])))
+        found = self.storage.nearest("Place", 51, 0, k=2)
+        self.assertEqual(list(found), self.keys(self.places[2],
+                                                self.places[1]))
+        with self.assertRaises(ValueError):
+            self.storage.nearest("Review", 0, 0)
+
+    def test_index_follows_updates(self):
+        """Test the spatial index on change, delete and reload"""
+        self.places[2].latitude = 48.85
+        self.places[2].longitude = 2.35
+        self.storage.delete(self.places[0])
+        found = self.storage.radius("Place", 48.8566, 2.3522, 5)
+        self.assertEqual(list(found), self.keys(self.places[2],
+                                                self.places[1]))
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(len(self.storage.bbox("Place", 48, 2, 49, 3)), 2)
+
+
+class TestFileStorageSearch(unittest.TestCase):
+    """Test FileStorage full-text index"""
+
+    def setUp(self):
+        """Start from an empty storage with three reviews"""
+        from models.review import Review
+
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.search_file = FileStorage._FileStorage__file_path + ".search"
+        self.reviews = [Review(), Review(), Review()]
+        for review, text in zip(self.reviews, ("Clean and quiet",
+                                               "Quiet but far",
+                                               "Great view")):
+            review.text = text
+
+    def tearDown(self):
+        """Remove the saved index"""
+        remove_file(self.search_file)
+
+    def keys(self, *reviews):
+        """Return the storage keys of reviews, in order"""
+        return [f"Review.{review.id}" for review in reviews]
+
+    def test_search(self):
+        """Test search ranks the matching objects"""
+        from models.review import Review
+
+        found = self.storage.search(Review, "clean quiet")
+        self.assertEqual(list(found), self.keys(*self.reviews[:2]))
+        self.assertEqual(list(self.storage.search("Review", "view")),
+                         self.keys(self.reviews[2]))
+        with self.assertRaises(ValueError):
+            self.storage.search("User", "view")
+
+    def test_index_follows_updates(self):
+        """Test the index on change and delete"""
+        self.reviews[2].text = "Quiet view"
+        self.storage.delete(self.reviews[0])
+        found = self.storage.search("Review", "quiet")
+        self.assertEqual(set(found), set(self.keys(*self.reviews[1:])))
+
+    def test_saved_index(self):
+        """Test the saved index is used instead of tokenizing again"""
+        from models.engine import text_index
+
+        self.storage.save()
+        self.assertTrue(os.path.isfile(self.search_file))
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__indexed = None
+        FileStorage._FileStorage__text_path = None
+        with unittest.mock.patch.object(text_index, "tokenize",
+                                        wraps=text_index.tokenize) as calls:
+            self.storage.reload()
+            found = self.storage.search("Review", "quiet")
+        self.assertEqual(calls.call_count, 1)
+        self.assertEqual(len(found), 2)
+
+    def test_saved_index_checked(self):
+        """Test objects changed or deleted since the index was saved"""
+        from models.review import Review
+
+        self.storage.save()
+        with open(self.search_file, "r") as file:
+            stale = file.read()
+        self.reviews[0].text = "Noisy"
+        self.storage.delete(self.reviews[1])
+        added = Review()
+        added.text = "Quiet again"
+        self.storage.save()
+        with open(self.search_file, "w") as file:
+            file.write(stale)
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__indexed = None
+        FileStorage._FileStorage__text_path = None
+        self.storage.reload()
+        found = self.storage.search("Review", "quiet noisy")
+        self.assertEqual(set(found), set(self.keys(self.reviews[0], added)))
+
+
+class TestFileStorageHaving(unittest.TestCase):
+    """Test FileStorage bitmap indexes"""
+
+    def setUp(self):
+        """Start from an empty storage"""
+        from models.place import Place
+
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.places = [Place(), Place(), Place()]
+        self.places[0].amenity_ids = ["wifi", "pool"]
+        self.places[1].amenity_ids = ["wifi"]
+        self.places[2].amenity_ids = ["pool", "parking"]
+
+    def keys(self, *places):
+        """Return the storage keys of places"""
+        return {f"Place.{place.id}" for place in places}
+
+    def test_having(self):
+        """Test all and any of the amenities"""
+        from models.place import Place
+
+        found = self.storage.having(Place, amenity_ids=["wifi", "pool"])
+        self.assertEqual(set(found), self.keys(self.places[0]))
+        found = self.storage.having("Place", "any",
+                                    amenity_ids=["wifi", "parking"])
+        self.assertEqual(set(found), self.keys(*self.places))
+        self.assertEqual(self.storage.having(Place, amenity_ids=["spa"]),
+                         {})
+        for args, values in ((("Place",), {"name": ["a"]}),
+                             (("Place", "some"), {"amenity_ids": ["a"]}),
+                             (("MyModel",), {})):
+            with self.assertRaises(ValueError):
+                self.storage.having(*args, **values)
+
+    def test_having_follows_updates(self):
+        """Test the bitmaps are updated on change and delete"""
+        self.places[1].amenity_ids = ["pool"]
+        self.storage.delete(self.places[0])
+        found = self.storage.having("Place", amenity_ids=["pool"])
+        self.assertEqual(set(found), self.keys(*self.places[1:]))
+        self.places[2].amenity_ids.append("wifi")
+        self.storage.mark_dirty(self.places[2], "amenity_ids")
+        found = self.storage.having("Place", amenity_ids=["wifi"])
+        self.assertEqual(set(found), self.keys(self.places[2]))
+
+    def test_having_after_append_and_save(self):
+        """Test a list changed in place is indexed by save"""
+        self.places[1].amenity_ids.append("parking")
+        self.places[1].save()
+        found = self.storage.having("Place", amenity_ids=["parking"])
+        self.assertEqual(set(found), self.keys(*self.places[1:]))
+
+    def test_having_after_reload(self):
+        """Test the bitmaps are rebuilt with the other indexes"""
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        found = self.storage.having("Place", amenity_ids=["pool"])
+        self.assertEqual(set(found), self.keys(self.places[0],
+                                               self.places[2]))
+
+
+class TestFileStorageAggregate(unittest.TestCase):
+    """Test FileStorage aggregations"""
+
+    def setUp(self):
+        """Start from an empty storage"""
+        from models.place import Place
+
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.places = [Place(), Place(), Place()]
+        for place, city, price in zip(self.places, ("a", "b", "a"),
+                                      (50, 120, 80)):
+            place.city_id = city
+            place.price_by_night = price
+
+    def test_aggregate(self):
+        """Test functions per group on the columnar side-store"""
+        from models.place import Place
+
+        result = self.storage.aggregate(Place, "avg(price_by_night)",
+                                        "count", by="city_id")
+        self.assertEqual(result, {
+            "a": {"avg(price_by_night)": 65.0, "count": 2},
+            "b": {"avg(price_by_night)": 120.0, "count": 1}})
+        self.assertEqual(self.storage.aggregate("Review", "count"),
+                         {None: {"count": 0}})
+        with self.assertRaises(ValueError):
+            self.storage.aggregate("MyModel", "count")
+
+    def test_aggregate_follows_updates(self):
+        """Test aggregations see changed and deleted objects"""
+        self.places[0].price_by_night = "100"
+        self.storage.delete(self.places[1])
+        result = self.storage.aggregate("Place", "max(price_by_night)",
+                                        "sum(number_rooms)")
+        self.assertEqual(result, {None: {"max(price_by_night)": 100.0,
+                                         "sum(number_rooms)": 0.0}})
+
+
+class TestFileStorageBatch(unittest.TestCase):
+    """Test FileStorage deferred saves"""
+
+    def setUp(self):
+        """Start from an empty storage"""
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.file = FileStorage._FileStorage__file_path
+        remove_file(self.file)
+
+    def tearDown(self):
+        """Stop deferring the saves"""
+        FileStorage._FileStorage__batch = None
+
+    def test_saves_once(self):
+        """Test the file is written once at the end of the block"""
+        with unittest.mock.patch.object(
+                FileStorage, "_FileStorage__write",
+                wraps=self.storage._FileStorage__write) as write:
+            with self.storage.batch():
+                for _ in range(10):
+                    BaseModel().save()
+                self.assertFalse(os.path.isfile(self.file))
+            self.assertEqual(write.call_count, 1)
+        self.assertEqual(self.storage.count(BaseModel), 10)
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(self.storage.count(BaseModel), 10)
+
+    def test_rollback_on_error(self):
+        """Test the changes are undone when the block raises"""
+        from models.review import Review
+
+        kept, removed = Review(), Review()
+        kept.place_id = "p1"
+        with self.assertRaises(KeyError):
+            with self.storage.batch():
+                BaseModel()
+                kept.place_id = "p2"
+                kept.text = "new"
+                self.storage.delete(removed)
+                raise KeyError
+        self.assertEqual(set(self.storage.all()),
+                         {f"Review.{kept.id}", f"Review.{removed.id}"})
+        self.assertEqual(kept.place_id, "p1")
+        self.assertFalse(hasattr(kept, "text") and "text" in kept.__dict__)
+        self.assertEqual(list(self.storage.find(Review, place_id="p1")),
+                         [f"Review.{kept.id}"])
+        self.assertFalse(os.path.isfile(self.file))
+
+    def test_nested_batches(self):
+        """Test nested blocks save with the outermost one"""
+        with self.storage.batch():
+            with self.storage.batch():
+                BaseModel().save()
+            self.assertFalse(os.path.isfile(self.file))
+        self.assertTrue(os.path.isfile(self.file))
+
+
+class TestFileStorageAsync(unittest.TestCase):
+    """Test FileStorage background writes"""
+
+    def setUp(self):
+        """Enable the background writes on an empty storage"""
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.storage.enable_async(0.05)
+        self.file = FileStorage._FileStorage__file_path
+        remove_file(self.file)
+
+    def tearDown(self):
+        """Go back to synchronous writes"""
+        self.storage.flush()
+        FileStorage._FileStorage__window = 0
+
+    def test_save_does_not_write(self):
+        """Test save returns before the file is written"""
+        base = BaseModel()
+        base.save()
+        self.assertFalse(os.path.isfile(self.file))
+        self.storage.flush()
+        with open(self.file, "r") as file:
+            self.assertIn(base.id, file.read())
+
+    def test_saves_are_grouped(self):
+        """Test the saves of a window are written once"""
+        import time
+
+        with unittest.mock.patch.object(
+                FileStorage, "_FileStorage__write",
+                wraps=self.storage._FileStorage__write) as write:
+            for _ in range(20):
+                BaseModel().save()
+            time.sleep(0.3)
+            self.assertEqual(write.call_count, 1)
+        self.assertTrue(os.path.isfile(self.file))
+
+    def test_batch_is_not_flushed(self):
+        """Test the thread does not write a batch rolled back later"""
+        import json
+        import time
+
+        base, other = BaseModel(), BaseModel()
+        base.name = "saved"
+        base.save()
+        self.storage.flush()
+        other.name = "pending"
+        other.save()
+        self.storage.begin()
+        base.name = "rolled back"
+        time.sleep(0.2)
+        self.storage.rollback()
+        other.save()
+        self.storage.flush()
+        self.assertEqual(base.name, "saved")
+        with open(self.file, "r") as file:
+            saved = json.load(file)[f"BaseModel.{base.id}"]
+        self.assertEqual(saved["name"], "saved")
+
+    def test_flush_raises_background_error(self):
+        """Test a failed background write is reported by flush"""
+        import time
+
+        with unittest.mock.patch.object(FileStorage, "_FileStorage__write",
+                                        side_effect=OSError("disk full")):
+            BaseModel().save()
+            time.sleep(0.3)
+        with self.assertRaises(OSError):
+            self.storage.flush()
+
+    def test_failed_write_is_retried(self):
+        """Test the objects of a failed write are written by the next"""
+        base = BaseModel()
+        base.save()
+        with unittest.mock.patch.object(FileStorage, "_FileStorage__write",
+                                        side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.storage.flush()
+        self.storage.flush()
+        with open(self.file, "r") as file:
+            self.assertIn(base.id, file.read())
+
+    def test_write_does_not_block_changes(self):
+        """Test objects can be changed while the thread writes"""
+        import threading
+
+        base = BaseModel()
+        base.save()
+        changed = threading.Event()
+        write = self.storage._FileStorage__write
+
+        def slow_write(path, payloads):
+            thread = threading.Thread(
+                target=lambda: (setattr(base, "name", "y"), changed.set()))
+            thread.start()
+            thread.join(1)
+            write(path, payloads)
+
+        with unittest.mock.patch.object(FileStorage, "_FileStorage__write",
+                                        side_effect=slow_write):
+            self.storage.flush()
+        self.assertTrue(changed.is_set())
+        self.assertIn(f"BaseModel.{base.id}",
+                      FileStorage._FileStorage__dirty)
+
+
+class TestFileStorageDurability(unittest.TestCase):
+    """Test FileStorage atomic writes and durability policies"""
+
+    def setUp(self):
+        """Start from an empty storage"""
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.file = FileStorage._FileStorage__file_path
+
+    def tearDown(self):
+        """Go back to the default policy"""
+        self.storage.set_durability("none")
+
+    def test_failed_write_keeps_file(self):
+        """Test a crash during a write leaves the previous file"""
+        base = BaseModel()
+        self.storage.save()
+        with open(self.file, "r") as file:
+            content = file.read()
+        base.name = "crash"
+        with unittest.mock.patch.object(BaseModel, "to_dict",
+                                        side_effect=MemoryError):
+            with self.assertRaises(MemoryError):
+                self.storage.save()
+        with open(self.file, "r") as file:
+            self.assertEqual(file.read(), content)
+        remove_file(self.file + ".tmp")
+
+    def test_policies(self):
+        """Test the number of fsync of each policy"""
+        expected = {"none": 0, "file": 1, "dir": 2, "interval": 2}
+        for policy, calls in expected.items():
+            with self.subTest(policy=policy):
+                self.storage.set_durability(policy, interval=60)
+                FileStorage._FileStorage__synced = float("-inf")
+                BaseModel()
+                with unittest.mock.patch("os.fsync") as fsync:
+                    self.storage.save()
+                    self.assertEqual(fsync.call_count, calls)
+                    BaseModel()
+                    self.storage.save()
+                    if policy == "interval":
+                        self.assertEqual(fsync.call_count, calls)
+
+    def test_interval_syncs_last_writes(self):
+        """Test the writes skipped by interval are synced once it expires"""
+        import time
+
+        self.storage.set_durability("interval", interval=0.1)
+        FileStorage._FileStorage__synced = float("-inf")
+        BaseModel()
+        self.storage.save()
+        with unittest.mock.patch("os.fsync") as fsync:
+            BaseModel()
+            self.storage.save()
+            self.assertEqual(fsync.call_count, 0)
+            time.sleep(0.3)
+            self.assertEqual(fsync.call_count, 2)
+        self.assertEqual(FileStorage._FileStorage__unsynced, set())
+
+    def test_unknown_policy(self):
+        """Test an unknown policy raises ValueError"""
+        with self.assertRaises(ValueError):
+            self.storage.set_durability("always")
+
+
+class TestFileStorageDirty(unittest.TestCase):
+    """Test FileStorage dirty tracking"""
+
+    def setUp(self):
+        """Start from an empty storage"""
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+
+    def test_setattr_marks_dirty(self):
+        """Test attribute changes flag the object"""
+        base = BaseModel()
+        self.storage.save()
+        self.assertEqual(FileStorage._FileStorage__dirty, {})
+        base.name = "dirty"
+        self.assertIn(f"BaseModel.{base.id}", FileStorage._FileStorage__dirty)
+
+    def test_clean_objects_are_not_encoded(self):
+        """Test save reuses the cached encoding of clean objects"""
+        clean, changed = BaseModel(), BaseModel()
+        self.storage.save()
+        calls = []
+        to_dict = BaseModel.to_dict
+
+        def counting_to_dict(obj):
+            calls.append(obj.id)
+            return to_dict(obj)
+
+        changed.name = "changed"
+        with unittest.mock.patch.object(BaseModel, "to_dict",
+                                        counting_to_dict):
+            self.storage.save()
+        self.assertEqual(calls, [changed.id])
+
+    def test_output_matches_json_dump(self):
+        """Test the file is byte compatible with json.dump"""
+        import json
+
+        base = BaseModel()
+        base.name = "cached"
+        self.storage.save()
+        expected = json.dumps({key: obj.to_dict() for key, obj
+                               in self.storage.all().items()})
+        with open(FileStorage._FileStorage__file_path, "r") as file:
+            self.assertEqual(file.read(), expected)
+
+    def test_empty_output_matches_json_dump(self):
+        """Test an empty storage is written as json.dump writes it"""
+        self.storage.save()
+        with open(FileStorage._FileStorage__file_path, "r") as file:
+            self.assertEqual(file.read(), "{}")
+
+    def test_save_streams_entries(self):
+        """Test save writes the entries one by one"""
+        import builtins
+
+        for _ in range(50):
+            BaseModel()
+        writes = []
+        real_open = builtins.open
+
+        def recording_open(*args, **kwargs):
+            file = real_open(*args, **kwargs)
+            write = file.write
+            file.write = lambda data: writes.append(len(data)) or write(data)
+            return file
+
+        with unittest.mock.patch("builtins.open", recording_open):
+            self.storage.save()
+        with open(FileStorage._FileStorage__file_path, "r") as file:
+            size = len(file.read())
+        self.assertEqual(sum(writes), size)
+        self.assertLess(max(writes), size // 10)
+
+
+class TestFileStorageJournal(unittest.TestCase):
+    """Test FileStorage journal mode"""
+
+    def setUp(self):
+        """Enable the journal on an empty storage"""
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.storage.enable_journal(limit=5)
+        self.file = FileStorage._FileStorage__file_path
+        self.journal = self.file + ".journal"
+        remove_file(self.file)
+        remove_file(self.journal)
+
+    def tearDown(self):
+        """Disable the journal"""
+        FileStorage._FileStorage__journal = None
+        FileStorage._FileStorage__objects = {}
+        remove_file(self.journal)
+
+    def test_save_appends_changes(self):
+        """Test save only writes to the journal"""
+        base = BaseModel()
+        self.storage.save()
+        with open(self.journal, "r") as file:
+            self.assertIn(base.id, file.read())
+        self.assertFalse(os.path.isfile(self.file))
+
+    def test_reload_replays_journal(self):
+        """Test reload applies put and delete records"""
+        kept, removed = BaseModel(), BaseModel()
+        self.storage.save()
+        kept.name = "kept"
+        kept.save()
+        self.storage.delete(removed)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        objects = self.storage.all()
+        self.assertEqual(objects[f"BaseModel.{kept.id}"].name, "kept")
+        self.assertNotIn(f"BaseModel.{removed.id}", objects)
+
+    def test_journal_is_folded_into_file(self):
+        """Test the journal is compacted past its limit"""
+        for _ in range(6):
+            BaseModel()
+        self.storage.save()
+        self.assertTrue(os.path.isfile(self.file))
+        self.assertFalse(os.path.isfile(self.journal))
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(len(self.storage.all()), 6)
+
+
+class TestFileStorageDeltas(unittest.TestCase):
+    """Test FileStorage delta files"""
+
+    def setUp(self):
+        """Enable the delta files on an empty storage"""
+        import glob
+
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.file = FileStorage._FileStorage__file_path
+        for path in glob.glob(self.file + "*"):
+            remove_file(path)
+        self.storage.enable_deltas(deltas=3, size=1 << 30, ratio=1000)
+
+    def tearDown(self):
+        """Disable the delta files"""
+        import glob
+
+        FileStorage._FileStorage__deltas = None
+        FileStorage._FileStorage__objects = {}
+        for path in glob.glob(self.file + ".*"):
+            remove_file(path)
+
+    def test_save_writes_delta(self):
+        """Test save writes a delta file and no snapshot"""
+        base = BaseModel()
+        self.storage.save()
+        self.assertFalse(os.path.isfile(self.file))
+        with open(self.file + ".delta.0000000001", "r") as file:
+            self.assertIn(base.id, file.read())
+        self.assertEqual(self.storage.stats()["deltas"], 1)
+
+    def test_compact_and_reload(self):
+        """Test reload reads the snapshot and the later deltas"""
+        kept, removed = BaseModel(), BaseModel()
+        self.storage.save()
+        self.assertTrue(self.storage.compact())
+        self.assertFalse(self.storage.compact())
+        kept.name = "after"
+        kept.save()
+        self.storage.delete(removed)
+        self.storage.save()
+        stats = self.storage.stats()
+        self.assertEqual((stats["deltas"], stats["compactions"]), (2, 1))
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(list(self.storage.all()), [f"BaseModel.{kept.id}"])
+        self.assertEqual(self.storage.all()[f"BaseModel.{kept.id}"].name,
+                         "after")
+
+    def test_background_compaction(self):
+        """Test the compactor folds the deltas past the threshold"""
+        import time
+
+        for _ in range(5):
+            BaseModel().save()
+        for _ in range(50):
+            if self.storage.stats()["compactions"]:
+                break
+            time.sleep(0.02)
+        self.assertEqual(self.storage.stats()["compactions"], 1)
+        self.assertTrue(os.path.isfile(self.file))
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(self.storage.count(), 5)
+
+
+class TestFileStorageShards(unittest.TestCase):
+    """Test FileStorage per class files"""
+
+    def setUp(self):
+        """Enable the per class files on an empty storage"""
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__dirty = {}
+        self.storage = FileStorage()
+        self.remove_files()
+        self.storage.enable_shards(2)
+        self.shards = [f"test_file_storage.{cls}.json"
+                       for cls in ("BaseModel", "User")]
+
+    def tearDown(self):
+        """Go back to a single file"""
+        FileStorage._FileStorage__shards = 0
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__dirty = {}
+        self.remove_files()
+
+    def remove_files(self):
+        """Remove the single file and every class file"""
+        import glob
+
+        remove_file("test_file_storage.json")
+        for path in glob.glob("test_file_storage.*.json"):
+            remove_file(path)
+
+    def test_one_file_per_class(self):
+        """Test save writes one file per class and reload reads them"""
+        from models.user import User
+
+        user, base = User(), BaseModel()
+        self.storage.save()
+        for path, obj in zip(self.shards, (base, user)):
+            with open(path, "r") as file:
+                self.assertIn(obj.id, file.read())
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(set(self.storage.all()),
+                         {f"User.{user.id}", f"BaseModel.{base.id}"})
+
+    def test_save_only_changed_classes(self):
+        """Test save does not rewrite the files of clean classes"""
+        from models.user import User
+
+        user = User()
+        BaseModel()
+        self.storage.save()
+        mtime = os.stat(self.shards[0]).st_mtime_ns
+        os.utime(self.shards[0], ns=(mtime - 10 ** 9, mtime - 10 ** 9))
+        user.save()
+        self.assertEqual(os.stat(self.shards[0]).st_mtime_ns,
+                         mtime - 10 ** 9)
+
+    def test_load_requested_class_only(self):
+        """Test all(cls) only loads the file of cls"""
+        from models.user import User
+
+        user = User()
+        BaseModel()
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__loaded = False
+        FileStorage._FileStorage__loaded_classes = set()
+        try:
+            self.assertEqual(list(self.storage.all("User")),
+                             [f"User.{user.id}"])
+            self.assertEqual(len(FileStorage._FileStorage__objects), 1)
+            self.assertFalse(FileStorage._FileStorage__loaded)
+        finally:
+            FileStorage._FileStorage__loaded = True
+            FileStorage._FileStorage__loaded_classes = set()
+
+    def test_migrate_single_file(self):
+        """Test objects of the single file are moved to class files"""
+        FileStorage._FileStorage__shards = 0
+        base = BaseModel()
+        self.storage.save()
+        self.storage.enable_shards(1)
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertIn(f"BaseModel.{base.id}", self.storage.all())
+        self.storage.save()
+        with open(self.shards[0], "r") as file:
+            self.assertIn(base.id, file.read())
+        self.assertFalse(os.path.isfile("test_file_storage.json"))
+
+    def test_single_file_wins_over_stray_class_file(self):
+        """Test a class file does not hide the single file"""
+        FileStorage._FileStorage__shards = 0
+        BaseModel()
+        self.storage.save()
+        with open("test_file_storage.Place.json", "w") as file:
+            file.write("{}")
+        self.storage.enable_shards(1)
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(self.storage.count(), 1)
+
+    def test_crash_during_migration(self):
+        """Test a migration stopped halfway loses no object"""
+        from models.user import User
+
+        FileStorage._FileStorage__shards = 0
+        user, base = User(), BaseModel()
+        self.storage.save()
+        self.storage.enable_shards(1)
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        write = self.storage._FileStorage__write
+        calls = []
+
+        def crash(path, payloads):
+            if calls:
+                raise OSError("crash")
+            calls.append(path)
+            write(path, payloads)
+
+        with unittest.mock.patch.object(FileStorage, "_FileStorage__write",
+                                        side_effect=crash):
+            with self.assertRaises(OSError):
+                self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(set(self.storage.all()),
+                         {f"User.{user.id}", f"BaseModel.{base.id}"})
+
+
+class TestFileStorageBinary(unittest.TestCase):
+    """Test FileStorage binary format"""
+
+    def setUp(self):
+        """Enable the binary format on an empty storage"""
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.storage.enable_binary()
+        self.path = "test_file_storage.hbnb"
+        remove_file(self.path)
+
+    def tearDown(self):
+        """Go back to JSON"""
+        FileStorage._FileStorage__binary = False
+        FileStorage._FileStorage__objects = {}
+        remove_file(self.path)
+
+    def test_save_and_reload(self):
+        """Test objects round trip through the binary file"""
+        base = BaseModel()
+        base.name = "binary"
+        self.storage.save()
+        with open(self.path, "rb") as file:
+            self.assertTrue(file.read().startswith(b"HBNB"))
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        loaded = self.storage.all()[f"BaseModel.{base.id}"]
+        self.assertEqual(loaded.to_dict(), base.to_dict())
+
+    def test_migrate_json_file(self):
+        """Test the JSON file is read when no binary file exists"""
+        FileStorage._FileStorage__binary = False
+        base = BaseModel()
+        self.storage.save()
+        self.storage.enable_binary()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertIn(f"BaseModel.{base.id}", self.storage.all())
+        self.storage.save()
+        self.assertTrue(os.path.isfile(self.path))
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
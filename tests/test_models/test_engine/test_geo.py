@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+"""
+Test GeoIndex
+"""
+
+import random
+import unittest
+
+from models.engine.geo import GeoIndex, distance
+
+
+class TestGeoIndex(unittest.TestCase):
+    """Test GeoIndex Class"""
+
+    def setUp(self):
+        """Provide an index of random points and their brute force copy"""
+        rand = random.Random(1)
+        self.index = GeoIndex()
+        self.points = {}
+        for key in range(3000):
+            point = (rand.uniform(-90, 90), rand.uniform(-180, 180))
+            self.points[key] = point
+            self.index.put(key, *point)
+        self.queries = [(rand.uniform(-90, 90), rand.uniform(-180, 180))
+                        for _ in range(30)] + [(89.99, 0), (0, 179.99)]
+
+    def scan(self, latitude, longitude):
+        """Return every (distance, key) pair, nearest first"""
+        return sorted((distance(latitude, longitude, *point), key)
+                      for key, point in self.points.items())
+
+    def test_docstrings(self):
+        """Test docstrings"""
+        for method in (GeoIndex, GeoIndex.put, GeoIndex.remove,
+                       GeoIndex.bbox, GeoIndex.radius, GeoIndex.nearest,
+                       distance):
+            with self.subTest(method=method):
+                self.assertTrue(len(method.__doc__) > 10)
+
+    def test_distance(self):
+        """Test the great-circle distance"""
+        self.assertAlmostEqual(distance(0, 0, 0, 1), 111.195, places=3)
+        self.assertAlmostEqual(distance(48.8566, 2.3522, 51.5074, -0.1278),
+                               343.5, delta=0.5)
+
+    def test_radius(self):
+        """Test radius matches a full scan"""
+        for (latitude, longitude), km in zip(self.queries,
+                                             [10, 300, 1500, 8000] * 8):
+            with self.subTest(latitude=latitude, longitude=longitude, km=km):
+                expected = [pair for pair in self.scan(latitude, longitude)
+                            if pair[0] <= km]
+                self.assertEqual(self.index.radius(latitude, longitude, km),
+                                 expected)
+
+    def test_nearest(self):
+        """Test nearest matches a full scan"""
+        for (latitude, longitude), k in zip(self.queries, [1, 5, 40] * 11):
+            with self.subTest(latitude=latitude, longitude=longitude, k=k):
+                self.assertEqual(self.index.nearest(latitude, longitude, k),
+                                 self.scan(latitude, longitude)[:k])
+        self.assertEqual(self.index.nearest(0, 0, 0), [])
+        self.assertEqual(GeoIndex().nearest(0, 0, 3), [])
+
+    def test_nearest_far_from_points(self):
+        """Test nearest far from clustered points visits few cells"""
+        import unittest.mock
+
+        rand = random.Random(2)
+        index, points = GeoIndex(), {}
+        centers = [(rand.uniform(-40, 40), rand.uniform(-180, 180))
+                   for _ in range(50)]
+        for key in range(2000):
+            latitude, longitude = centers[key % 50]
+            point = (rand.gauss(latitude, 0.2), rand.gauss(longitude, 0.2))
+            points[key] = point
+            index.put(key, *point)
+        ring = index._GeoIndex__ring
+        cells = []
+
+        def counted(*args):
+            """Count the cells of the rings searched"""
+            found = list(ring(*args))
+            cells.extend(found)
+            return found
+
+        for latitude, longitude in ((89.5, 0), (-80, -150), centers[0]):
+            with self.subTest(latitude=latitude, longitude=longitude):
+                cells.clear()
+                with unittest.mock.patch.object(
+                        index, "_GeoIndex__ring", side_effect=counted):
+                    found = index.nearest(latitude, longitude, 5)
+                self.assertEqual(found, sorted(
+                    (distance(latitude, longitude, *point), key)
+                    for key, point in points.items())[:5])
+                self.assertLessEqual(len(cells), len(points))
+
+    def test_bbox(self):
+        """Test bounding boxes, across the antimeridian too"""
+        for south, west, north, east in ((10, 20, 40, 80),
+                                         (-30, 150, 30, -150),
+                                         (-90, -180, 90, 180)):
+            width = (east - west) % 360 or 360
+            expected = {key for key, (lat, lon) in self.points.items()
+                        if south <= lat <= north and
+                        (lon - west) % 360 <= width}
+            self.assertEqual(set(self.index.bbox(south, west, north, east)),
+                             expected)
+
+    def test_put_and_remove(self):
+        """Test points are moved, removed and invalid ones ignored"""
+        index = GeoIndex()
+        index.put("a", 10, 10)
+        index.put("a", 20, 20)
+        index.put("b", "north", 0)
+        index.put("c", 95, 0)
+        self.assertEqual(index.points, {"a": (20.0, 20.0)})
+        self.assertEqual(index.bbox(9, 9, 11, 11), [])
+        index.remove("a")
+        index.remove("missing")
+        self.assertEqual((index.points, index.buckets), ({}, {}))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
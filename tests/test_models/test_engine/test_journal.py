@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+"""
+Test Journal
+"""
+
+import unittest
+
+from models.engine.journal import Journal
+from tests.helper import remove_file, DEBUG
+
+
+class TestJournal(unittest.TestCase):
+    """Test Journal Class"""
+
+    def setUp(self):
+        """Provide an empty journal"""
+        self.path = "test_journal.journal"
+        remove_file(self.path)
+        self.journal = Journal(self.path)
+
+    def tearDown(self):
+        """Remove the journal file"""
+        if not DEBUG:
+            remove_file(self.path)
+
+    def test_docstrings(self):
+        """Test docstrings"""
+        for method in (Journal, Journal.append, Journal.replay,
+                       Journal.truncate):
+            with self.subTest(method=method):
+                self.assertTrue(len(method.__doc__) > 10)
+
+    def test_empty_journal(self):
+        """Test replay of a missing file"""
+        self.assertEqual(list(self.journal.replay()), [])
+        self.assertEqual(self.journal.records, 0)
+
+    def test_append_and_replay(self):
+        """Test records are replayed in write order"""
+        self.journal.append([("put", "User.1", '{"id": "1"}'),
+                             ("del", "User.2", None)])
+        self.journal.append([("put", "User.1", '{"id": "1", "a": 2}')])
+        self.assertEqual(list(self.journal.replay()), [
+            ("put", "User.1", {"id": "1"}),
+            ("del", "User.2", None),
+            ("put", "User.1", {"id": "1", "a": 2}),
+        ])
+        self.assertEqual(self.journal.records, 3)
+        self.assertEqual(Journal(self.path).records, 3)
+
+    def test_torn_last_record(self):
+        """Test a partially written record is ignored"""
+        self.journal.append([("put", "User.1", '{"id": "1"}')])
+        with open(self.path, "a") as file:
+            file.write('{"op": "put", "key": "Us')
+        self.assertEqual(list(self.journal.replay()),
+                         [("put", "User.1", {"id": "1"})])
+
+    def test_append_after_torn_record(self):
+        """Test records appended after a torn record are kept"""
+        self.journal.append([("put", "User.1", '{"id": "1"}')])
+        with open(self.path, "a") as file:
+            file.write('{"op": "put", "key": "Us')
+        self.journal.append([("put", "User.3", '{"id": "3"}')])
+        Journal(self.path).append([("del", "User.1", None)])
+        self.assertEqual(list(Journal(self.path).replay()), [
+            ("put", "User.1", {"id": "1"}),
+            ("put", "User.3", {"id": "3"}),
+            ("del", "User.1", None),
+        ])
+
+    def test_truncate(self):
+        """Test truncate empties the journal"""
+        self.journal.append([("del", "User.1", None)])
+        self.journal.truncate()
+        self.assertEqual(list(self.journal.replay()), [])
+        self.assertEqual(self.journal.records, 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+"""
+Test json_stream
+"""
+
+import io
+import json
+import unittest
+
+from models.engine.json_stream import iter_items
+
+
+class TestIterItems(unittest.TestCase):
+    """Test iter_items function"""
+
+    def items(self, text, chunk_size=3):
+        """Return the streamed items of text as a list"""
+        return list(iter_items(io.StringIO(text), chunk_size))
+
+    def test_docstring(self):
+        """Test docstring"""
+        self.assertTrue(len(iter_items.__doc__) > 10)
+
+    def test_empty_documents(self):
+        """Test empty file and empty object"""
+        self.assertEqual(self.items(""), [])
+        self.assertEqual(self.items(" { } "), [])
+
+    def test_matches_json_load(self):
+        """Test every chunk size gives the json.load result"""
+        data = {
+            "User.1": {"id": "1", "name": 'a "quoted" }, value'},
+            "Place.2": {"id": "2", "amenity_ids": [1, 2], "price": 10.5},
+            "State.3": {},
+        }
+        text = json.dumps(data)
+        for chunk_size in (1, 2, 7, 64, 65536):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.items(text, chunk_size),
+                                 list(data.items()))
+
+    def test_large_value_decoded_few_times(self):
+        """Test a value much larger than a chunk is not decoded per chunk"""
+        import unittest.mock
+        from models.engine import json_stream
+
+        text = json.dumps({"a": "x" * 100000, "b": 1})
+        with unittest.mock.patch.object(
+                json_stream, "_decoder",
+                wraps=json_stream._decoder) as decoder:
+            self.assertEqual(self.items(text, 16),
+                             [("a", "x" * 100000), ("b", 1)])
+        self.assertLess(decoder.raw_decode.call_count, 40)
+
+    def test_invalid_document(self):
+        """Test truncated and malformed documents raise ValueError"""
+        for text in ('{"a": {"b": 1}', '["a"]', '{"a" 1}'):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    self.items(text)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+"""
+Test Query
+"""
+
+import unittest
+import uuid
+
+from models import storage
+from models.engine.query import Query
+from models.place import Place
+
+
+class TestQuery(unittest.TestCase):
+    """Test Query Class"""
+
+    def setUp(self):
+        """Provide places of a city of their own"""
+        self.city = str(uuid.uuid4())
+        self.places = []
+        for number in range(6):
+            place = Place()
+            place.city_id = self.city
+            place.name = "place {}".format(number)
+            place.price_by_night = number * 30
+            place.max_guest = number % 3
+            self.places.append(place)
+        self.places[5].max_guest = "2"
+
+    def tearDown(self):
+        """Remove the places from the storage"""
+        for place in self.places:
+            storage.delete(place)
+
+    def run_query(self, text):
+        """Return the names of the places of the city matching text"""
+        return [place.name for place in Query.parse(text).run(storage)
+                if place.city_id == self.city]
+
+    def test_docstrings(self):
+        """Test docstrings"""
+        for method in (Query, Query.parse, Query.plan, Query.run):
+            with self.subTest(method=method):
+                self.assertTrue(len(method.__doc__) > 10)
+
+    def test_parse(self):
+        """Test every call of the query language is parsed"""
+        query = Query.parse(
+            'Place.where(price_by_night < 100, name != "a b")'
+            '.where(max_guest>=2).order_by(price_by_night desc, -name)'
+            '.offset(1).limit(20).fields(name, price_by_night)')
+        self.assertEqual("Place", query.cls)
+        self.assertEqual([("price_by_night", "<", 100),
+                          ("name", "!=", "a b"), ("max_guest", ">=", 2)],
+                         query.conditions)
+        self.assertEqual([("price_by_night", True), ("name", True)],
+                         query.order)
+        self.assertEqual((1, 20), (query.offset, query.limit))
+        self.assertEqual(["name", "price_by_night"], query.fields)
+        self.assertEqual("count", Query.parse("Place.count()").action)
+
+    def test_parse_errors(self):
+        """Test invalid queries raise ValueError"""
+        for text in ("", ".where(a<1)", "Place.where(", "Place.where(a)",
+                     "Place.where(a<1,)", "Place.limit(a)", "Place.limit(-1)",
+                     "Place.order_by(1)", "Place.count(1)", "Place.foo()",
+                     "Place x", "Place.where(a ~ 1)",
+                     "Place.where(price_by_night<abc)"):
+            with self.subTest(text=text):
+                self.assertRaises(ValueError, Query.parse, text)
+
+    def test_plan(self):
+        """Test the plan lists the index, column and filter steps"""
+        query = Query.parse('Place.where(city_id == "c", max_guest >= 2, '
+                            'price_by_night < 100, name != "a")'
+                            '.order_by(name).limit(5)')
+        self.assertEqual(["index lookup city_id == 'c'",
+                          "column ranges max_guest in [2.0, None], "
+                          "price_by_night in [None, 100.0]",
+                          "filter price_by_night < 100, name != 'a'",
+                          "top 5 name", "offset 0 limit 5"], query.plan())
+        self.assertEqual(["scan Place"], Query.parse("Place").plan())
+        self.assertRaises(ValueError, Query.parse("MyModel").plan)
+
+    def test_where(self):
+        """Test conditions on indexes, columns and other attributes"""
+        where = 'Place.where(city_id == "{}", '.format(self.city)
+        self.assertEqual(["place 2", "place 5"], self.run_query(
+            where + "max_guest >= 2)"))
+        self.assertEqual(["place 0", "place 1", "place 2"], self.run_query(
+            where + "price_by_night < 90)"))
+        self.assertEqual(["place 3"], self.run_query(
+            where + "price_by_night == 90)"))
+        self.assertEqual(["place 4"], self.run_query(
+            where + 'name = "place 4")'))
+        self.assertEqual(["place 1", "place 4"], self.run_query(
+            where + "max_guest > 0, max_guest < 2)"))
+
+    def test_scan_and_ranges_without_index(self):
+        """Test queries without an index lookup"""
+        self.assertEqual(["place 5"], self.run_query(
+            "Place.where(price_by_night > 120, max_guest = 2)"))
+        self.assertEqual(["place 0"], self.run_query(
+            'Place.where(name == "place 0")'))
+
+    def test_order_and_paginate(self):
+        """Test order_by, offset and limit"""
+        where = 'Place.where(city_id == "{}")'.format(self.city)
+        self.assertEqual(["place 5", "place 4", "place 3"], self.run_query(
+            where + ".order_by(price_by_night desc).limit(3)"))
+        self.assertEqual(["place 1", "place 2"], self.run_query(
+            where + ".order_by(price_by_night).offset(1).limit(2)"))
+        self.assertEqual(["place 2", "place 5", "place 1", "place 4",
+                          "place 0", "place 3"], self.run_query(
+            where + ".order_by(-max_guest, name)"))
+        self.assertEqual(2, len(self.run_query(where + ".limit(2)")))
+        self.assertEqual([], self.run_query(where + ".limit(0)"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""
+Test TextIndex
+"""
+
+import json
+import unittest
+
+from models.engine.text_index import TextIndex, tokenize
+
+
+class TestTextIndex(unittest.TestCase):
+    """Test TextIndex Class"""
+
+    def setUp(self):
+        """Provide an index of three documents"""
+        self.index = TextIndex()
+        self.index.put("a", "Clean and quiet, very clean!")
+        self.index.put("b", "Quiet street but noisy neighbours")
+        self.index.put("c", "Great view")
+
+    def test_docstrings(self):
+        """Test docstrings"""
+        for method in (TextIndex, TextIndex.put, TextIndex.remove,
+                       TextIndex.search, TextIndex.dump, TextIndex.load,
+                       tokenize):
+            with self.subTest(method=method):
+                self.assertTrue(len(method.__doc__) > 10)
+
+    def test_tokenize(self):
+        """Test words are lowercased and split on punctuation"""
+        self.assertEqual(tokenize("Très CLEAN, quiet-ish!"),
+                         ["très", "clean", "quiet", "ish"])
+
+    def test_search_ranked(self):
+        """Test documents matching more and rarer words rank first"""
+        ranked = [key for _, key in self.index.search("clean quiet")]
+        self.assertEqual(ranked, ["a", "b"])
+        self.assertEqual(self.index.search("QUIET", limit=1)[0][1], "a")
+        self.assertEqual(self.index.search("pool"), [])
+        self.assertEqual(TextIndex().search("quiet"), [])
+
+    def test_put_and_remove(self):
+        """Test documents are replaced and removed"""
+        self.index.put("c", "Quiet view")
+        self.assertEqual({key for _, key in self.index.search("quiet")},
+                         {"a", "b", "c"})
+        self.assertEqual(self.index.search("great"), [])
+        self.index.remove("a")
+        self.index.remove("missing")
+        self.assertNotIn("clean", self.index.postings)
+        self.assertEqual(self.index.words, 7)
+
+    def test_changed(self):
+        """Test the same text is not indexed again"""
+        self.index.changed = False
+        self.index.put("a", "Clean and quiet, very clean!")
+        self.assertFalse(self.index.changed)
+        self.index.put("a", "Clean")
+        self.assertTrue(self.index.changed)
+
+    def test_dump_and_load(self):
+        """Test an index survives a JSON round trip"""
+        data = json.loads(json.dumps(self.index.dump()))
+        index = TextIndex.load(data)
+        self.assertEqual(index.search("clean quiet"),
+                         self.index.search("clean quiet"))
+        self.assertEqual(index.words, self.index.words)
+        self.assertFalse(index.changed)
+        index.remove("b")
+        self.assertNotIn("noisy", index.postings)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
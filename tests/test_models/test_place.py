@@ -39,6 +39,36 @@ class TestPlace(unittest.TestCase):
         self.assertEqual(self.place.longitude, 0.0)
         self.assertEqual(self.place.amenity_ids, [])
 
+    def test_place_amenity_ids_not_shared(self):
+        """Tests each place has its own amenity_ids list"""
+        other = Place()
+        self.place.amenity_ids.append("wifi")
+        self.assertEqual(other.amenity_ids, [])
+        self.assertEqual(Place.amenity_ids, [])
+        self.assertEqual(self.place.to_dict()["amenity_ids"], ["wifi"])
+
+    def test_place_amenity_ids_not_saved_until_changed(self):
+        """Tests indexing a place does not store its amenity_ids"""
+        self.assertNotIn("amenity_ids", self.place.to_dict())
+        self.assertNotIn("amenity_ids", str(self.place))
+
+    def test_place_amenity_ids_not_saved_by_reads(self):
+        """Tests queries reading amenity_ids do not store it"""
+        import json
+        from models import storage
+        from models.engine.file_storage import FileStorage
+        from models.engine.query import Query
+
+        Query.parse("Place.where(amenity_ids != 1)").run(storage)
+        storage.aggregate(Place, "count", by="amenity_ids")
+        storage.find(Place, amenity_ids=[])
+        self.place.amenities
+        self.assertNotIn("amenity_ids", self.place.__dict__)
+        self.place.save()
+        with open(FileStorage._FileStorage__file_path, "r") as file:
+            saved = json.load(file)[f"Place.{self.place.id}"]
+        self.assertNotIn("amenity_ids", saved)
+
     def test_place_id(self):
         """Tests place id"""
         self.assertEqual(type(self.place.id), str)
@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""
+Unit test for the model registry
+"""
+
+import unittest
+
+from models import registry
+from models.base_model import BaseModel
+
+
+class TestRegistry(unittest.TestCase):
+    """Tests models.registry"""
+
+    def test_docstrings(self):
+        """Test docstrings"""
+        for function in (registry, registry.register, registry.get_class):
+            with self.subTest(function=function):
+                self.assertTrue(len(function.__doc__) > 10)
+
+    def test_base_model_registered(self):
+        """Test BaseModel is registered"""
+        self.assertIs(registry.get_class("BaseModel"), BaseModel)
+
+    def test_subclass_registered_when_defined(self):
+        """Test defining a subclass registers it"""
+        class Booking(BaseModel):
+            """Subclass defined by the test"""
+
+        try:
+            self.assertIs(registry.get_class("Booking"), Booking)
+        finally:
+            del registry.classes["Booking"]
+
+    def test_lazy_import(self):
+        """Test an unregistered model is imported from its module"""
+        import sys
+
+        from models.amenity import Amenity
+
+        module = sys.modules.pop("models.amenity")
+        del registry.classes["Amenity"]
+        try:
+            cls = registry.get_class("Amenity")
+            self.assertEqual(cls.__module__, "models.amenity")
+            self.assertIn("models.amenity", sys.modules)
+        finally:
+            sys.modules["models.amenity"] = module
+            registry.classes["Amenity"] = Amenity
+
+    def test_unknown_class(self):
+        """Test unknown classes return None"""
+        self.assertIsNone(registry.get_class("Spaceship"))
+        self.assertIsNone(registry.get_class("not a class"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+"""
+Unittest for the relationship attributes of the models
+"""
+import unittest
+
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.relations import Reference, Related, relations
+from models.review import Review
+from models.state import State
+from models.user import User
+
+
+class TestRelations(unittest.TestCase):
+    """Test Related and Reference attributes"""
+
+    def setUp(self):
+        """Provide a state, a city, a user, a place and its reviews"""
+        self.state, self.city, self.user = State(), City(), User()
+        self.city.state_id = self.state.id
+        self.place, self.amenity = Place(), Amenity()
+        self.place.city_id = self.city.id
+        self.place.user_id = self.user.id
+        self.place.amenity_ids = [self.amenity.id, "missing"]
+        self.reviews = [Review(), Review()]
+        for review in self.reviews:
+            review.place_id = self.place.id
+            review.user_id = self.user.id
+
+    def tearDown(self):
+        """Remove the objects from the storage"""
+        for obj in [self.state, self.city, self.user, self.place,
+                    self.amenity] + self.reviews:
+            storage.delete(obj)
+
+    def test_related(self):
+        """Test one-to-many relationships"""
+        self.assertEqual(self.state.cities, [self.city])
+        self.assertEqual(self.city.places, [self.place])
+        self.assertEqual(self.user.places, [self.place])
+        self.assertEqual(self.place.reviews, self.reviews)
+        self.assertEqual(self.user.reviews, self.reviews)
+        self.assertEqual(State().cities, [])
+
+    def test_reference(self):
+        """Test many-to-one relationships"""
+        self.assertIs(self.city.state, self.state)
+        self.assertIs(self.place.city, self.city)
+        self.assertIs(self.place.user, self.user)
+        self.assertIs(self.reviews[0].place, self.place)
+        self.assertIs(self.reviews[1].user, self.user)
+        self.assertEqual(self.place.amenities, [self.amenity])
+        self.assertIsNone(Review().place)
+
+    def test_follows_updates(self):
+        """Test relationships see changed and deleted objects"""
+        other = Place()
+        self.reviews[0].place_id = other.id
+        storage.delete(self.reviews[1])
+        try:
+            self.assertEqual(self.place.reviews, [])
+            self.assertEqual(other.reviews, [self.reviews[0]])
+        finally:
+            storage.delete(other)
+
+    def test_not_saved(self):
+        """Test relationships are not attributes of the instances"""
+        self.assertNotIn("reviews", self.place.to_dict())
+        self.assertNotIn("city", self.place.to_dict())
+
+    def test_default_not_stored(self):
+        """Test reading amenities does not store the amenity_ids default"""
+        place = Place()
+        try:
+            self.assertEqual(place.amenities, [])
+            self.assertNotIn("amenity_ids", place.to_dict())
+        finally:
+            storage.delete(place)
+
+    def test_relations(self):
+        """Test the relationships of a class are listed"""
+        self.assertEqual(set(relations(Place)),
+                         {"city", "user", "reviews", "amenities"})
+        self.assertIsInstance(relations(State)["cities"], Related)
+        self.assertIsInstance(Review.place, Reference)
+        self.assertEqual(relations(Amenity), {})
+
+
+if __name__ == "__main__":
+    unittest.main()